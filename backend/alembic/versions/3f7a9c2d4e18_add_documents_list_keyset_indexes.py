@@ -0,0 +1,30 @@
+"""Add composite indexes for documents list keyset pagination
+
+Revision ID: 3f7a9c2d4e18
+Revises: 8e4d2b6c1f03
+Create Date: 2026-10-17 14:02:41.207913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7a9c2d4e18'
+down_revision: Union[str, None] = '8e4d2b6c1f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ステータス指定ありの一覧（公開中のみ等）用
+    op.create_index('ix_documents_status_view_count_created_at_id', 'documents', ['status', 'view_count', 'created_at', 'id'], unique=False)
+    # ステータス指定なしの一覧用（先頭が status だとソートに使えないため）
+    op.create_index('ix_documents_view_count_created_at_id', 'documents', ['view_count', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_view_count_created_at_id', table_name='documents')
+    op.drop_index('ix_documents_status_view_count_created_at_id', table_name='documents')
@@ -0,0 +1,31 @@
+"""Add FULLTEXT ngram indexes for document search
+
+Revision ID: 5c1e8f3a9b27
+Revises: b530f7048ff2
+Create Date: 2026-10-17 10:12:45.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8f3a9b27'
+down_revision: Union[str, None] = 'b530f7048ff2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ngramパーサーのトークン長はサーバー設定 ngram_token_size（デフォルト2）に従う
+    op.create_index('ft_documents_title', 'documents', ['title'], mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+    op.create_index('ft_documents_content', 'documents', ['content'], mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+    op.create_index('ft_keywords_name', 'keywords', ['name'], mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+
+
+def downgrade() -> None:
+    op.drop_index('ft_keywords_name', table_name='keywords')
+    op.drop_index('ft_documents_content', table_name='documents')
+    op.drop_index('ft_documents_title', table_name='documents')
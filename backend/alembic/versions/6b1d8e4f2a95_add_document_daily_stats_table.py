@@ -0,0 +1,40 @@
+"""Add document_daily_stats table
+
+Revision ID: 6b1d8e4f2a95
+Revises: 3f7a9c2d4e18
+Create Date: 2026-10-17 16:48:12.630584
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1d8e4f2a95'
+down_revision: Union[str, None] = '3f7a9c2d4e18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('document_daily_stats',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('document_id', sa.BigInteger(), nullable=False),
+    sa.Column('genre_id', sa.BigInteger(), nullable=False),
+    sa.Column('stat_date', sa.Date(), nullable=False),
+    sa.Column('view_count', sa.Integer(), nullable=False),
+    sa.Column('helpful_count', sa.Integer(), nullable=False),
+    sa.Column('not_helpful_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ),
+    sa.ForeignKeyConstraint(['genre_id'], ['genres.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('document_id', 'stat_date', name='uk_document_daily_stat')
+    )
+    op.create_index('ix_document_daily_stats_genre_id_stat_date', 'document_daily_stats', ['genre_id', 'stat_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_daily_stats_genre_id_stat_date', table_name='document_daily_stats')
+    op.drop_table('document_daily_stats')
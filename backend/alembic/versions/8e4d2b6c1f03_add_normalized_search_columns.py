@@ -0,0 +1,36 @@
+"""Add normalized search columns to documents
+
+Revision ID: 8e4d2b6c1f03
+Revises: 5c1e8f3a9b27
+Create Date: 2026-10-17 13:26:08.514337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4d2b6c1f03'
+down_revision: Union[str, None] = '5c1e8f3a9b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 既存行はNULLのまま追加し、scripts/backfill_normalized_columns.py で値を埋める
+    op.add_column('documents', sa.Column('normalized_title', sa.String(length=255), nullable=True))
+    op.add_column('documents', sa.Column('normalized_content', sa.Text(), nullable=True))
+    op.create_index(op.f('ix_documents_normalized_title'), 'documents', ['normalized_title'], unique=False)
+    # 本文の全文検索は正規化済みカラムで行うため、元の本文のインデックスは置き換える
+    op.create_index('ft_documents_normalized_content', 'documents', ['normalized_content'], mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+    op.drop_index('ft_documents_content', table_name='documents')
+
+
+def downgrade() -> None:
+    op.create_index('ft_documents_content', 'documents', ['content'], mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+    op.drop_index('ft_documents_normalized_content', table_name='documents')
+    op.drop_index(op.f('ix_documents_normalized_title'), table_name='documents')
+    op.drop_column('documents', 'normalized_content')
+    op.drop_column('documents', 'normalized_title')
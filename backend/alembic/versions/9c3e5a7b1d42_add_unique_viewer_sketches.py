@@ -0,0 +1,37 @@
+"""Add unique viewer sketches
+
+Revision ID: 9c3e5a7b1d42
+Revises: 6b1d8e4f2a95
+Create Date: 2026-10-17 17:35:26.184203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e5a7b1d42'
+down_revision: Union[str, None] = '6b1d8e4f2a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('document_daily_stats', sa.Column('unique_viewer_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('document_daily_stats', sa.Column('viewer_sketch', sa.LargeBinary(), nullable=True))
+    op.create_table('document_viewer_sketches',
+    sa.Column('document_id', sa.BigInteger(), nullable=False),
+    sa.Column('unique_viewer_count', sa.Integer(), nullable=False),
+    sa.Column('viewer_sketch', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ),
+    sa.PrimaryKeyConstraint('document_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('document_viewer_sketches')
+    op.drop_column('document_daily_stats', 'viewer_sketch')
+    op.drop_column('document_daily_stats', 'unique_viewer_count')
@@ -0,0 +1,27 @@
+"""Add composite index for keywords list keyset pagination
+
+Revision ID: d2f8a4c6e913
+Revises: 9c3e5a7b1d42
+Create Date: 2026-10-17 18:12:07.463519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f8a4c6e913'
+down_revision: Union[str, None] = '9c3e5a7b1d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # キーワード一覧（使用回数 → ID の降順）用
+    op.create_index('ix_keywords_usage_count_id', 'keywords', ['usage_count', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_keywords_usage_count_id', table_name='keywords')
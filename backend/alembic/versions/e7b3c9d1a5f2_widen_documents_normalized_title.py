@@ -0,0 +1,36 @@
+"""Widen documents.normalized_title for NFKC-expanded titles
+
+Revision ID: e7b3c9d1a5f2
+Revises: d2f8a4c6e913
+Create Date: 2026-10-17 19:05:41.218604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3c9d1a5f2'
+down_revision: Union[str, None] = 'd2f8a4c6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NFKC でタイトル（最大255文字）より長くなる場合がある（例: ㍿ → 株式会社）
+    # 768文字（utf8mb4 で 3072 バイト）はインデックス ix_documents_normalized_title を保てる上限
+    op.alter_column('documents', 'normalized_title',
+                    existing_type=sa.String(length=255),
+                    type_=sa.String(length=768),
+                    existing_nullable=True)
+
+
+def downgrade() -> None:
+    # 255文字を超える値は切り詰めてから戻す
+    op.execute("UPDATE documents SET normalized_title = LEFT(normalized_title, 255) WHERE CHAR_LENGTH(normalized_title) > 255")
+    op.alter_column('documents', 'normalized_title',
+                    existing_type=sa.String(length=768),
+                    type_=sa.String(length=255),
+                    existing_nullable=True)
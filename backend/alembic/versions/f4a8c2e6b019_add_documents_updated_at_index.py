@@ -0,0 +1,27 @@
+"""Add documents.updated_at index for the list and graph ETags
+
+Revision ID: f4a8c2e6b019
+Revises: e7b3c9d1a5f2
+Create Date: 2026-10-17 21:14:26.530817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8c2e6b019'
+down_revision: Union[str, None] = 'e7b3c9d1a5f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ETag 用の最大更新日時（MAX(updated_at)）をインデックスの端から求める
+    op.create_index('ix_documents_updated_at', 'documents', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_updated_at', table_name='documents')
@@ -1,18 +1,83 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from brotli_asgi import BrotliMiddleware
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from dotenv import load_dotenv
-from app.db import engine
-from app.routers import keywords, documents, genre, documents_list, documents_search, network, qas
+from app.db import engine, SessionLocal
+from app.routers import keywords, documents, genre, documents_list, documents_search, network, qas, stats
+from app.utils.search_index import SEARCH_INDEX_CATCH_UP_SECONDS, search_index
+from app.utils.keyword_trie import keyword_trie
+from app.utils.keyword_cooccurrence import keyword_cooccurrence
+from app.utils.cache import query_cache
+from app.utils.view_buffer import view_buffer
+from app.utils.trending import trending_documents
 
 # 環境変数を読み込む
 load_dotenv()
 
+
+def _build_in_memory_indexes():
+    """
+    キーワード補完用のトライ木を構築し、検索用の転置インデックスの構築を開始
+    （転置インデックスは件数に比例して時間がかかるため、バックグラウンドで構築し、完了までは DB で検索する）
+    """
+    search_index.start_build(SessionLocal)
+    # インポートスクリプトや別ワーカーが登録したドキュメントを定期的に取り込む
+    search_index.start_catch_up(SessionLocal, SEARCH_INDEX_CATCH_UP_SECONDS)
+    db = SessionLocal()
+    try:
+        keyword_trie.build(db)
+    except SQLAlchemyError as e:
+        # DB未接続でも起動は継続し、初回利用時に再構築する
+        print(f"インメモリインデックスの構築に失敗しました: {str(e)}")
+    finally:
+        db.close()
+
+
+def _start_trending_refresher():
+    """日次集計からトレンドスコアを復元し、上位リストの定期再計算を開始"""
+    db = SessionLocal()
+    try:
+        trending_documents.build(db)
+    except SQLAlchemyError as e:
+        # 復元できなくても起動は継続し、以降の閲覧・評価から集計する
+        print(f"トレンドスコアの復元に失敗しました: {str(e)}")
+    finally:
+        db.close()
+    trending_documents.start()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    起動時: インメモリのインデックス構築と、バックグラウンドの定期処理を開始
+    終了時: 未反映の閲覧数を書き込み、バックグラウンドの定期処理を止める
+    """
+    _build_in_memory_indexes()
+    # 閲覧数の定期書き込み
+    view_buffer.start()
+    _start_trending_refresher()
+    # キーワード共起行列の作成と定期的な作り直し（起動は待たせない）
+    keyword_cooccurrence.start()
+
+    yield
+
+    view_buffer.stop()
+    search_index.stop_catch_up()
+    trending_documents.stop()
+    keyword_cooccurrence.stop()
+
 app = FastAPI(
     title="くんよみ API",
     description="社内ナレッジ管理システムのAPI",
-    version="0.1.0"
+    version="0.1.0",
+    # レスポンスのJSON変換は orjson で行う（標準の json より数倍速い）
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS設定: 環境変数から許可するオリジンを取得
@@ -33,6 +98,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],              # すべてのHTTPメソッドを許可
     allow_headers=["*"],              # すべてのヘッダーを許可
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],  # ページネーション情報をフロントから読めるようにする
+)
+
+# レスポンス圧縮: Accept-Encoding に応じて brotli（非対応のクライアントには gzip）で圧縮
+# 小さいレスポンスは圧縮しても効果が薄いため、閾値（バイト）未満はそのまま返す
+app.add_middleware(
+    BrotliMiddleware,
+    quality=int(os.getenv("COMPRESSION_QUALITY", 4)),  # 0-11（大きいほど高圧縮・低速）
+    minimum_size=int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024)),
+    gzip_fallback=True,
 )
 
 # ルーターの登録
@@ -43,6 +118,7 @@ app.include_router(documents.router)
 app.include_router(documents_list.router)
 app.include_router(qas.router)
 app.include_router(network.router)
+app.include_router(stats.router)
 
 
 @app.get("/")
@@ -68,3 +144,8 @@ def health_check_db():
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
 
+
+@app.get("/health/cache")
+def health_check_cache():
+    """クエリ結果キャッシュのヒット率確認用エンドポイント"""
+    return query_cache.stats()
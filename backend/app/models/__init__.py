@@ -5,6 +5,8 @@ from app.models.keyword import Keyword
 from app.models.document import Document
 from app.models.document_keyword import DocumentKeyword
 from app.models.document_evaluation import DocumentEvaluation
+from app.models.document_daily_stat import DocumentDailyStat
+from app.models.document_viewer_sketch import DocumentViewerSketch
 from app.models.qa import QA
 
 __all__ = [
@@ -14,6 +16,8 @@ __all__ = [
     "Document",
     "DocumentKeyword",
     "DocumentEvaluation",
+    "DocumentDailyStat",
+    "DocumentViewerSketch",
     "QA",
 ]
 
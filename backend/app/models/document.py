@@ -1,11 +1,16 @@
 """Documentモデル"""
-from sqlalchemy import Column, BigInteger, String, Text, Integer, Numeric, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, BigInteger, String, Text, Integer, Numeric, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from app.db import Base
 
 
+# normalized_title の最大長（NFKC でタイトルより長くなる場合があるため title より広くとる。
+# utf8mb4 の 768 文字 = 3072 バイトは InnoDB のインデックスキー長の上限）
+NORMALIZED_TITLE_LENGTH = 768
+
+
 class DocumentStatus(enum.Enum):
     """ドキュメントステータス"""
     DRAFT = "draft"
@@ -30,6 +35,20 @@ class Document(Base):
     helpful_count = Column(Integer, nullable=False, default=0)
     view_count = Column(Integer, nullable=False, default=0)
     helpfulness_score = Column(Numeric(5, 2), nullable=False, default=0.00)
+    # 検索用の正規化済みカラム（normalize_text: NFKC + casefold、NULLは未バックフィル）
+    normalized_title = Column(String(NORMALIZED_TITLE_LENGTH), nullable=True, index=True)
+    normalized_content = Column(Text, nullable=True)
+
+    # 全文検索用インデックス（MySQLのngramパーサー、mode=fulltext の検索で使用）と一覧用の複合インデックス
+    __table_args__ = (
+        Index("ft_documents_title", "title", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        Index("ft_documents_normalized_content", "normalized_content", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        # ドキュメント一覧（ビュー数 → 作成日 → ID の降順）のキーセットページネーション用
+        Index("ix_documents_status_view_count_created_at_id", "status", "view_count", "created_at", "id"),
+        Index("ix_documents_view_count_created_at_id", "view_count", "created_at", "id"),
+        # ETag 用の最大更新日時（documents_fingerprint）の集計用
+        Index("ix_documents_updated_at", "updated_at"),
+    )
 
     # リレーションシップ
     genre = relationship("Genre", backref="documents")
@@ -0,0 +1,27 @@
+"""DocumentDailyStatモデル"""
+from sqlalchemy import Column, BigInteger, Integer, Date, ForeignKey, LargeBinary, UniqueConstraint, Index
+from app.db import Base
+
+
+class DocumentDailyStat(Base):
+    """ドキュメントの日次集計（閲覧数・ユニーク閲覧者数・評価数）"""
+    __tablename__ = "document_daily_stats"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    document_id = Column(BigInteger, ForeignKey("documents.id"), nullable=False)
+    genre_id = Column(BigInteger, ForeignKey("genres.id"), nullable=False)  # ジャンル別集計用（documents と結合しない）
+    stat_date = Column(Date, nullable=False)
+    view_count = Column(Integer, nullable=False, default=0)
+    helpful_count = Column(Integer, nullable=False, default=0)  # 役立った評価の数
+    not_helpful_count = Column(Integer, nullable=False, default=0)  # そうでもない評価の数
+    unique_viewer_count = Column(Integer, nullable=False, default=0, server_default="0")  # ユニーク閲覧者数（推定値）
+    viewer_sketch = Column(LargeBinary, nullable=True)  # 閲覧者の HyperLogLog スケッチ（zlib 圧縮）
+
+    # ユニーク制約（1ドキュメント1日につき1行、増分は UPSERT で加算）
+    __table_args__ = (
+        UniqueConstraint("document_id", "stat_date", name="uk_document_daily_stat"),
+        Index("ix_document_daily_stats_genre_id_stat_date", "genre_id", "stat_date"),
+    )
+
+    def __repr__(self):
+        return f"<DocumentDailyStat(document_id={self.document_id}, stat_date={self.stat_date}, view_count={self.view_count})>"
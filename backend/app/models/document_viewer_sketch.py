@@ -0,0 +1,17 @@
+"""DocumentViewerSketchモデル"""
+from sqlalchemy import Column, BigInteger, Integer, LargeBinary, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db import Base
+
+
+class DocumentViewerSketch(Base):
+    """ドキュメントの累計ユニーク閲覧者（HyperLogLog スケッチ）"""
+    __tablename__ = "document_viewer_sketches"
+
+    document_id = Column(BigInteger, ForeignKey("documents.id"), primary_key=True)
+    unique_viewer_count = Column(Integer, nullable=False, default=0)  # ユニーク閲覧者数（推定値）
+    viewer_sketch = Column(LargeBinary, nullable=False)  # 閲覧者の HyperLogLog スケッチ（zlib 圧縮）
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DocumentViewerSketch(document_id={self.document_id}, unique_viewer_count={self.unique_viewer_count})>"
@@ -1,5 +1,5 @@
 """Keywordモデル"""
-from sqlalchemy import Column, BigInteger, String, Integer, DateTime
+from sqlalchemy import Column, BigInteger, String, Integer, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db import Base
@@ -15,6 +15,13 @@ class Keyword(Base):
     usage_count = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
 
+    # 全文検索用インデックス（MySQLのngramパーサー、mode=fulltext の検索で使用）と一覧用の複合インデックス
+    __table_args__ = (
+        Index("ft_keywords_name", "name", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        # キーワード一覧（使用回数 → ID の降順）のキーセットページネーション用
+        Index("ix_keywords_usage_count_id", "usage_count", "id"),
+    )
+
     # リレーションシップ
     documents = relationship("Document", secondary="document_keywords", back_populates="keywords", overlaps="document_keyword_relations")
 
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select
+import os
+from typing import Iterator, List
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, defer
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
 from app.models.document_evaluation import DocumentEvaluation
-from datetime import datetime
+from app.models.document_daily_stat import DocumentDailyStat
+from datetime import datetime, date
 
-from app.db import get_db
+from app.db import get_db, SessionLocal
 from app.models.document import Document, DocumentStatus
 from app.models.keyword import Keyword
 from app.models.document_keyword import DocumentKeyword
@@ -15,27 +21,143 @@ from app.schemas.document import (
     DocumentCreateRequest,
     DocumentCreateResponse,
     DocumentEvaluateRequest,
+    DocumentBulkCreateRequest,
+    DocumentBulkCreateResponse,
     )
-from app.routers.keywords import normalize_text
+from app.schemas.document_list import TrendingDocumentResponse
+from app.routers.keywords import normalize_text, normalize_title
+from app.utils.search_index import search_index
+from app.utils.cache import content_version, keyword_version
+from app.utils.keyword_trie import keyword_trie
+from app.utils.keyword_upsert import normalize_keywords, upsert_keyword_usage
+from app.utils.keyword_cooccurrence import keyword_cooccurrence
+from app.utils.document_import import import_documents
+from app.utils.etag import make_etag, etag_matches, not_modified, set_etag
+from app.utils.view_buffer import view_buffer
+from app.utils.unique_viewers import viewer_key
+from app.utils.trending import trending_documents, TRENDING_TOP_N
+from app.utils.upsert import upsert_increments
 
 router = APIRouter(prefix="/api/documents", tags=["documents"])
 
 # 仮のユーザーID（認証機能がないため）
 TEMP_USER_ID = 1
 
+# エクスポートで1回に読み込むドキュメント数（メモリ使用量はこの件数分で一定）
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 500))
+
 @router.get("/")
 def list_documents(db: Session = Depends(get_db)):
     return db.query(Document).order_by(Document.id.desc()).all()
 
 
+@router.get("/trending", response_model=List[TrendingDocumentResponse])
+def list_trending_documents(
+    limit: int = Query(10, ge=1, le=TRENDING_TOP_N, description="取得件数"),
+):
+    """
+    トレンドドキュメント（ホーム画面用）
+
+    - 閲覧・役立った評価の時間減衰スコア（半減期 TRENDING_HALF_LIFE_HOURS）の降順
+    - スコアは閲覧・評価のたびにプロセス内で加算され、上位リストはバックグラウンドで定期的に再計算される
+    - リクエスト時はDBを参照せず、保持している上位リストを返すだけ
+    """
+    return trending_documents.top(limit)
+
+
+@router.get("/export")
+def export_documents():
+    """
+    全ドキュメントのエクスポート（NDJSON: 1行1ドキュメント）
+
+    - ID順に EXPORT_BATCH_SIZE 件ずつ読み込み、変換した行から順に送信する
+    - 件数が増えてもメモリ使用量は1バッチ分で一定
+    - キーワードはバッチごとに1クエリでまとめて取得する
+    """
+    return StreamingResponse(
+        _iter_export_lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="documents.ndjson"'},
+    )
+
+
+def _iter_export_lines() -> Iterator[bytes]:
+    """ドキュメントを1行ずつ NDJSON に変換して返すジェネレーター"""
+    # レスポンス送信中も使い続けるため、リクエストのセッションとは別に開く
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            # OFFSET を使わず、最後に出力したIDの続きから読む（ループごとに短いクエリで完結させる）
+            documents = (
+                db.query(Document)
+                .options(defer(Document.normalized_title), defer(Document.normalized_content))
+                .filter(Document.id > last_id)
+                .order_by(Document.id)
+                .limit(EXPORT_BATCH_SIZE)
+                .all()
+            )
+            if not documents:
+                break
+
+            keywords_by_doc = {}
+            keyword_rows = (
+                db.query(DocumentKeyword.document_id, Keyword.id, Keyword.name)
+                .join(Keyword, Keyword.id == DocumentKeyword.keyword_id)
+                .filter(DocumentKeyword.document_id.in_([doc.id for doc in documents]))
+                .all()
+            )
+            for document_id, keyword_id, name in keyword_rows:
+                keywords_by_doc.setdefault(document_id, []).append({"id": keyword_id, "name": name})
+
+            for doc in documents:
+                yield orjson.dumps({
+                    "id": doc.id,
+                    "title": doc.title,
+                    "content": doc.content,
+                    "genre_id": doc.genre_id,
+                    "external_link": doc.external_link,
+                    "status": doc.status.value,
+                    "created_by": doc.created_by,
+                    "created_at": doc.created_at,
+                    "updated_by": doc.updated_by,
+                    "updated_at": doc.updated_at,
+                    "helpful_count": doc.helpful_count,
+                    "view_count": doc.view_count,
+                    "helpfulness_score": float(doc.helpfulness_score),
+                    "keywords": keywords_by_doc.get(doc.id, []),
+                }) + b"\n"
+
+            last_id = documents[-1].id
+            # 出力済みのORMオブジェクトを保持し続けないようにする
+            db.expunge_all()
+    finally:
+        db.close()
+
+
 @router.get("/{document_id}", response_model=DocumentDetailResponse)
-def get_document_detail(document_id: int, db: Session = Depends(get_db)):
+def get_document_detail(document_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     ドキュメント詳細取得:
     - keywords も含めて返す
     - view_count を +1
     - 存在しないIDは 404
+    - ETag（更新日時・閲覧数・評価から作成）を返し、If-None-Match が一致すれば 304
     """
+    # 主キーで更新日時と件数だけを読み、変わっていなければ本文・キーワードは読まない
+    version = (
+        db.query(Document.updated_at, Document.view_count, Document.helpful_count, Document.helpfulness_score)
+        .filter(Document.id == document_id)
+        .first()
+    )
+    if not version:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    etag = make_etag("document", document_id, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     doc = (
         db.query(Document)
         .options(joinedload(Document.keywords))
@@ -54,16 +176,20 @@ def get_document_detail(document_id: int, db: Session = Depends(get_db)):
     return doc
 
 @router.post("/{document_id}/view", status_code=status.HTTP_204_NO_CONTENT)
-def increment_view_count(document_id: int, db: Session = Depends(get_db)):
-    doc = db.query(Document).filter(Document.id == document_id).first()
-    if not doc:
+def increment_view_count(document_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    閲覧数インクリメント:
+    - 増分はプロセス内のバッファに記録し、数秒ごとにまとめてDBへ反映する（view_buffer）
+    - helpfulness_score の再計算も反映時にSQLで行う
+    - 存在しないIDは 404（存在確認は初回のみDBを参照）
+    - トレンドスコアにも加算（プロセス内のみ）
+    - ユニーク閲覧者数は X-Viewer-Id ヘッダー（なければ接続元IP）で数える（HyperLogLog による推定）
+    """
+    if not view_buffer.exists(db, document_id):
         raise HTTPException(status_code=404, detail="Document not found")
 
-    doc.view_count += 1
-    denominator = max(doc.view_count, 1)
-    doc.helpfulness_score = round(doc.helpful_count / denominator, 2)
-
-    db.commit()
+    view_buffer.record(document_id, viewer=viewer_key(request))
+    trending_documents.record_view(document_id)
     return
 
 @router.post("/{document_id}/evaluate", response_model=DocumentDetailResponse)
@@ -77,6 +203,8 @@ def evaluate_document(
     - リクエスト { "is_helpful": true/false }
     - 1ユーザー1ドキュメントにつき1回まで（重複は409）
     - Document.helpful_count と Document.helpfulness_score を即時更新
+    - 日次集計（document_daily_stats）の評価数にも加算
+    - 役立った評価はトレンドスコアにも加算
     """
     # 1) ドキュメント存在確認（keywordsも返せるように）
     doc = (
@@ -115,8 +243,22 @@ def evaluate_document(
     denominator = max(doc.view_count, 1)
     doc.helpfulness_score = round(doc.helpful_count / denominator, 2)
 
-    # 5) 保存（unique違反は409へ）
+    # 5) 保存（unique違反は409へ）、日次集計への加算も同じトランザクションで行う
     try:
+        upsert_increments(
+            db,
+            DocumentDailyStat.__table__,
+            ["document_id", "stat_date"],
+            ["helpful_count", "not_helpful_count"],
+            [{
+                "document_id": doc.id,
+                "genre_id": doc.genre_id,
+                "stat_date": date.today(),
+                "view_count": 0,
+                "helpful_count": 1 if request.is_helpful else 0,
+                "not_helpful_count": 0 if request.is_helpful else 1,
+            }],
+        )
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -128,7 +270,11 @@ def evaluate_document(
             detail=f"Failed to evaluate document: {str(e)}",
         )
 
+    content_version.bump()
+    if request.is_helpful:
+        trending_documents.record_helpful(doc.id)
     db.refresh(doc)
+    search_index.update_helpfulness(doc.id, float(doc.helpfulness_score), doc.updated_at)
     return doc
 
 
@@ -167,6 +313,8 @@ def create_document(
         new_document = Document(
             title=request.title,
             content=request.content,
+            normalized_title=normalize_title(request.title),
+            normalized_content=normalize_text(request.content),
             genre_id=request.genre_id,
             external_link=request.external_link,
             status=DocumentStatus.PUBLISHED,
@@ -180,20 +328,22 @@ def create_document(
         db.add(new_document)
         db.flush()  # IDを取得
         
-        # 3. キーワード処理
-        for keyword_name in request.keywords:
-            keyword = process_keyword(db, keyword_name)
-            
-            # ドキュメントとキーワードの紐付け
-            doc_keyword = DocumentKeyword(
-                document_id=new_document.id,
-                keyword_id=keyword.id,
-                created_at=datetime.now()
+        # 3. キーワード処理（件数に関わらず、作成・使用回数の加算と紐付けをそれぞれ1文で行う）
+        keyword_ids = upsert_keyword_usage(db, normalize_keywords(request.keywords))
+        if keyword_ids:
+            db.execute(
+                insert(DocumentKeyword.__table__),
+                [
+                    {"document_id": new_document.id, "keyword_id": keyword_id, "created_at": datetime.now()}
+                    for keyword_id in keyword_ids.values()
+                ],
             )
-            db.add(doc_keyword)
         
         # 4. コミット
         db.commit()
+        content_version.bump()
+        if keyword_ids:
+            keyword_version.bump()
         db.refresh(new_document)
         
         # 5. レスポンス用にキーワードを取得
@@ -205,6 +355,20 @@ def create_document(
         result = db.execute(stmt)
         document_with_keywords = result.unique().scalar_one()
         
+        # 6. 検索インデックス・キーワード補完・キーワード共起に反映（コミット済みの内容のみ）
+        search_index.add_document(
+            document_with_keywords.id,
+            document_with_keywords.title,
+            [kw.name for kw in document_with_keywords.keywords],
+            document_with_keywords.content,
+            float(document_with_keywords.helpfulness_score),
+            document_with_keywords.genre_id,
+            document_with_keywords.updated_at,
+        )
+        for kw in document_with_keywords.keywords:
+            keyword_trie.upsert(kw.id, kw.name, kw.normalized_name, kw.usage_count)
+        keyword_cooccurrence.add_document(document_with_keywords.id, [kw.id for kw in document_with_keywords.keywords])
+        
         return document_with_keywords
         
     except HTTPException:
@@ -218,37 +382,17 @@ def create_document(
         )
 
 
-def process_keyword(db: Session, keyword_name: str) -> Keyword:
+@router.post("/bulk", response_model=DocumentBulkCreateResponse)
+def create_documents_bulk(
+    request: DocumentBulkCreateRequest,
+    db: Session = Depends(get_db)
+):
     """
-    キーワードを処理（既存なら取得、新規なら作成）
-    
-    Args:
-        db: データベースセッション
-        keyword_name: キーワード名
-        
-    Returns:
-        Keyword: キーワードオブジェクト
+    ドキュメントを一括登録（既存Wikiからの移行用）
+
+    - 各要素は POST /api/documents/ と同じ形式で、要素ごとに検証する
+    - 不正な要素・存在しないジャンルの要素はスキップし、errors に位置（index）と理由を返す
+    - ジャンル・キーワードはまとめて解決し、チャンクごとに executemany で登録する
+    - 大量の移行には同じ処理を行う scripts/import_documents.py も使える
     """
-    # ========== keywords.py の normalize_text() を使用 ==========
-    normalized_name = normalize_text(keyword_name)
-    
-    # 既存キーワードを検索
-    keyword = db.query(Keyword).filter(
-        Keyword.normalized_name == normalized_name
-    ).first()
-    
-    if keyword:
-        # 既存キーワード：使用回数をインクリメント
-        keyword.usage_count += 1
-    else:
-        # 新規キーワード：作成
-        keyword = Keyword(
-            name=keyword_name,
-            normalized_name=normalized_name,
-            usage_count=1,
-            created_at=datetime.now()
-        )
-        db.add(keyword)
-        db.flush()  # IDを取得
-    
-    return keyword
\ No newline at end of file
+    return import_documents(db, request.documents, TEMP_USER_ID)
@@ -1,54 +1,128 @@
 #ドキュメント一覧取得
-from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from sqlalchemy.orm import Session, joinedload, defer
+from typing import Dict, List, Literal, Optional, Tuple, Union
+from datetime import datetime
 
 from app.db import get_db
 from app.models.document import Document
 from app.models.genre import Genre
 from app.models.user import User
-from app.schemas.document_list import DocumentResponse
+from app.schemas.document_list import DocumentResponse, DocumentSummaryResponse
+from app.utils.cache import query_cache, content_version
+from app.utils.etag import BOOT_ID, documents_fingerprint, make_etag, etag_matches, not_modified, set_etag
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_after, parse_cursor_part, cursor_value
+from app.utils.snippet import load_content_previews
+from app.utils.genre_tree import genre_tree
 
 router = APIRouter(prefix="/api/documents_list", tags=["documents_list"])
 
-@router.get("", response_model=List[DocumentResponse])
+@router.get("", response_model=Union[List[DocumentResponse], List[DocumentSummaryResponse]])
 def get_documents_list(
+    request: Request,
+    response: Response,
     genre_id: Optional[int] = Query(None, description="ジャンルIDでフィルタ"),
+    include_descendants: bool = Query(False, description="genre_id の子孫ジャンルのドキュメントも含めるか"),
     status: Optional[str] = Query(None, description="ステータスでフィルタ（draft/published/archived）"),
     skip: int = Query(0, ge=0, description="スキップ件数（ページネーション用）"),
     limit: int = Query(10, ge=1, le=100, description="取得件数（ページネーション用）"),
+    cursor: Optional[str] = Query(None, description="次ページ取得用カーソル（前回レスポンスの X-Next-Cursor ヘッダー、指定時は skip を無視）"),
+    view: Literal["full", "summary"] = Query("full", description="返却形式（full: 本文全体 / summary: 本文の代わりに先頭のプレビュー）"),
     db: Session = Depends(get_db)
 ):
     """
     ドキュメント一覧取得API
 
     - ジャンルIDとステータスでフィルタ可能
+    - include_descendants=true: 指定ジャンル配下（子・孫ジャンル）のドキュメントも含める（例: 申請系 → 経費 → 交通費）
     - ページネーション対応（skip, limit）
+    - カーソルページネーション対応: 続きがあれば X-Next-Cursor ヘッダーにカーソルを返し、
+      cursor に渡すと (ビュー数, 作成日, ID) の位置から続きを取得する（深いページでも1ページ目と同じコスト）
     - ジャンル名・作成者名を含む
-    - 取得結果をビュー数の降順、作成日の降順でソート
+    - 取得結果をビュー数の降順、作成日の降順、IDの降順でソート
+    - view=summary: 本文を読み込まず、先頭のプレビュー（content_preview）だけを返す（カード表示用）
+    - 同じ条件の一覧はコンテンツが更新されるまでキャッシュから返す
+    - ETag（content_version と DB の集計値から作成）を返し、If-None-Match が一致すれば 304
+      （スクリプトや別ワーカーによる書き込みも集計値で検出する）
     """
+    # ドキュメントが更新されていなければ、キャッシュの参照も含めて何もしない
+    etag = make_etag("documents_list", BOOT_ID, content_version.value, *documents_fingerprint(db))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    if cursor is not None:
+        skip = 0
+    # 他のプロセスによる書き込みで content_version は進まないため、集計値を含む ETag もキャッシュのキーに含める
+    params = {"genre_id": genre_id, "include_descendants": include_descendants, "status": status, "skip": skip, "limit": limit, "cursor": cursor, "view": view, "etag": etag}
+    result, headers = query_cache.get_or_compute(
+        "documents_list",
+        params,
+        lambda: _fetch_documents_list(db, genre_id, status, skip, limit, cursor, view, include_descendants),
+    )
+    response.headers.update(headers)
+    set_etag(response, etag)
+    return result
+
+
+def _fetch_documents_list(
+    db: Session,
+    genre_id: Optional[int],
+    status: Optional[str],
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    view: str = "full",
+    include_descendants: bool = False,
+) -> Tuple[List[dict], Dict[str, str]]:
+    """ドキュメント一覧をDBから取得し、(レスポンス本体, レスポンスヘッダー) を返す"""
     query = db.query(Document).options(
         joinedload(Document.genre),
         joinedload(Document.creator),
-        joinedload(Document.keywords)
+        joinedload(Document.keywords),
+        # 検索用の正規化本文はレスポンスに使わない
+        defer(Document.normalized_content)
     )
+    if view == "summary":
+        # 本文は返さないため読み込まない（プレビューは返却する行の分だけ切り出して取得）
+        query = query.options(defer(Document.content))
 
-    if genre_id is not None:
+    if genre_id is not None and include_descendants:
+        # 子孫ジャンルはキャッシュ済みのID集合から引く（ジャンルごとのクエリは発行しない）
+        query = query.filter(Document.genre_id.in_(genre_tree.subtree_ids(db, genre_id)))
+    elif genre_id is not None:
         query = query.filter(Document.genre_id == genre_id)
  
     if status is not None:
         query = query.filter(Document.status == status)
 
-    documents = query.order_by(Document.view_count.desc(), Document.created_at.desc()).offset(skip).limit(limit).all()
+    # (status, view_count, created_at, id) の複合インデックスに沿った順序で読む
+    sort_columns = [Document.view_count, Document.created_at, Document.id]
+    if cursor is not None:
+        view_count, created_at, document_id = cursor_value(decode_cursor(cursor), "v", list)
+        query = query.filter(keyset_after(sort_columns, [
+            parse_cursor_part(int, view_count),
+            parse_cursor_part(datetime.fromisoformat, created_at),
+            parse_cursor_part(int, document_id),
+        ]))
+
+    # 次ページ有無の判定用に1件多く取得
+    documents = query.order_by(*[column.desc() for column in sort_columns]).offset(skip).limit(limit + 1).all()
+
+    headers: Dict[str, str] = {}
+    if len(documents) > limit:
+        documents = documents[:limit]
+        last = documents[-1]
+        headers["X-Next-Cursor"] = encode_cursor({"v": [last.view_count, last.created_at.isoformat(), last.id]})
 
+    if view == "summary":
+        previews = load_content_previews(db, [document.id for document in documents])
 
     # ジャンル名と作成者名をレスポンスに追加
     result = []
     for document in documents:
-        result.append({
+        item = {
             "id": document.id,
             "title": document.title,
-            "content": document.content,
             "genre_id": document.genre_id,
             "genre_name": document.genre.name,  # ジャンル名
             "external_link": document.external_link,
@@ -64,6 +138,11 @@ def get_documents_list(
             "keywords": [
                 {"id": kw.id, "name": kw.name} for kw in document.keywords
             ]
-        })
+        }
+        if view == "summary":
+            item["content_preview"] = previews.get(document.id, "")
+        else:
+            item["content"] = document.content
+        result.append(item)
 
-    return result
\ No newline at end of file
+    return result, headers
@@ -1,26 +1,30 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, exists, and_
-from typing import List
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session, joinedload, defer
+from sqlalchemy import or_, exists, and_, select, func
+from sqlalchemy.dialects.mysql import match
+from typing import Dict, List, Literal, Optional, Tuple, Union
+from datetime import datetime
+from decimal import Decimal
 from app.db import get_db
 from app.models.document import Document
 from app.models.keyword import Keyword
 from app.models.document_keyword import DocumentKeyword
-from app.schemas.document_list import DocumentResponse
+from app.models.genre import Genre
+from app.schemas.document_list import DocumentResponse, DocumentSnippetResponse, DocumentSummaryResponse, SearchFacetsResponse
 from app.routers.keywords import normalize_text
+from app.utils.search_index import ALL_FIELDS, FIELD_KEYWORDS, FIELD_TITLE, ensure_search_index, search_index
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_after, parse_cursor_part, cursor_value
+from app.utils.snippet import build_snippet, load_content_previews
+from app.utils.cache import query_cache
+from app.utils.genre_tree import rollup_counts
 
 router = APIRouter(prefix="/api/documents/search", tags=["documents"])
 
-@router.get("", response_model=List[DocumentResponse])
-def search_documents(
-    q: str = Query(..., description="検索キーワード"),
-    db: Session = Depends(get_db)
-):
+
+def _like_filter(q: str):
     """
-    ドキュメント検索API
-    - タイトルに対するLIKE検索
-    - キーワード名に対するマッチング
-    - スコアと更新日の降順でソート
+    タイトル または キーワード名 に対するLIKE検索条件
+    どちらも正規化済みカラム（normalized_title / normalized_name）同士で比較する
     """
     # 正規化処理
     normalized_q = normalize_text(q)
@@ -30,40 +34,302 @@ def search_documents(
         and_(
             DocumentKeyword.document_id == Document.id,
             DocumentKeyword.keyword_id == Keyword.id,
-            or_(
-                Keyword.name.ilike(f"%{q}%"),
-                Keyword.normalized_name.like(f"%{normalized_q}%")
-            )
+            Keyword.normalized_name.like(f"%{normalized_q}%")
         )
     )
     
+    return or_(
+        Document.normalized_title.like(f"%{normalized_q}%"),
+        keyword_match
+    )
+
+
+def _fulltext_filter(q: str):
+    """
+    FULLTEXT（ngramパーサー）による検索条件と関連度
+
+    - タイトル・本文・キーワード名それぞれの全文検索インデックスを個別に使う
+    - フレーズ検索（BOOLEAN MODE の "..."）で部分一致に近い挙動にする
+    - 本文は正規化済みカラム（normalized_content）に正規化済みクエリで照合する
+    - 関連度はタイトルを2倍に重み付けし、キーワードは最大値を採用
+    """
+    # 大文字・小文字の違いは照合順序（collation）側で吸収される
+    phrase = '"' + q.replace('"', " ").strip() + '"'
+    normalized_phrase = '"' + normalize_text(q).replace('"', " ").strip() + '"'
+
+    title_match = match(Document.title, against=phrase).in_boolean_mode()
+    content_match = match(Document.normalized_content, against=normalized_phrase).in_boolean_mode()
+    keyword_match = match(Keyword.name, against=phrase).in_boolean_mode()
+
+    keyword_doc_ids = (
+        select(DocumentKeyword.document_id)
+        .join(Keyword, Keyword.id == DocumentKeyword.keyword_id)
+        .where(keyword_match)
+    )
+    keyword_score = (
+        select(func.max(keyword_match))
+        .select_from(DocumentKeyword)
+        .join(Keyword, Keyword.id == DocumentKeyword.keyword_id)
+        .where(DocumentKeyword.document_id == Document.id)
+        .scalar_subquery()
+    )
+
+    # OR で MATCH を並べるとインデックスが効かないため、各インデックスのヒットIDを IN で合成
+    search_filter = or_(
+        Document.id.in_(select(Document.id).where(title_match)),
+        Document.id.in_(select(Document.id).where(content_match)),
+        Document.id.in_(keyword_doc_ids),
+    )
+    relevance = title_match * 2 + content_match + func.coalesce(keyword_score, 0)
+    return search_filter, relevance
+
+
+def _fulltext_available(db: Session) -> bool:
+    """FULLTEXT（MATCH ... AGAINST）は MySQL でのみ使える"""
+    return db.get_bind().dialect.name == "mysql"
+
+
+def _resolve_mode(q: str, mode: str, fulltext_available: bool) -> str:
+    """
+    実際に使う検索方式
+
+    - 転置インデックスの構築中（起動直後など）は、bm25 / index を fulltext（MySQL 以外は LIKE）に切り替える
+    - ngramのトークンは2文字のため、1文字のクエリは転置インデックス（構築中は LIKE）で検索する
+    - MySQL 以外では fulltext の代わりに LIKE で検索する
+    """
+    index_ready = ensure_search_index()
+    if mode in ("bm25", "index") and not index_ready:
+        mode = "fulltext"
+    if mode == "fulltext" and len(q.replace('"', " ").strip()) < 2:
+        return "index" if index_ready else "like"
+    if mode == "fulltext" and not fulltext_available:
+        return "like"
+    return mode
+
+
+# 転置インデックスで検索する方式と、その対象フィールド
+_INDEX_FIELDS = {
+    "bm25": ALL_FIELDS,
+    "index": (FIELD_TITLE, FIELD_KEYWORDS),
+}
+
+
+def _search_filter(db: Session, q: str, mode: str):
+    """
+    DB で検索する方式（like / fulltext）の (検索条件, 関連度) を返す
+    - 関連度は fulltext のみ（それ以外は None）
+    """
+    if mode == "fulltext":
+        return _fulltext_filter(q)
+    return _like_filter(q), None
+
+
+def _fetch_by_ids(query, document_ids: List[int]) -> list:
+    """ページ分のIDだけをDBから取得し、document_ids の順に並べる"""
+    if not document_ids:
+        return []
+    order = {document_id: i for i, document_id in enumerate(document_ids)}
+    return sorted(query.filter(Document.id.in_(order)).all(), key=lambda doc: order[doc.id])
+
+
+def _fetch_index_page(
+    query,
+    q: str,
+    limit: int,
+    position: Optional[dict],
+    headers: Dict[str, str],
+):
+    """
+    mode=index の順（有益度スコア → 更新日時 → ID の降順）で1ページ分のドキュメントを取得
+
+    Returns:
+        (ドキュメント一覧（limit+1件まで）, 次ページのカーソル位置)
+    """
+    # 並べ替えはメモリ上で行うため、カーソルは最終行の (スコア, 更新日時, ID) で表す
+    after = None
+    if position:
+        score, updated_at, document_id = cursor_value(position, "i", list, size=3)
+        after = (
+            parse_cursor_part(float, score),
+            parse_cursor_part(float, updated_at),
+            parse_cursor_part(int, document_id),
+        )
+
+    total, page = search_index.page(q, limit + 1, after)
+    headers["X-Total-Count"] = str(total)
+    documents = _fetch_by_ids(query, [document_id for _, _, document_id in page])
+    next_position = None
+    if page:
+        next_position = {"i": list(page[min(limit, len(page)) - 1])}
+    return documents, next_position
+
+
+def _fetch_ranked_page(
+    query,
+    q: str,
+    limit: int,
+    position: Optional[dict],
+    headers: Dict[str, str],
+):
+    """
+    BM25 の順位で1ページ分のドキュメントを取得
+
+    Returns:
+        (ドキュメント一覧（limit+1件まで）, 次ページのカーソル位置)
+    """
+    # 順位はメモリ上で決まるため、カーソルは最終行の (スコア, ID) で表す
+    after = None
+    if position:
+        score, document_id = cursor_value(position, "r", list, size=2)
+        after = (parse_cursor_part(float, score), parse_cursor_part(int, document_id))
+
+    total, page = search_index.rank(q, limit + 1, after)
+    headers["X-Total-Count"] = str(total)
+    documents = _fetch_by_ids(query, [document_id for _, document_id in page])
+    next_position = None
+    if page:
+        last_score, last_id = page[min(limit, len(page)) - 1]
+        next_position = {"r": [last_score, last_id]}
+    return documents, next_position
+
+
+@router.get("", response_model=Union[List[DocumentResponse], List[DocumentSnippetResponse], List[DocumentSummaryResponse]])
+def search_documents(
+    response: Response,
+    q: str = Query(..., description="検索キーワード"),
+    mode: Literal["bm25", "index", "like", "fulltext"] = Query("bm25", description="検索方式（bm25: 関連度順 / index: 転置インデックス / like: DBのLIKE検索 / fulltext: MySQL全文検索）"),
+    limit: int = Query(20, ge=1, le=100, description="取得件数"),
+    cursor: Optional[str] = Query(None, description="次ページ取得用カーソル（前回レスポンスの X-Next-Cursor ヘッダー）"),
+    fields: Literal["full", "snippet"] = Query("full", description="本文の返し方（full: 本文全体 / snippet: 一致箇所周辺の抜粋）"),
+    view: Literal["full", "summary"] = Query("full", description="返却形式（full: 本文全体 / summary: 本文の代わりに先頭のプレビュー。fields=snippet 指定時は抜粋を優先）"),
+    db: Session = Depends(get_db)
+):
+    """
+    ドキュメント検索API
+    - タイトル・キーワード名（bm25 / fulltext は本文も）に対する検索
+    - mode=bm25（デフォルト）: インメモリの転置インデックスで BM25 を計算し、関連度×(1+有益度スコア) の順に並べる
+    - mode=index: インメモリのバイグラム転置インデックスで部分一致を検索し、並べ替えもメモリ上で行う
+    - mode=like: 正規化済みカラムに対するLIKE検索（インデックスと結果を突き合わせる際の確認用）
+    - mode=fulltext: MySQLのFULLTEXT（ngram）で本文も含めて検索し、関連度順に並べる
+    - 起動直後など転置インデックスの構築中は、bm25 / index の代わりに fulltext（MySQL 以外は like）で検索する
+    - index / like はスコアと更新日の降順でソート
+    - bm25 / index はDBに返却する行のIDだけを渡す（ヒット件数に関わらずDBの負荷は1ページ分）
+    - ページネーション: limit 件ずつ返し、続きがあれば X-Next-Cursor ヘッダーにカーソルを返す
+    - 総ヒット件数は X-Total-Count ヘッダーで返す
+    - fields=snippet: 本文全体の代わりに抜粋とハイライト位置を返す（本文は返却する行の分だけ読む）
+    - view=summary: 本文を読み込まず、先頭のプレビュー（content_preview）だけを返す（カード表示用）
+    """
+    mode = _resolve_mode(q, mode, _fulltext_available(db))
+
+    # 同じ条件の検索はコンテンツが更新されるまでキャッシュから返す
+    params = {
+        "q": normalize_text(q).strip() if mode in ("bm25", "index") else q,
+        "mode": mode,
+        "limit": limit,
+        "cursor": cursor,
+        "fields": fields,
+        "view": view,
+    }
+    result, headers = query_cache.get_or_compute(
+        "documents_search",
+        params,
+        lambda: _run_search(db, q, mode, limit, cursor, fields, view),
+    )
+    response.headers.update(headers)
+    return result
+
+
+def _run_search(
+    db: Session,
+    q: str,
+    mode: str,
+    limit: int,
+    cursor: Optional[str],
+    fields: str,
+    view: str = "full",
+) -> Tuple[List[dict], Dict[str, str]]:
+    """検索を実行し、(レスポンス本体, レスポンスヘッダー) を返す"""
     # 1. クエリの作成（ジャンル、作成者、キーワードを結合）
     query = db.query(Document).options(
         joinedload(Document.genre),
         joinedload(Document.creator),
-        joinedload(Document.keywords)
+        joinedload(Document.keywords),
+        # 検索用の正規化本文はレスポンスに使わない
+        defer(Document.normalized_content)
     )
+    if fields == "snippet" or view == "summary":
+        # 本文は検索・ソートに使わないため、返却する行の分だけ後から取得する
+        query = query.options(defer(Document.content))
+    position = decode_cursor(cursor) if cursor else None
     
-    # 2. 検索条件の設定 (タイトル または キーワード名 にヒット)
-    search_filter = or_(
-        Document.title.ilike(f"%{q}%"),
-        keyword_match
-    )
+    headers: Dict[str, str] = {}
+    if mode == "bm25":
+        # 2-3. 転置インデックスで関連度順に並べ、返却する行だけDBから取得
+        documents, next_position = _fetch_ranked_page(query, q, limit, position, headers)
+    elif mode == "index":
+        # 2-3. 転置インデックスで部分一致の検索と並べ替えを行い、返却する行だけDBから取得
+        documents, next_position = _fetch_index_page(query, q, limit, position, headers)
+    else:
+        # 2. 検索条件の設定 (タイトル または キーワード名 にヒット)
+        search_filter, relevance = _search_filter(db, q, mode)
+        query = query.filter(search_filter)
     
-    # 3. フィルタ実行とソート
-    # ソート順: 有益度スコア(降順) -> 更新日時(降順)
-    documents = query.filter(search_filter)\
-        .order_by(Document.helpfulness_score.desc(), Document.updated_at.desc())\
-        .distinct()\
-        .all()
+        # ヒット件数は1ページ目でのみ数える（2ページ目以降は1ページ目の値を使う想定）
+        if position is None:
+            total = db.query(func.count(Document.id)).filter(search_filter).scalar()
+            headers["X-Total-Count"] = str(total)
+            if total == 0:
+                return [], headers
+    
+        # 3. フィルタ実行とソート（次ページ有無の判定用に1件多く取得）
+        if mode == "fulltext":
+            # 関連度は行ごとに計算されるため、カーソルは取得済み件数（オフセット）で表す
+            offset = cursor_value(position, "o", int) if position else 0
+            # ソート順: 関連度×(1+有益度スコア)(降順) -> 更新日時(降順) -> ID(降順)
+            documents = query\
+                .order_by((relevance * (1 + Document.helpfulness_score)).desc(), Document.updated_at.desc(), Document.id.desc())\
+                .offset(offset)\
+                .limit(limit + 1)\
+                .all()
+            next_position = {"o": offset + limit}
+        else:
+            sort_columns = [Document.helpfulness_score, Document.updated_at, Document.id]
+            if position:
+                score, updated_at, document_id = cursor_value(position, "k", list)
+                query = query.filter(keyset_after(sort_columns, [
+                    parse_cursor_part(Decimal, score),
+                    parse_cursor_part(datetime.fromisoformat, updated_at),
+                    parse_cursor_part(int, document_id),
+                ]))
+            # ソート順: 有益度スコア(降順) -> 更新日時(降順) -> ID(降順)
+            documents = query\
+                .order_by(*[column.desc() for column in sort_columns])\
+                .distinct()\
+                .limit(limit + 1)\
+                .all()
+            if documents:
+                last = documents[min(limit, len(documents)) - 1]
+                next_position = {"k": [str(last.helpfulness_score), last.updated_at.isoformat(), last.id]}
+
+    if len(documents) > limit:
+        documents = documents[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(next_position)
+
+    if fields == "snippet":
+        contents = dict(
+            db.query(Document.id, Document.content)
+            .filter(Document.id.in_([doc.id for doc in documents]))
+            .all()
+        )
+    elif view == "summary":
+        previews = load_content_previews(db, [doc.id for doc in documents])
 
     # 4. レスポンス形式への変換
     result = []
     for doc in documents:
-        result.append({
+        item = {
             "id": doc.id,
             "title": doc.title,
-            "content": doc.content,
             "genre_id": doc.genre_id,
             "genre_name": doc.genre.name if doc.genre else "未分類",
             "external_link": doc.external_link,
@@ -77,6 +343,78 @@ def search_documents(
             "view_count": doc.view_count,
             "helpfulness_score": doc.helpfulness_score,
             "keywords": [{"id": kw.id, "name": kw.name} for kw in doc.keywords]
-        })
+        }
+        if fields == "snippet":
+            snippet, highlights = build_snippet(contents.get(doc.id, ""), q)
+            item["snippet"] = snippet
+            item["highlights"] = [{"start": start, "end": end} for start, end in highlights]
+        elif view == "summary":
+            item["content_preview"] = previews.get(doc.id, "")
+        else:
+            item["content"] = doc.content
+        result.append(item)
+
+    return result, headers
+
+
+@router.get("/facets", response_model=SearchFacetsResponse)
+def search_facets(
+    q: str = Query(..., description="検索キーワード"),
+    mode: Literal["bm25", "index", "like", "fulltext"] = Query("bm25", description="検索方式（検索APIと同じ）"),
+    facets: Literal["genre"] = Query("genre", description="集計する軸（現在は genre のみ）"),
+    db: Session = Depends(get_db)
+):
+    """
+    検索結果のファセット集計API
+    - 検索APIと同じ条件でヒットしたドキュメントをジャンル別に集計
+    - 子ジャンルの件数は Genre.path を使って親ジャンルにも積み上げる（例: 交通費 → 経費 → 申請系）
+    - 集計は GROUP BY 1回 + メモリ上での積み上げで行い、ジャンルごとの検索はしない
+      （bm25 / index は転置インデックスが持つジャンルIDでメモリ上で数え、ヒットしたIDはDBに渡さない）
+    """
+    mode = _resolve_mode(q, mode, _fulltext_available(db))
+    params = {
+        "q": normalize_text(q).strip() if mode in ("bm25", "index") else q,
+        "mode": mode,
+        "facets": facets,
+    }
+    return query_cache.get_or_compute(
+        "documents_search_facets",
+        params,
+        lambda: _count_genre_facets(db, q, mode),
+    )
+
+
+def _count_genre_facets(db: Session, q: str, mode: str) -> dict:
+    """ヒットしたドキュメントのジャンル別件数を集計し、階層を積み上げて返す"""
+    # 1. ジャンルごとの直接の件数（転置インデックス上で数える、または GROUP BY 1回）
+    if mode in _INDEX_FIELDS:
+        direct_counts = search_index.genre_counts(q, _INDEX_FIELDS[mode])
+    else:
+        search_filter, _ = _search_filter(db, q, mode)
+        direct_counts = dict(
+            db.query(Document.genre_id, func.count(Document.id))
+            .filter(search_filter)
+            .group_by(Document.genre_id)
+            .all()
+        )
+    if not direct_counts:
+        return {"total": 0, "genres": []}
+
+    # 2. 親ジャンルへの積み上げ（パスを辿るだけなのでメモリ上で完結）
+    genres = db.query(
+        Genre.id, Genre.name, Genre.parent_id, Genre.level, Genre.path, Genre.display_order
+    ).all()
+    counts = rollup_counts([(genre.id, genre.path) for genre in genres], direct_counts)
 
-    return result
\ No newline at end of file
+    facets = [
+        {
+            "genre_id": genre.id,
+            "name": genre.name,
+            "parent_id": genre.parent_id,
+            "level": genre.level,
+            "count": counts[genre.id],
+        }
+        for genre in sorted(genres, key=lambda g: (g.level, g.display_order))
+        if counts.get(genre.id)
+    ]
+    return {"total": sum(direct_counts.values()), "genres": facets}
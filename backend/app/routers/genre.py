@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List
@@ -6,6 +6,8 @@ from typing import List
 from app.db import get_db
 from app.models.genre import Genre
 from app.schemas.genre import GenreResponse, GenreWithChildren
+from app.utils.etag import make_etag, etag_matches, not_modified, set_etag
+from app.utils.genre_tree import genres_fingerprint
 
 router = APIRouter(
     prefix="/api/genres",
@@ -30,6 +32,8 @@ def _filter_children(genre: Genre, include_inactive: bool) -> None:
 
 @router.get("/", response_model=List[GenreWithChildren])
 def get_genres(
+    request: Request,
+    response: Response,
     include_inactive: bool = False,
     db: Session = Depends(get_db)
 ):
@@ -45,8 +49,14 @@ def get_genres(
     
     【レスポンス】
     親ジャンルとその子・孫を含むネスト構造
+    ETag を返し、If-None-Match が一致すれば 304（ジャンル一覧の取得・変換は行わない）
     """
     try:
+        etag = make_etag("genres", *genres_fingerprint(db))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+
         # トップレベルのジャンルのみ取得
         query = db.query(Genre).filter(Genre.parent_id == None)
         
@@ -77,6 +87,8 @@ def get_genres(
 
 @router.get("/flat", response_model=List[GenreResponse])
 def get_genres_flat(
+    request: Request,
+    response: Response,
     include_inactive: bool = False,
     db: Session = Depends(get_db)
 ):
@@ -94,8 +106,14 @@ def get_genres_flat(
     【レスポンス】
     全ジャンルをlevel、display_orderでソートした配列
     階層構造は保持されない（parent_idで判断可能）
+    ETag を返し、If-None-Match が一致すれば 304
     """
     try:
+        etag = make_etag("genres_flat", *genres_fingerprint(db))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+
         query = db.query(Genre)
         
         # is_activeフィルター適用
@@ -1,15 +1,25 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import unicodedata
 
 from app.db import get_db
+from app.models.document import NORMALIZED_TITLE_LENGTH
 from app.models.keyword import Keyword
-from app.schemas.keyword import KeywordResponse, KeywordCreateRequest
+from app.schemas.keyword import KeywordResponse, KeywordCreateRequest, KeywordSuggestion, RelatedKeyword, KeywordReconcileResponse
+from app.utils.keyword_trie import ensure_keyword_trie, keyword_trie, SUGGEST_TOP_K
+from app.utils.keyword_cooccurrence import ensure_keyword_cooccurrence, RELATED_TOP_K
+from app.utils.keyword_usage import reconcile_usage_counts
+from app.utils.popular_keywords import popular_keywords
+from app.utils.cache import keyword_version
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_after, parse_cursor_part, cursor_value
 from datetime import datetime
 
 router = APIRouter(prefix="/api/keywords", tags=["keywords"])
 
+# キーワード一覧の1ページあたりの最大件数
+MAX_KEYWORDS_PAGE_SIZE = 500
+
 
 def normalize_text(s: str) -> str:
     """
@@ -20,10 +30,50 @@ def normalize_text(s: str) -> str:
     return unicodedata.normalize("NFKC", s).casefold()
 
 
+def normalize_title(title: str) -> str:
+    """
+    Document.normalized_title に保存する値
+    NFKC で長くなる文字（例: ㍿ → 株式会社）があるため、カラム長を超える分は切り捨てる
+    """
+    return normalize_text(title)[:NORMALIZED_TITLE_LENGTH]
+
+
 @router.get("", response_model=List[KeywordResponse])
-def list_keywords(db: Session = Depends(get_db)):
-    """キーワード一覧を取得（使用回数順）"""
-    return db.query(Keyword).order_by(Keyword.usage_count.desc()).all()
+def list_keywords(
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_KEYWORDS_PAGE_SIZE, description="取得件数"),
+    cursor: Optional[str] = Query(None, description="次ページ取得用カーソル（前回レスポンスの X-Next-Cursor ヘッダー）"),
+    db: Session = Depends(get_db),
+):
+    """
+    キーワード一覧を取得（使用回数の降順、同数はIDの降順）
+    - 続きがあれば X-Next-Cursor ヘッダーにカーソルを返し、cursor に渡すと (使用回数, ID) の位置から続きを取得する
+    - 1ページ目（limit が POPULAR_KEYWORDS_TOP_N 以下）は人気キーワードのキャッシュから返す
+      （キーワードの作成・使用回数の変更があるまでDBを参照しない）
+    """
+    # 次ページ有無の判定用に1件多く取得する
+    if cursor is None and limit <= popular_keywords.top_n:
+        keywords = popular_keywords.get(db, limit + 1)
+    else:
+        query = db.query(Keyword.id, Keyword.name, Keyword.usage_count, Keyword.created_at)
+        if cursor is not None:
+            usage_count, keyword_id = cursor_value(decode_cursor(cursor), "u", list, size=2)
+            query = query.filter(keyset_after(
+                [Keyword.usage_count, Keyword.id],
+                [parse_cursor_part(int, usage_count), parse_cursor_part(int, keyword_id)],
+            ))
+        keywords = [
+            {"id": keyword_id, "name": name, "usage_count": usage_count, "created_at": created_at}
+            for keyword_id, name, usage_count, created_at in query
+            .order_by(Keyword.usage_count.desc(), Keyword.id.desc())
+            .limit(limit + 1)
+        ]
+
+    if len(keywords) > limit:
+        keywords = keywords[:limit]
+        last = keywords[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor({"u": [last["usage_count"], last["id"]]})
+    return keywords
 
 
 @router.get("/search", response_model=List[KeywordResponse])
@@ -41,6 +91,60 @@ def search_keywords(
         .all()
     )
 
+@router.get("/suggest", response_model=List[KeywordSuggestion])
+def suggest_keywords(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=SUGGEST_TOP_K),
+    db: Session = Depends(get_db),
+):
+    """
+    キーワード入力補完（正規化して前方一致、使用回数順）
+    インメモリのトライ木から返すため、構築済みであればDBにはアクセスしない
+    """
+    return ensure_keyword_trie(db).suggest(normalize_text(q), limit)
+
+@router.get("/{keyword_id}/related", response_model=List[RelatedKeyword])
+def related_keywords(
+    keyword_id: int,
+    limit: int = Query(10, ge=1, le=RELATED_TOP_K),
+    db: Session = Depends(get_db),
+):
+    """
+    関連キーワード（同じドキュメントに付いた回数順、タグ入力時の提案用）
+    インメモリの共起行列から選び、DBは表示名の取得（主キー検索1回）だけ
+    """
+    related = ensure_keyword_cooccurrence(db).related(keyword_id, limit)
+    keywords = {
+        keyword.id: keyword
+        for keyword in db.query(Keyword.id, Keyword.name, Keyword.usage_count)
+        .filter(Keyword.id.in_([keyword_id] + [related_id for related_id, _ in related]))
+    }
+    if keyword_id not in keywords:
+        raise HTTPException(status_code=404, detail="Keyword not found")
+
+    return [
+        {
+            "id": related_id,
+            "name": keywords[related_id].name,
+            "usage_count": keywords[related_id].usage_count,
+            "cooccurrence_count": count,
+        }
+        for related_id, count in related
+        if related_id in keywords
+    ]
+
+@router.post("/reconcile", response_model=KeywordReconcileResponse)
+def reconcile_keywords(
+    prune_orphans: bool = Query(False, description="ドキュメントに1件も紐付いていないキーワードを削除するか"),
+    db: Session = Depends(get_db),
+):
+    """
+    キーワードの使用回数を再集計（管理用）
+    document_keywords を keyword_id で1回 GROUP BY した件数で usage_count を置き換える
+    定期実行には scripts/reconcile_keyword_usage.py を使う
+    """
+    return reconcile_usage_counts(db, prune_orphans)
+
 @router.post("", response_model=KeywordResponse, status_code=201)
 def create_keyword(
     request: KeywordCreateRequest,
@@ -69,6 +173,8 @@ def create_keyword(
     )
     db.add(new_keyword)
     db.commit()
+    keyword_version.bump()
     db.refresh(new_keyword)
+    keyword_trie.upsert(new_keyword.id, new_keyword.name, new_keyword.normalized_name, new_keyword.usage_count)
     
     return new_keyword
\ No newline at end of file
@@ -1,6 +1,6 @@
 # backend/app/routers/network.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import func
@@ -10,6 +10,9 @@ from app.db import get_db
 from app.models.genre import Genre
 from app.models.document import Document
 from app.schemas.network import NetworkGraphResponse, NetworkNode, NetworkLink
+from app.utils.cache import content_version
+from app.utils.etag import BOOT_ID, documents_fingerprint, make_etag, etag_matches, not_modified, set_etag
+from app.utils.genre_tree import genres_fingerprint
 
 router = APIRouter(
     prefix="/api/network",
@@ -68,6 +71,8 @@ def _build_genre_nodes_and_links(
 
 @router.get("/graph", response_model=NetworkGraphResponse)
 def get_network_graph(
+    request: Request,
+    response: Response,
     genre_id: int | None = None,
     include_inactive: bool = False,
     db: Session = Depends(get_db)
@@ -86,8 +91,17 @@ def get_network_graph(
     【レスポンス】
     - nodes: ジャンルノード + ドキュメントノード
     - links: ジャンル階層リンク + ジャンル-ドキュメントリンク
+    - ETag を返し、If-None-Match が一致すれば 304（グラフの構築は行わない）
+      ドキュメントの変更は content_version と DB の集計値（他プロセスの書き込み用）、ジャンルの変更は集計値で検出する
     """
     try:
+        etag = make_etag(
+            "network_graph", BOOT_ID, content_version.value, *documents_fingerprint(db), *genres_fingerprint(db)
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+
         nodes: List[NetworkNode] = []
         links: List[NetworkLink] = []
         
@@ -0,0 +1,176 @@
+# backend/app/routers/stats.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.db import get_db
+from app.models.document import Document
+from app.models.genre import Genre
+from app.models.document_daily_stat import DocumentDailyStat
+from app.models.document_viewer_sketch import DocumentViewerSketch
+from app.schemas.stats import DocumentDailyStatsResponse, GenreDailyStatsResponse, DocumentUniqueViewersResponse
+from app.utils.genre_tree import genre_tree
+from app.utils.hyperloglog import HyperLogLog
+
+router = APIRouter(
+    prefix="/api/stats",
+    tags=["stats"]
+)
+
+# 1回で取得できる最大日数
+MAX_STATS_DAYS = 366
+
+
+def _resolve_period(days: int, end_date: Optional[date]) -> Tuple[date, date]:
+    """集計期間（end_date を含む過去 days 日間）"""
+    end = end_date or date.today()
+    return end - timedelta(days=days - 1), end
+
+
+def _build_series(rows: Iterable[Tuple[date, int, int, int]], start: date, end: date) -> dict:
+    """日付ごとの集計行を、期間内の全日を埋めた時系列と合計に変換"""
+    by_date: Dict[date, Tuple[int, int, int]] = {
+        stat_date: (int(views or 0), int(helpful or 0), int(not_helpful or 0))
+        for stat_date, views, helpful, not_helpful in rows
+    }
+    series = []
+    current = start
+    while current <= end:
+        views, helpful, not_helpful = by_date.get(current, (0, 0, 0))
+        series.append({
+            "stat_date": current,
+            "view_count": views,
+            "helpful_count": helpful,
+            "not_helpful_count": not_helpful,
+        })
+        current += timedelta(days=1)
+
+    return {
+        "start_date": start,
+        "end_date": end,
+        "total_view_count": sum(point["view_count"] for point in series),
+        "total_helpful_count": sum(point["helpful_count"] for point in series),
+        "total_not_helpful_count": sum(point["not_helpful_count"] for point in series),
+        "series": series,
+    }
+
+
+@router.get("/documents/{document_id}/daily", response_model=DocumentDailyStatsResponse)
+def get_document_daily_stats(
+    document_id: int,
+    days: int = Query(30, ge=1, le=MAX_STATS_DAYS, description="集計日数"),
+    end_date: Optional[date] = Query(None, description="集計の最終日（省略時は今日）"),
+    db: Session = Depends(get_db)
+):
+    """
+    ドキュメント別の日次推移（閲覧数・評価数）
+
+    - 日次集計テーブル（document_daily_stats）だけを参照し、評価の生データは読まない
+    - 集計がない日は0で埋める
+    """
+    if not db.query(Document.id).filter(Document.id == document_id).first():
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    start, end = _resolve_period(days, end_date)
+    rows = (
+        db.query(
+            DocumentDailyStat.stat_date,
+            DocumentDailyStat.view_count,
+            DocumentDailyStat.helpful_count,
+            DocumentDailyStat.not_helpful_count,
+        )
+        .filter(
+            DocumentDailyStat.document_id == document_id,
+            DocumentDailyStat.stat_date.between(start, end),
+        )
+        .all()
+    )
+    return {"document_id": document_id, **_build_series(rows, start, end)}
+
+
+@router.get("/genres/{genre_id}/daily", response_model=GenreDailyStatsResponse)
+def get_genre_daily_stats(
+    genre_id: int,
+    days: int = Query(30, ge=1, le=MAX_STATS_DAYS, description="集計日数"),
+    end_date: Optional[date] = Query(None, description="集計の最終日（省略時は今日）"),
+    include_descendants: bool = Query(True, description="子孫ジャンルのドキュメントも含めるか"),
+    db: Session = Depends(get_db)
+):
+    """
+    ジャンル別の日次推移（閲覧数・評価数）
+
+    - 日次集計テーブルの genre_id で絞り込み、日付ごとに GROUP BY する（documents とは結合しない）
+    - include_descendants=true（デフォルト）の場合は子孫ジャンルの分も合算する
+    """
+    if not db.query(Genre.id).filter(Genre.id == genre_id).first():
+        raise HTTPException(status_code=404, detail="Genre not found")
+
+    genre_ids = genre_tree.subtree_ids(db, genre_id) if include_descendants else [genre_id]
+    start, end = _resolve_period(days, end_date)
+    rows = (
+        db.query(
+            DocumentDailyStat.stat_date,
+            func.sum(DocumentDailyStat.view_count),
+            func.sum(DocumentDailyStat.helpful_count),
+            func.sum(DocumentDailyStat.not_helpful_count),
+        )
+        .filter(
+            DocumentDailyStat.genre_id.in_(genre_ids),
+            DocumentDailyStat.stat_date.between(start, end),
+        )
+        .group_by(DocumentDailyStat.stat_date)
+        .all()
+    )
+    return {"genre_id": genre_id, "include_descendants": include_descendants, **_build_series(rows, start, end)}
+
+
+@router.get("/documents/{document_id}/unique_viewers", response_model=DocumentUniqueViewersResponse)
+def get_document_unique_viewers(
+    document_id: int,
+    days: int = Query(30, ge=1, le=MAX_STATS_DAYS, description="集計日数"),
+    end_date: Optional[date] = Query(None, description="集計の最終日（省略時は今日）"),
+    db: Session = Depends(get_db)
+):
+    """
+    ドキュメント別のユニーク閲覧者数（HyperLogLog による推定値）
+
+    - 累計・日次は保存済みの推定値を返す
+    - 期間内の値は日次のスケッチをマージして求める（複数日に閲覧した人は1人と数える）
+    - 閲覧数バッファの未反映分は含まれない
+    """
+    if not db.query(Document.id).filter(Document.id == document_id).first():
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    lifetime = (
+        db.query(DocumentViewerSketch.unique_viewer_count)
+        .filter(DocumentViewerSketch.document_id == document_id)
+        .scalar()
+    )
+    start, end = _resolve_period(days, end_date)
+    rows = (
+        db.query(DocumentDailyStat.stat_date, DocumentDailyStat.unique_viewer_count, DocumentDailyStat.viewer_sketch)
+        .filter(
+            DocumentDailyStat.document_id == document_id,
+            DocumentDailyStat.stat_date.between(start, end),
+        )
+        .all()
+    )
+    by_date = {stat_date: count for stat_date, count, _ in rows}
+    series = []
+    current = start
+    while current <= end:
+        series.append({"stat_date": current, "unique_viewer_count": by_date.get(current, 0)})
+        current += timedelta(days=1)
+
+    period = HyperLogLog.union(HyperLogLog.from_bytes(sketch) for _, _, sketch in rows if sketch)
+    return {
+        "document_id": document_id,
+        "lifetime_unique_viewer_count": lifetime or 0,
+        "start_date": start,
+        "end_date": end,
+        "period_unique_viewer_count": period.estimate(),
+        "series": series,
+    }
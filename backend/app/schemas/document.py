@@ -146,4 +146,31 @@ class DocumentCreateResponse(BaseModel):
     keywords: List[KeywordResponse]
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# 一括登録で1リクエストに含められる最大件数
+BULK_IMPORT_MAX_ITEMS = 10000
+
+
+class DocumentBulkCreateRequest(BaseModel):
+    """ドキュメント一括登録リクエスト（各要素は DocumentCreateRequest と同じ形式、検証は要素ごとに行う）"""
+    documents: List[dict] = Field(..., min_length=1, max_length=BULK_IMPORT_MAX_ITEMS)
+
+
+class DocumentBulkCreatedItem(BaseModel):
+    """登録できた要素"""
+    index: int  # リクエスト内の位置
+    id: int
+
+
+class DocumentBulkErrorItem(BaseModel):
+    """登録できなかった要素"""
+    index: int  # リクエスト内の位置
+    messages: List[str]
+
+
+class DocumentBulkCreateResponse(BaseModel):
+    """ドキュメント一括登録レスポンス"""
+    total: int
+    created: List[DocumentBulkCreatedItem]
+    errors: List[DocumentBulkErrorItem]
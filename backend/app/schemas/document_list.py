@@ -29,3 +29,77 @@ class DocumentResponse(BaseModel):
 
     class Config:
         from_attributes = True  # SQLAlchemyモデルから自動変換
+
+
+class DocumentSummaryResponse(BaseModel):
+    """一覧カード表示用（本文の代わりに先頭部分のプレビューを返す: view=summary）"""
+    id: int
+    title: str
+    content_preview: str  # 本文の先頭（長い場合は末尾に「…」）
+    genre_id: int
+    genre_name: str
+    external_link: str | None = None
+    status: DocumentStatus
+    created_by: int
+    creator_name: str
+    created_at: datetime
+    updated_by: int | None = None
+    updated_at: datetime
+    helpful_count: int
+    view_count: int
+    helpfulness_score: Decimal
+    keywords: Optional[List[dict]] = None
+
+
+class SearchHighlight(BaseModel):
+    """抜粋内のハイライト範囲（start以上end未満の文字位置）"""
+    start: int
+    end: int
+
+
+class DocumentSnippetResponse(BaseModel):
+    """検索結果（本文の代わりに抜粋を返す: fields=snippet）"""
+    id: int
+    title: str
+    snippet: str  # 最初の一致箇所周辺の抜粋
+    highlights: List[SearchHighlight] = []  # 抜粋内の一致箇所
+    genre_id: int
+    genre_name: str
+    external_link: str | None = None
+    status: DocumentStatus
+    created_by: int
+    creator_name: str
+    created_at: datetime
+    updated_by: int | None = None
+    updated_at: datetime
+    helpful_count: int
+    view_count: int
+    helpfulness_score: Decimal
+    keywords: Optional[List[dict]] = None
+
+
+class TrendingDocumentResponse(BaseModel):
+    """トレンドドキュメント（閲覧・役立った評価の時間減衰スコア順）"""
+    id: int
+    title: str
+    genre_id: int
+    genre_name: str
+    view_count: int
+    helpful_count: int
+    helpfulness_score: Decimal
+    trending_score: float  # 時間減衰スコア（直近の再計算時点）
+
+
+class GenreFacet(BaseModel):
+    """ジャンル別のヒット件数（子ジャンルの件数を含む）"""
+    genre_id: int
+    name: str
+    parent_id: int | None = None
+    level: int
+    count: int
+
+
+class SearchFacetsResponse(BaseModel):
+    """検索結果のファセット集計"""
+    total: int  # ヒット件数
+    genres: List[GenreFacet]
@@ -11,6 +11,25 @@ class KeywordResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class KeywordSuggestion(BaseModel):
+    """キーワード入力補完の候補"""
+    id: int
+    name: str
+    usage_count: int
+
+class RelatedKeyword(BaseModel):
+    """関連キーワード（同じドキュメントに付いた回数順）"""
+    id: int
+    name: str
+    usage_count: int
+    cooccurrence_count: int  # 同じドキュメントに付いた回数
+
+class KeywordReconcileResponse(BaseModel):
+    """使用回数の再集計結果"""
+    keywords: int  # 再集計後のキーワード数
+    updated: int  # 使用回数を直したキーワード数
+    pruned: int  # 削除した孤立キーワード数
+
 class KeywordCreateRequest(BaseModel):
     """キーワード作成リクエスト"""
     name: str = Field(..., min_length=1, max_length=50)
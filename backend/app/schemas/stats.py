@@ -0,0 +1,52 @@
+# backend/app/schemas/stats.py
+
+from pydantic import BaseModel
+from datetime import date
+from typing import List
+
+
+class DailyStatPoint(BaseModel):
+    """1日分の集計値"""
+    stat_date: date
+    view_count: int
+    helpful_count: int  # 役立った評価の数
+    not_helpful_count: int  # そうでもない評価の数
+
+
+class DocumentDailyStatsResponse(BaseModel):
+    """ドキュメント別の日次推移"""
+    document_id: int
+    start_date: date
+    end_date: date
+    total_view_count: int
+    total_helpful_count: int
+    total_not_helpful_count: int
+    series: List[DailyStatPoint]  # 期間内の全日（集計がない日は0）
+
+
+class GenreDailyStatsResponse(BaseModel):
+    """ジャンル別の日次推移"""
+    genre_id: int
+    include_descendants: bool
+    start_date: date
+    end_date: date
+    total_view_count: int
+    total_helpful_count: int
+    total_not_helpful_count: int
+    series: List[DailyStatPoint]
+
+
+class UniqueViewerPoint(BaseModel):
+    """1日分のユニーク閲覧者数（推定値）"""
+    stat_date: date
+    unique_viewer_count: int
+
+
+class DocumentUniqueViewersResponse(BaseModel):
+    """ドキュメント別のユニーク閲覧者数（HyperLogLog による推定値、誤差 約1.6%）"""
+    document_id: int
+    lifetime_unique_viewer_count: int  # 累計
+    start_date: date
+    end_date: date
+    period_unique_viewer_count: int  # 期間内（日をまたいで重複を除いた数）
+    series: List[UniqueViewerPoint]  # 期間内の全日（集計がない日は0）
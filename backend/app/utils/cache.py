@@ -0,0 +1,114 @@
+"""
+クエリ結果キャッシュ（LRU + TTL + コンテンツバージョン）
+
+- ドキュメントの作成・評価・閲覧で content_version を進め、それ以前のキャッシュを無効化する
+- バージョンはプロセス内のカウンターのため、複数ワーカー構成では各ワーカーが個別に持つ
+  （TTL を短めにして他ワーカーでの更新を一定時間内に反映させる）
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", 1024))
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", 60))
+
+
+class ContentVersion:
+    """ドキュメントの更新ごとに進むバージョン番号"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        """バージョンを1つ進める（以前のキャッシュはすべて無効になる）"""
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+class QueryCache:
+    """正規化したクエリパラメータをキーにした LRU/TTL キャッシュ"""
+
+    def __init__(self, version: ContentVersion, max_entries: int, ttl_seconds: float) -> None:
+        self._version = version
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (バージョン, 有効期限, 値)
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(namespace: str, params: Dict[str, Any]) -> Hashable:
+        """名前空間とパラメータ（順不同）からキャッシュキーを作成"""
+        return (namespace, tuple(sorted(params.items())))
+
+    def get_or_compute(self, namespace: str, params: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """
+        キャッシュがあれば返し、なければ compute() の結果を保存して返す
+
+        compute() の実行中にバージョンが進んだ場合、その結果は保存しない
+        （更新前のデータを新しいバージョンのキャッシュとして残さないため）
+        """
+        key = self.make_key(namespace, params)
+        version = self._version.value
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, expires_at, value = entry
+                if entry_version == version and expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            if self._version.value == version:
+                self._entries[key] = (version, now + self._ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """全エントリを削除"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット・ミス数などの統計情報"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl_seconds,
+                "content_version": self._version.value,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# プロセス内で共有するバージョンとキャッシュ
+content_version = ContentVersion()
+# キーワードの作成・使用回数の変更ごとに進むバージョン（人気キーワードのキャッシュ用）
+keyword_version = ContentVersion()
+query_cache = QueryCache(content_version, QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_TTL_SECONDS)
@@ -0,0 +1,199 @@
+"""
+ドキュメントの一括登録（POST /api/documents/bulk と scripts/import_documents.py で共用）
+
+- 各要素を DocumentCreateRequest で検証し、不正なものは要素ごとのエラーとして返す（他の要素は登録を続ける）
+- ジャンルは全要素分を1回のクエリで存在確認する
+- チャンクごとに1トランザクションで、ドキュメント・キーワード・紐付けをそれぞれ executemany で投入する
+  （キーワードはチャンク内の使用回数を集計し、UPSERT 1文で作成・加算する）
+- ドキュメントIDは AUTO_INCREMENT で採番し、チャンクの全行を1文の複数行 INSERT で登録してから読み戻す
+  （PostgreSQL・SQLite は RETURNING、MySQL は LAST_INSERT_ID() と行数から。_insert_documents を参照）
+- チャンクの登録に失敗した場合は、そのチャンクの要素だけをエラーにして次のチャンクへ進む
+"""
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List
+
+from pydantic import ValidationError
+from sqlalchemy import insert, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.document import Document, DocumentStatus
+from app.models.document_keyword import DocumentKeyword
+from app.models.genre import Genre
+from app.models.keyword import Keyword
+from app.routers.keywords import normalize_text, normalize_title
+from app.schemas.document import DocumentCreateRequest
+from app.utils.cache import content_version, keyword_version
+from app.utils.keyword_upsert import normalize_keywords, upsert_keyword_usage
+from app.utils.keyword_cooccurrence import keyword_cooccurrence
+from app.utils.keyword_trie import keyword_trie
+from app.utils.search_index import search_index
+
+# 1トランザクションで登録するドキュメント数
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 1000))
+
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    """検証エラーを「項目: メッセージ」の一覧に変換"""
+    messages = []
+    for detail in error.errors():
+        location = ".".join(str(part) for part in detail.get("loc", ()))
+        messages.append(f"{location}: {detail['msg']}" if location else detail["msg"])
+    return messages
+
+
+class ImportIdMismatchError(Exception):
+    """読み戻したIDが登録した行と一致しない（チャンクはロールバックされる）"""
+
+
+_documents = Document.__table__
+
+
+def _insert_documents(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    ドキュメントを1文の複数行 INSERT で登録し、AUTO_INCREMENT で採番されたIDを rows の順に返す
+
+    - RETURNING に対応したDB（PostgreSQL・SQLite など）は、行の順に並べたIDを RETURNING で受け取る
+    - MySQL は LAST_INSERT_ID()（複数行 INSERT では先頭行のID）から行数分の連番とする
+      行数が事前に決まる INSERT（simple insert）は、innodb_autoinc_lock_mode が 0・1 では連番が保証され、
+      2（interleaved、MySQL 8 の既定値）でも1文分がまとめて確保される。
+      ただし 2 では公式には連続を保証していないため、読み戻したIDの範囲の行がこの INSERT の行と一致するかを確認する
+
+    Raises:
+        ImportIdMismatchError: ID の範囲に他の行が含まれていた場合
+    """
+    dialect = db.get_bind().dialect
+    if dialect.insert_returning:
+        result = db.execute(
+            insert(_documents).returning(_documents.c.id, sort_by_parameter_order=True),
+            rows,
+        )
+        return list(result.scalars())
+
+    db.execute(insert(_documents).values(rows))
+    first_id = db.execute(text("SELECT LAST_INSERT_ID()")).scalar()
+    ids = list(range(first_id, first_id + len(rows)))
+    titles = [
+        title for (title,) in db.query(Document.title)
+        .filter(Document.id.between(ids[0], ids[-1]))
+        .order_by(Document.id)
+    ]
+    if titles != [row["title"] for row in rows]:
+        raise ImportIdMismatchError(f"採番されたIDが連続していません（ID {ids[0]}〜{ids[-1]}）")
+    return ids
+
+
+def import_documents(
+    db: Session,
+    items: List[Any],
+    created_by: int,
+    chunk_size: int = BULK_IMPORT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    ドキュメントを一括登録
+
+    Args:
+        items: 登録するドキュメント（DocumentCreateRequest と同じ形式の dict）
+        created_by: 作成者のユーザーID
+
+    Returns:
+        {"total": 要素数, "created": [{"index", "id"}], "errors": [{"index", "messages"}]}
+        （index は items 内の位置）
+    """
+    created: List[Dict[str, int]] = []
+    errors: List[Dict[str, Any]] = []
+
+    # 1. 検証
+    valid: List[tuple] = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, DocumentCreateRequest.model_validate(item)))
+        except ValidationError as e:
+            errors.append({"index": index, "messages": _validation_messages(e)})
+
+    # 2. ジャンルの存在確認（全要素分を1クエリで）
+    genre_ids = {request.genre_id for _, request in valid}
+    existing_genres = {genre_id for (genre_id,) in db.query(Genre.id).filter(Genre.id.in_(genre_ids))} if genre_ids else set()
+    resolved = []
+    for index, request in valid:
+        if request.genre_id in existing_genres:
+            resolved.append((index, request, normalize_keywords(request.keywords)))
+        else:
+            errors.append({"index": index, "messages": [f"genre_id: Genre with id {request.genre_id} not found"]})
+
+    # 3. チャンクごとに登録
+    imported = []
+    keyword_ids_used = set()
+    for start in range(0, len(resolved), chunk_size):
+        chunk = resolved[start:start + chunk_size]
+        try:
+            now = datetime.now()
+            document_ids = _insert_documents(
+                db,
+                [
+                    {
+                        "title": request.title,
+                        "content": request.content,
+                        "normalized_title": normalize_title(request.title),
+                        "normalized_content": normalize_text(request.content),
+                        "genre_id": request.genre_id,
+                        "external_link": request.external_link,
+                        "status": DocumentStatus.PUBLISHED,
+                        "created_by": created_by,
+                        "created_at": now,
+                        "updated_at": now,
+                        "helpful_count": 0,
+                        "view_count": 0,
+                        "helpfulness_score": 0.0,
+                    }
+                    for _, request, _ in chunk
+                ],
+            )
+
+            keyword_names: Dict[str, str] = {}
+            keyword_counts: Counter = Counter()
+            for _, _, keywords in chunk:
+                for normalized_name, name in keywords.items():
+                    keyword_names.setdefault(normalized_name, name)
+                    keyword_counts[normalized_name] += 1
+            keyword_ids = upsert_keyword_usage(db, keyword_names, keyword_counts)
+            links = [
+                {"document_id": document_id, "keyword_id": keyword_ids[normalized_name], "created_at": now}
+                for document_id, (_, _, keywords) in zip(document_ids, chunk)
+                for normalized_name in keywords
+            ]
+            if links:
+                db.execute(insert(DocumentKeyword.__table__), links)
+            db.commit()
+        except (SQLAlchemyError, ImportIdMismatchError) as e:
+            db.rollback()
+            errors.extend({"index": index, "messages": [f"登録に失敗しました: {str(e)}"]} for index, _, _ in chunk)
+            continue
+
+        keyword_ids_used.update(keyword_ids.values())
+        for document_id, (index, request, keywords) in zip(document_ids, chunk):
+            created.append({"index": index, "id": document_id})
+            imported.append((document_id, request, keywords, now))
+            keyword_cooccurrence.add_document(document_id, [keyword_ids[name] for name in keywords])
+
+    # 4. インメモリのインデックスに反映（コミット済みの内容のみ）
+    if imported:
+        content_version.bump()
+        if keyword_ids_used:
+            keyword_version.bump()
+        for document_id, request, keywords, created_at in imported:
+            search_index.add_document(
+                document_id, request.title, list(keywords.values()), request.content, 0.0, request.genre_id, created_at,
+            )
+        keyword_rows = (
+            db.query(Keyword.id, Keyword.name, Keyword.normalized_name, Keyword.usage_count)
+            .filter(Keyword.id.in_(keyword_ids_used))
+            .all()
+        ) if keyword_ids_used else []
+        for keyword_id, name, normalized_name, usage_count in keyword_rows:
+            keyword_trie.upsert(keyword_id, name, normalized_name, usage_count)
+
+    errors.sort(key=lambda error: error["index"])
+    return {"total": len(items), "created": created, "errors": errors}
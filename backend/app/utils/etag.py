@@ -0,0 +1,70 @@
+"""
+条件付きGET（ETag / If-None-Match）用のユーティリティ
+
+- ETag はリソースごとの軽量なバージョン情報（件数・更新日時・content_version など）から作る
+- content_version はプロセス内のカウンターのため、スクリプトや別ワーカーによる書き込みは
+  DB の集計値（documents_fingerprint など）で検出する
+- If-None-Match が一致すれば、本体のクエリ・シリアライズを行わずに 304 を返す
+- レスポンスは圧縮される場合があるため、弱い ETag（W/"..."）を使う
+"""
+import hashlib
+import uuid
+from typing import Any, Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.document import Document
+
+# プロセスの起動ごとに変わるID
+# content_version はプロセス内のカウンターで再起動すると 0 に戻るため、ETag に含めて衝突を防ぐ
+BOOT_ID = uuid.uuid4().hex
+
+# クライアントに毎回の再検証（条件付きGET）を求める
+CACHE_CONTROL = "no-cache"
+
+
+def documents_fingerprint(db: Session) -> Tuple[Any, ...]:
+    """
+    ドキュメントのバージョン情報（ETag 用）
+
+    件数（削除）・最大ID（作成）・最大更新日時（評価・閲覧数の書き込みを含む更新）を1クエリで集計する
+    最大値は主キーと ix_documents_updated_at の端を読むだけで求まる
+    （updated_at は秒単位のため、同じ秒に他のプロセスで行われた更新は、その後の書き込みまで検出できない）
+
+    Returns:
+        (件数, 最大ID, 最大更新日時)
+    """
+    return tuple(db.query(func.count(Document.id), func.max(Document.id), func.max(Document.updated_at)).one())
+
+
+def make_etag(*parts: Any) -> str:
+    """バージョン情報から弱い ETag を作成"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match のいずれかが ETag と一致するか（弱い比較）"""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """304 Not Modified レスポンス"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """通常のレスポンスに ETag を付与"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
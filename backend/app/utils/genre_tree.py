@@ -0,0 +1,114 @@
+"""
+ジャンル階層（materialized path）を扱うユーティリティ
+
+Genre.path は "1/5/23" のようにルートから自身までのIDを "/" で連結した文字列
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from app.models.genre import Genre
+
+load_dotenv()
+
+# ジャンル階層のキャッシュ有効期間（ジャンルはAPIから更新されず、初期データ投入スクリプトでのみ変わる）
+GENRE_TREE_TTL_SECONDS = float(os.getenv("GENRE_TREE_TTL_SECONDS", 300))
+
+
+def path_ids(path: str) -> List[int]:
+    """パスをルートから自身までのジャンルIDのリストに変換"""
+    return [int(part) for part in path.split("/") if part]
+
+
+def rollup_counts(genres: Iterable[Tuple[int, str]], direct_counts: Dict[int, int]) -> Dict[int, int]:
+    """
+    ジャンルごとの件数を祖先ジャンルにも積み上げる
+
+    Args:
+        genres: (ジャンルID, パス) の一覧
+        direct_counts: ジャンルIDごとの直接の件数
+
+    Returns:
+        ジャンルIDごとの「自身 + 子孫」の件数
+    """
+    paths = dict(genres)
+    counts: Dict[int, int] = {}
+    for genre_id, count in direct_counts.items():
+        # パスが不明なジャンル（削除済みなど）は自身のみ数える
+        for ancestor_id in path_ids(paths[genre_id]) if genre_id in paths else [genre_id]:
+            counts[ancestor_id] = counts.get(ancestor_id, 0) + count
+    return counts
+
+
+def genres_fingerprint(db: Session) -> Tuple[int, str]:
+    """
+    ジャンル一覧のバージョン情報（ETag 用）
+
+    ジャンルテーブルには更新日時がないため、レスポンスに含まれる全カラムを1クエリで読み込み、
+    チェックサムをとる（件数や合計の集計では、名前の変更・親の付け替え・表示順の入れ替えを検出できない）
+    ジャンルは数百件程度のため、全件読み込んでも負荷は小さい
+
+    Returns:
+        (件数, チェックサム)
+    """
+    rows = db.query(
+        Genre.id,
+        Genre.name,
+        Genre.parent_id,
+        Genre.level,
+        Genre.path,
+        Genre.display_order,
+        Genre.is_active,
+        Genre.created_at,
+    ).order_by(Genre.id).all()
+    checksum = hashlib.sha1()
+    for row in rows:
+        checksum.update(repr(tuple(row)).encode("utf-8"))
+    return len(rows), checksum.hexdigest()
+
+
+class GenreTreeCache:
+    """
+    ジャンルIDごとの子孫ID集合のキャッシュ
+
+    - 全ジャンルのパスを1クエリで読み込み、各ジャンルの「自身 + 子孫」のID集合を前計算する
+    - 一覧のフィルタはこの集合で IN 検索するため、ジャンルごとのクエリや LIKE は発生しない
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._subtrees: Dict[int, FrozenSet[int]] = {}
+        self._expires_at = 0.0
+
+    def subtree_ids(self, db: Session, genre_id: int) -> FrozenSet[int]:
+        """ジャンル自身と子孫のID集合（存在しないジャンルは自身のみ）"""
+        with self._lock:
+            if time.monotonic() >= self._expires_at:
+                self._subtrees = self._load(db)
+                self._expires_at = time.monotonic() + self._ttl_seconds
+            return self._subtrees.get(genre_id, frozenset((genre_id,)))
+
+    def invalidate(self) -> None:
+        """次回アクセス時に読み込み直す"""
+        with self._lock:
+            self._expires_at = 0.0
+
+    @staticmethod
+    def _load(db: Session) -> Dict[int, FrozenSet[int]]:
+        """パスを辿って、各ジャンルを祖先すべての子孫集合に登録"""
+        subtrees: Dict[int, set] = {}
+        for genre_id, path in db.query(Genre.id, Genre.path).all():
+            subtrees.setdefault(genre_id, set()).add(genre_id)
+            for ancestor_id in path_ids(path or ""):
+                subtrees.setdefault(ancestor_id, set()).add(genre_id)
+        return {genre_id: frozenset(ids) for genre_id, ids in subtrees.items()}
+
+
+# プロセス内で共有するジャンル階層キャッシュ
+genre_tree = GenreTreeCache(GENRE_TREE_TTL_SECONDS)
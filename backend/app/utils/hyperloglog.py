@@ -0,0 +1,81 @@
+"""
+HyperLogLog（ユニーク数の推定）
+
+- 要素そのものは保持せず、2^HLL_PRECISION 個のレジスタ（各1バイト）だけで異なり数を推定する
+  （精度 12: 4096 レジスタ、標準誤差 約1.6%）
+- 2つのスケッチの和集合はレジスタごとの最大値で求まるため、ワーカー間・日付間でマージできる
+- 保存時は zlib で圧縮する（件数が少ないうちはほとんどのレジスタが0のため数十バイトに収まる）
+"""
+import hashlib
+import math
+import zlib
+from typing import Iterable, Optional
+
+HLL_PRECISION = 12
+_REGISTER_COUNT = 1 << HLL_PRECISION
+# ハッシュ（64ビット）のうちレジスタ番号に使わない残りのビット数
+_REMAINING_BITS = 64 - HLL_PRECISION
+_ALPHA = 0.7213 / (1 + 1.079 / _REGISTER_COUNT)
+
+
+class HyperLogLog:
+    """異なり数を推定するスケッチ"""
+
+    __slots__ = ("_registers",)
+
+    def __init__(self, registers: Optional[bytes] = None) -> None:
+        if registers is not None and len(registers) != _REGISTER_COUNT:
+            raise ValueError(f"レジスタ数が一致しません: {len(registers)}")
+        self._registers = bytearray(registers) if registers is not None else bytearray(_REGISTER_COUNT)
+
+    def add(self, value: str) -> bool:
+        """要素を追加（推定値が変わり得る場合は True）"""
+        hashed = int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+        index = hashed >> _REMAINING_BITS
+        rest = hashed & ((1 << _REMAINING_BITS) - 1)
+        # 残りのビットの先頭から数えた最初の1の位置
+        rank = _REMAINING_BITS - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+            return True
+        return False
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """other との和集合にする"""
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def estimate(self) -> int:
+        """異なり数の推定値"""
+        total = 0.0
+        zeros = 0
+        for register in self._registers:
+            total += 2.0 ** -register
+            if register == 0:
+                zeros += 1
+        estimate = _ALPHA * _REGISTER_COUNT * _REGISTER_COUNT / total
+        # 少数のうちは線形カウンティングの方が正確
+        if estimate <= 2.5 * _REGISTER_COUNT and zeros:
+            estimate = _REGISTER_COUNT * math.log(_REGISTER_COUNT / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        """保存用のバイト列（先頭1バイトは精度）"""
+        return zlib.compress(bytes([HLL_PRECISION]) + bytes(self._registers))
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "HyperLogLog":
+        """to_bytes の逆変換（None は空のスケッチ）"""
+        if not data:
+            return cls()
+        raw = zlib.decompress(data)
+        if raw[0] != HLL_PRECISION:
+            raise ValueError(f"精度が一致しません: {raw[0]}")
+        return cls(raw[1:])
+
+    @classmethod
+    def union(cls, sketches: Iterable["HyperLogLog"]) -> "HyperLogLog":
+        """複数のスケッチの和集合"""
+        result = cls()
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
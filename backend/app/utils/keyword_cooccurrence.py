@@ -0,0 +1,215 @@
+"""
+キーワードの共起行列（関連キーワードの提案用）
+
+- document_keywords から「同じドキュメントに付いたキーワードの組」を数え、
+  疎行列（CSR 形式: indptr / indices / data の NumPy 配列）として保持する
+  行 = キーワード、列 = 共起したキーワード、値 = 共起したドキュメント数
+- 行列は起動時にバックグラウンドで作成し、その後も定期的に DB から作り直す
+  （起動を待たせないため。作成前に参照された場合は ensure_keyword_cooccurrence がその場で作成する）
+- 作り直すまでの間に作成されたドキュメントの分は、差分（ドキュメントごとのキーワード）として保持し、参照時に加算する
+- 関連キーワードの取得は行のスライスと上位 k 件の選択だけで、DB の自己結合は行わない
+"""
+import os
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.document_keyword import DocumentKeyword
+
+load_dotenv()
+
+# 行列を作り直す間隔（秒）
+KEYWORD_COOCCURRENCE_REBUILD_SECONDS = float(os.getenv("KEYWORD_COOCCURRENCE_REBUILD_SECONDS", 600))
+# 関連キーワードの取得件数の上限
+RELATED_TOP_K = 20
+
+
+class _CsrMatrix:
+    """キーワードID × キーワードID の共起回数（行・列ともキーワードIDの昇順）"""
+
+    __slots__ = ("row_ids", "indptr", "indices", "data")
+
+    def __init__(self, row_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray) -> None:
+        self.row_ids = row_ids  # 行に対応するキーワードID
+        self.indptr = indptr  # 行 i の要素は indices[indptr[i]:indptr[i + 1]]
+        self.indices = indices  # 列のキーワードID
+        self.data = data  # 共起回数
+
+    @classmethod
+    def empty(cls) -> "_CsrMatrix":
+        return cls(np.empty(0, np.int64), np.zeros(1, np.int64), np.empty(0, np.int64), np.empty(0, np.int32))
+
+    @classmethod
+    def from_pairs(cls, rows: np.ndarray, cols: np.ndarray) -> "_CsrMatrix":
+        """(行, 列) の組の一覧から、組ごとの出現回数を値とする行列を作る"""
+        if rows.size == 0:
+            return cls.empty()
+        order = np.lexsort((cols, rows))
+        rows, cols = rows[order], cols[order]
+        # 連続する同じ組をまとめて数える
+        starts = np.flatnonzero(np.r_[True, (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])])
+        counts = np.diff(np.r_[starts, rows.size]).astype(np.int32)
+        rows, cols = rows[starts], cols[starts]
+        row_ids, row_starts = np.unique(rows, return_index=True)
+        indptr = np.r_[row_starts, rows.size].astype(np.int64)
+        return cls(row_ids, indptr, cols, counts)
+
+    def row(self, keyword_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """キーワードの行（列のキーワードID, 共起回数）"""
+        position = int(np.searchsorted(self.row_ids, keyword_id))
+        if position >= self.row_ids.size or self.row_ids[position] != keyword_id:
+            return self.indices[:0], self.data[:0]
+        start, end = self.indptr[position], self.indptr[position + 1]
+        return self.indices[start:end], self.data[start:end]
+
+
+def _pairs(keyword_ids: Iterable[int]) -> List[Tuple[int, int]]:
+    """1ドキュメントのキーワードから共起の組（向きつき、自分自身は除く）"""
+    unique_ids = sorted(set(keyword_ids))
+    return [(a, b) for a in unique_ids for b in unique_ids if a != b]
+
+
+class KeywordCooccurrence:
+    """キーワードの共起行列と、作り直すまでの差分"""
+
+    def __init__(self, session_factory: Callable[[], Session], rebuild_seconds: float) -> None:
+        self._session_factory = session_factory
+        self._rebuild_seconds = rebuild_seconds
+        self._lock = threading.Lock()
+        self._matrix = _CsrMatrix.empty()
+        # 行列に含まれていないドキュメント: ドキュメントID -> キーワードID
+        self._pending_documents: Dict[int, List[int]] = {}
+        # 差分の共起回数: キーワードID -> (キーワードID -> 回数)
+        self._delta: Dict[int, Counter] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.ready = False
+
+    def build(self, db: Session) -> None:
+        """document_keywords 全体から行列を作り直す"""
+        # 読み込み中に作成されたドキュメントの差分を残すため、対象の上限IDを先に決める
+        max_document_id = db.query(func.max(DocumentKeyword.document_id)).scalar() or 0
+        rows = (
+            db.query(DocumentKeyword.document_id, DocumentKeyword.keyword_id)
+            .filter(DocumentKeyword.document_id <= max_document_id)
+            .order_by(DocumentKeyword.document_id)
+            .yield_per(5000)
+        )
+        pair_rows: List[int] = []
+        pair_cols: List[int] = []
+        current_document: Optional[int] = None
+        keyword_ids: List[int] = []
+        for document_id, keyword_id in rows:
+            if document_id != current_document:
+                for a, b in _pairs(keyword_ids):
+                    pair_rows.append(a)
+                    pair_cols.append(b)
+                current_document, keyword_ids = document_id, []
+            keyword_ids.append(keyword_id)
+        for a, b in _pairs(keyword_ids):
+            pair_rows.append(a)
+            pair_cols.append(b)
+
+        matrix = _CsrMatrix.from_pairs(np.array(pair_rows, np.int64), np.array(pair_cols, np.int64))
+        with self._lock:
+            self._matrix = matrix
+            self._pending_documents = {
+                document_id: ids for document_id, ids in self._pending_documents.items() if document_id > max_document_id
+            }
+            self._delta = {}
+            for ids in self._pending_documents.values():
+                self._add_delta(ids)
+            self.ready = True
+
+    def clear(self) -> None:
+        """行列と差分を削除し、作成前の状態に戻す"""
+        with self._lock:
+            self._matrix = _CsrMatrix.empty()
+            self._pending_documents = {}
+            self._delta = {}
+            self.ready = False
+
+    def add_document(self, document_id: int, keyword_ids: Iterable[int]) -> None:
+        """作成されたドキュメントのキーワードを差分に加える（コミット後に呼ぶ）"""
+        ids = list(keyword_ids)
+        if len(ids) < 2:
+            return
+        with self._lock:
+            if document_id in self._pending_documents:
+                return
+            self._pending_documents[document_id] = ids
+            self._add_delta(ids)
+
+    def related(self, keyword_id: int, limit: int) -> List[Tuple[int, int]]:
+        """共起回数の多い順に (キーワードID, 共起回数) を返す（同数はIDの昇順）"""
+        with self._lock:
+            indices, data = self._matrix.row(keyword_id)
+            delta = self._delta.get(keyword_id)
+            if delta:
+                merged = Counter(dict(zip(indices.tolist(), data.tolist())))
+                merged.update(delta)
+                indices = np.fromiter(merged.keys(), np.int64, len(merged))
+                data = np.fromiter(merged.values(), np.int64, len(merged))
+        if indices.size == 0:
+            return []
+        if indices.size > limit:
+            # 上位 limit 件の候補だけを取り出してから並べ替える
+            threshold = np.partition(data, indices.size - limit)[indices.size - limit]
+            candidates = data >= threshold
+            indices, data = indices[candidates], data[candidates]
+        order = np.lexsort((indices, -data))[:limit]
+        return [(int(indices[i]), int(data[i])) for i in order]
+
+    def start(self) -> None:
+        """行列の作成（未作成の場合）と定期的な作り直しをバックグラウンドで開始"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="keyword-cooccurrence-builder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """定期的な作り直しを止める"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _add_delta(self, keyword_ids: Iterable[int]) -> None:
+        """差分に共起を加える（ロック取得済みで呼ぶ）"""
+        for a, b in _pairs(keyword_ids):
+            self._delta.setdefault(a, Counter())[b] += 1
+
+    def _run(self) -> None:
+        # 起動直後は周期を待たずに作成する
+        if not self.ready:
+            self._rebuild()
+        while not self._stop.wait(self._rebuild_seconds):
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        db = self._session_factory()
+        try:
+            self.build(db)
+        except Exception as e:
+            # 次の周期で再試行する（スレッドは止めない）
+            print(f"キーワード共起行列の作成に失敗しました: {str(e)}")
+        finally:
+            db.close()
+
+
+# プロセス内で共有する共起行列
+keyword_cooccurrence = KeywordCooccurrence(SessionLocal, KEYWORD_COOCCURRENCE_REBUILD_SECONDS)
+
+
+def ensure_keyword_cooccurrence(db: Session) -> KeywordCooccurrence:
+    """共起行列が未作成なら作成してから返す（起動時に作成できなかった場合の保険）"""
+    if not keyword_cooccurrence.ready:
+        keyword_cooccurrence.build(db)
+    return keyword_cooccurrence
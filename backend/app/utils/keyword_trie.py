@@ -0,0 +1,135 @@
+"""
+キーワード入力補完用のインメモリ前方一致トライ木
+
+- normalize_text 済みの normalized_name を1文字ずつノードに展開
+- 各ノードに「配下で usage_count が大きい上位 SUGGEST_TOP_K 件」を保持し、
+  補完時はプレフィックスのノードを辿るだけで結果を返す（DBアクセスなし）
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.keyword import Keyword
+
+# 1ノードあたりに保持する候補数（suggest の limit の上限）
+SUGGEST_TOP_K = 20
+
+
+class _TrieNode:
+    __slots__ = ("children", "keyword_id", "top")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.keyword_id: Optional[int] = None  # このノードで終わるキーワード
+        self.top: List[int] = []  # 配下の上位キーワードID（ランキング順）
+
+
+class KeywordTrie:
+    """usage_count 順に前方一致候補を返すトライ木"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._root = _TrieNode()
+        # keyword_id -> (表示名, 正規化名, 使用回数)
+        self._keywords: Dict[int, Tuple[str, str, int]] = {}
+        self.ready = False
+
+    def build(self, db: Session) -> None:
+        """DB の全キーワードからトライ木を再構築"""
+        rows = db.query(
+            Keyword.id, Keyword.name, Keyword.normalized_name, Keyword.usage_count
+        ).yield_per(1000)
+
+        trie = KeywordTrie()
+        for keyword_id, name, normalized_name, usage_count in rows:
+            trie._insert(keyword_id, name, normalized_name, usage_count)
+
+        with self._lock:
+            self._root = trie._root
+            self._keywords = trie._keywords
+            self.ready = True
+
+    def clear(self) -> None:
+        """全キーワードを削除し、構築前の状態に戻す"""
+        with self._lock:
+            self._root = _TrieNode()
+            self._keywords = {}
+            self.ready = False
+
+    def upsert(self, keyword_id: int, name: str, normalized_name: str, usage_count: int) -> None:
+        """キーワードを追加、または使用回数を更新"""
+        with self._lock:
+            previous = self._keywords.get(keyword_id)
+            if previous is not None and usage_count < previous[2]:
+                # 使用回数が減った場合は経路上の上位候補を配下から再計算する
+                self._keywords[keyword_id] = (previous[0], previous[1], usage_count)
+                for node in self._path(previous[1]):
+                    node.top = self._collect_top(node)
+                return
+            self._insert(keyword_id, name, normalized_name, usage_count)
+
+    def suggest(self, normalized_prefix: str, limit: int = 10) -> List[dict]:
+        """正規化済みプレフィックスに前方一致するキーワードを使用回数順に返す"""
+        with self._lock:
+            node = self._root
+            for ch in normalized_prefix:
+                node = node.children.get(ch)
+                if node is None:
+                    return []
+            return [
+                {"id": keyword_id, "name": self._keywords[keyword_id][0], "usage_count": self._keywords[keyword_id][2]}
+                for keyword_id in node.top[:limit]
+            ]
+
+    def _rank(self, keyword_id: int) -> Tuple[int, int]:
+        """ランキングのソートキー（使用回数の降順 → ID の昇順）"""
+        return (-self._keywords[keyword_id][2], keyword_id)
+
+    def _insert(self, keyword_id: int, name: str, normalized_name: str, usage_count: int) -> None:
+        """キーワードを登録し、経路上の各ノードの上位候補を更新（使用回数は増加のみ）"""
+        self._keywords[keyword_id] = (name, normalized_name, usage_count)
+        node = self._root
+        self._promote(node, keyword_id)
+        for ch in normalized_name:
+            node = node.children.setdefault(ch, _TrieNode())
+            self._promote(node, keyword_id)
+        node.keyword_id = keyword_id
+
+    def _promote(self, node: _TrieNode, keyword_id: int) -> None:
+        """ノードの上位候補にキーワードを反映"""
+        if keyword_id not in node.top:
+            if len(node.top) >= SUGGEST_TOP_K and self._rank(keyword_id) >= self._rank(node.top[-1]):
+                return
+            node.top.append(keyword_id)
+        node.top.sort(key=self._rank)
+        del node.top[SUGGEST_TOP_K:]
+
+    def _path(self, normalized_name: str) -> List[_TrieNode]:
+        """ルートから正規化名の終端までのノード列"""
+        nodes = [self._root]
+        for ch in normalized_name:
+            nodes.append(nodes[-1].children[ch])
+        return nodes
+
+    def _collect_top(self, node: _TrieNode) -> List[int]:
+        """配下のキーワードをすべて走査して上位候補を求める"""
+        ids: List[int] = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.keyword_id is not None:
+                ids.append(current.keyword_id)
+            stack.extend(current.children.values())
+        return sorted(ids, key=self._rank)[:SUGGEST_TOP_K]
+
+
+# プロセス内で共有するトライ木
+keyword_trie = KeywordTrie()
+
+
+def ensure_keyword_trie(db: Session) -> KeywordTrie:
+    """トライ木が未構築なら構築してから返す（起動時に構築できなかった場合の保険）"""
+    if not keyword_trie.ready:
+        keyword_trie.build(db)
+    return keyword_trie
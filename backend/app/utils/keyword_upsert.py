@@ -0,0 +1,65 @@
+"""
+キーワードの正規化と、使用回数の一括 UPSERT
+
+- ドキュメント作成時のキーワードは、件数に関わらず
+  「INSERT ... ON DUPLICATE KEY UPDATE usage_count = usage_count + 1」1文でまとめて作成・加算する
+  （一意制約のある normalized_name で衝突を判定するため、同時作成でも重複や取りこぼしが起きない）
+- ID は UPSERT の後に normalized_name の IN 検索1回でまとめて DB から取得する
+  （プロセス内にIDをキャッシュすると、別プロセス（scripts/reconcile_keyword_usage.py など）で
+  削除されたキーワードのIDに紐付けてしまうため、キャッシュは持たない）
+"""
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.keyword import Keyword
+from app.routers.keywords import normalize_text
+from app.utils.upsert import upsert_increments
+
+
+def normalize_keywords(keyword_names: Iterable[str]) -> Dict[str, str]:
+    """正規化名 -> 表示名（空のものを除き、重複は最初の表示名を使う）"""
+    keywords: Dict[str, str] = {}
+    for keyword_name in keyword_names:
+        name = keyword_name.strip()
+        normalized_name = normalize_text(name)
+        if normalized_name and normalized_name not in keywords:
+            keywords[normalized_name] = name
+    return keywords
+
+
+def upsert_keyword_usage(db: Session, keywords: Dict[str, str], counts: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    キーワードを作成、または使用回数を加算し、正規化名 -> ID を返す（コミットは呼び出し側で行う）
+
+    UPSERT 1文 + SELECT 1文で、キーワードの件数に関わらずクエリ数は一定
+
+    Args:
+        keywords: 正規化名 -> 表示名（normalize_keywords の結果）
+        counts: 正規化名 -> 使用回数の増分（省略時はすべて1）
+    """
+    if not keywords:
+        return {}
+    now = datetime.now()
+    upsert_increments(
+        db,
+        Keyword.__table__,
+        ["normalized_name"],
+        ["usage_count"],
+        [
+            {
+                "name": name,
+                "normalized_name": normalized_name,
+                "usage_count": counts[normalized_name] if counts else 1,
+                "created_at": now,
+            }
+            for normalized_name, name in keywords.items()
+        ],
+    )
+    # 同じトランザクション内の UPSERT 直後に読むため、他プロセスで削除済みの行も作り直された状態で取得できる
+    return dict(
+        db.query(Keyword.normalized_name, Keyword.id)
+        .filter(Keyword.normalized_name.in_(list(keywords)))
+        .all()
+    )
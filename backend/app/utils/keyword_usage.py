@@ -0,0 +1,74 @@
+"""
+キーワードの使用回数（Keyword.usage_count）の再集計
+
+- usage_count はドキュメント作成時に加算するだけのため、シードデータや削除で実際の紐付け数とずれる
+- document_keywords を keyword_id で GROUP BY した1回の集計から全キーワードの正しい値を求め、
+  値が変わるものだけを executemany の UPDATE でまとめて書き戻す
+- 紐付けが1件もないキーワード（孤立キーワード）は、指定があれば削除する
+- 集計の前にキーワード行を FOR UPDATE でロックし、実行中のドキュメント作成による加算を取りこぼさない
+- インメモリのトライ木・人気キーワードの作り直しは、実行したプロセスでのみ行われる
+  （スクリプトから実行した場合、起動中の API の入力補完には削除したキーワードが再起動まで残る。
+  ドキュメント作成時のキーワードIDは毎回 DB から引くため、削除済みのIDに紐付くことはない）
+"""
+from typing import Dict
+
+from sqlalchemy import bindparam, delete, func, update
+from sqlalchemy.orm import Session
+
+from app.models.document_keyword import DocumentKeyword
+from app.models.keyword import Keyword
+from app.utils.cache import keyword_version
+from app.utils.keyword_trie import keyword_trie
+
+# 孤立キーワードを1回の DELETE で削除する件数
+_DELETE_CHUNK_SIZE = 1000
+
+_keywords = Keyword.__table__
+
+_UPDATE_STATEMENT = (
+    update(_keywords)
+    .where(_keywords.c.id == bindparam("keyword_id"))
+    .values(usage_count=bindparam("count"))
+)
+
+
+def reconcile_usage_counts(db: Session, prune_orphans: bool = False) -> Dict[str, int]:
+    """
+    全キーワードの usage_count を document_keywords の件数に合わせる（コミットまで行う）
+
+    Args:
+        prune_orphans: True の場合、紐付けが1件もないキーワードを削除する
+
+    Returns:
+        {"keywords": 対象のキーワード数, "updated": 値を直した数, "pruned": 削除した数}
+    """
+    try:
+        current = dict(db.query(Keyword.id, Keyword.usage_count).with_for_update().all())
+        counts = dict(
+            db.query(DocumentKeyword.keyword_id, func.count(DocumentKeyword.id))
+            .group_by(DocumentKeyword.keyword_id)
+            .all()
+        )
+
+        orphan_ids = [keyword_id for keyword_id in current if keyword_id not in counts] if prune_orphans else []
+        orphans = set(orphan_ids)
+        changes = [
+            {"keyword_id": keyword_id, "count": counts.get(keyword_id, 0)}
+            for keyword_id, usage_count in current.items()
+            if keyword_id not in orphans and usage_count != counts.get(keyword_id, 0)
+        ]
+        if changes:
+            db.execute(_UPDATE_STATEMENT, changes)
+        for start in range(0, len(orphan_ids), _DELETE_CHUNK_SIZE):
+            db.execute(delete(_keywords).where(_keywords.c.id.in_(orphan_ids[start:start + _DELETE_CHUNK_SIZE])))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    # 削除・減少を反映するため、トライ木を作り直し、人気キーワードのキャッシュを無効にする
+    if changes or orphan_ids:
+        keyword_trie.build(db)
+        keyword_version.bump()
+
+    return {"keywords": len(current) - len(orphan_ids), "updated": len(changes), "pruned": len(orphan_ids)}
@@ -0,0 +1,77 @@
+"""
+カーソル（キーセット）ページネーション用のユーティリティ
+
+- カーソルは最終行のソートキーを JSON → URLセーフBase64 にした不透明な文字列
+- OFFSET と違い、深いページでも読み飛ばしが発生しない
+"""
+import base64
+import binascii
+import json
+from decimal import InvalidOperation
+from typing import Any, Callable, Dict, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """ソートキーをカーソル文字列に変換"""
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    カーソル文字列をソートキーに戻す
+
+    Raises:
+        HTTPException: 不正なカーソルの場合（400）
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError):
+        payload = None
+
+    if not isinstance(payload, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="カーソルの形式が正しくありません"
+        )
+    return payload
+
+
+def parse_cursor_part(parse: Callable[[Any], Any], value: Any) -> Any:
+    """カーソルに含まれる値を型変換（不正な値は400）"""
+    try:
+        return parse(value)
+    except (TypeError, ValueError, InvalidOperation):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="カーソルの形式が正しくありません"
+        )
+
+
+def cursor_value(position: Dict[str, Any], key: str, expected: type, size: int = 3) -> Any:
+    """カーソルから指定キーの値を取り出す（別方式・別APIのカーソルは400）"""
+    value = position.get(key)
+    if not isinstance(value, expected) or (expected is list and len(value) != size):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="カーソルの形式が正しくありません"
+        )
+    return value
+
+
+def keyset_after(columns: Sequence[Any], values: Sequence[Any]):
+    """
+    全列降順のソートで、指定位置より後ろの行を表す条件
+
+    (a, b, id) の場合: a < va OR (a = va AND b < vb) OR (a = va AND b = vb AND id < vid)
+    行値比較 (a, b, id) < (...) は MySQL でインデックスが効きにくいため展開して書く
+    """
+    conditions = []
+    for i, column in enumerate(columns):
+        equals = [c == v for c, v in zip(columns[:i], values[:i])]
+        conditions.append(and_(*equals, column < values[i]))
+    return or_(*conditions)
@@ -0,0 +1,71 @@
+"""
+人気キーワード（使用回数の上位 POPULAR_KEYWORDS_TOP_N 件）のキャッシュ
+
+- キーワード一覧の1ページ目（キーワードクラウド）はこの上位リストから返し、DBを参照しない
+  （次ページ有無の判定用に、上位 POPULAR_KEYWORDS_TOP_N + 1 件を保持する）
+- キーワードの作成・使用回数の変更で keyword_version を進め、次の参照時に1クエリで取り直す
+  （閲覧数の書き込みで進む content_version とは別にし、閲覧のたびに無効化されないようにする）
+- バージョンはプロセス内のカウンターのため、他ワーカーでの更新は TTL の経過で反映する
+"""
+import os
+import threading
+import time
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from app.models.keyword import Keyword
+from app.utils.cache import ContentVersion, keyword_version
+
+load_dotenv()
+
+POPULAR_KEYWORDS_TOP_N = int(os.getenv("POPULAR_KEYWORDS_TOP_N", 100))
+POPULAR_KEYWORDS_TTL_SECONDS = float(os.getenv("POPULAR_KEYWORDS_TTL_SECONDS", 60))
+
+
+class PopularKeywords:
+    """使用回数の降順（同数はIDの降順）の上位キーワード"""
+
+    def __init__(self, version: ContentVersion, top_n: int, ttl_seconds: float) -> None:
+        self._version = version
+        self._top_n = top_n
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._cached_version: Optional[int] = None
+        self._expires_at = 0.0
+        self._keywords: List[dict] = []
+
+    @property
+    def top_n(self) -> int:
+        return self._top_n
+
+    def get(self, db: Session, limit: int) -> List[dict]:
+        """上位 limit 件（limit は top_n + 1 以下）"""
+        version = self._version.value
+        now = time.monotonic()
+        with self._lock:
+            if self._cached_version == version and self._expires_at > now:
+                return self._keywords[:limit]
+
+        rows = (
+            db.query(Keyword.id, Keyword.name, Keyword.usage_count, Keyword.created_at)
+            .order_by(Keyword.usage_count.desc(), Keyword.id.desc())
+            .limit(self._top_n + 1)
+            .all()
+        )
+        keywords = [
+            {"id": keyword_id, "name": name, "usage_count": usage_count, "created_at": created_at}
+            for keyword_id, name, usage_count, created_at in rows
+        ]
+        with self._lock:
+            # 取得中にバージョンが進んだ場合は保存しない（古い上位リストを新しいバージョンとして残さないため）
+            if self._version.value == version:
+                self._cached_version = version
+                self._expires_at = now + self._ttl_seconds
+                self._keywords = keywords
+        return keywords[:limit]
+
+
+# プロセス内で共有する人気キーワード
+popular_keywords = PopularKeywords(keyword_version, POPULAR_KEYWORDS_TOP_N, POPULAR_KEYWORDS_TTL_SECONDS)
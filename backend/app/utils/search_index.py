@@ -0,0 +1,647 @@
+"""
+ドキュメント検索用のインメモリ転置インデックス
+
+- タイトル・キーワード名・本文を normalize_text で正規化し、文字バイグラムに分割して索引化
+- 日本語のように単語区切りのないテキストでも部分一致検索ができる
+- ポスティングは array による連続領域（ドキュメント番号 + 出現回数）で保持し、メモリを抑える
+  タイトル・キーワードはバイグラムの出現位置も持ち、部分一致の検証（位置が連続するか）を NumPy で行う
+- BM25（フィールドごとの重み付き）で関連度を計算し、有益度スコアと掛け合わせて順位付けする
+  スコアはポスティング単位で NumPy によりまとめて計算し、上位 k 件だけを選んで並べる（全件のソートはしない）
+- mode=index の並び順（有益度スコア → 更新日時 → ID）とファセット用のジャンルもドキュメントごとに保持し、
+  並べ替え・ページング・ジャンル別件数をメモリ上で済ませる（DB にはページ分のIDだけを渡す）
+- 起動時にバックグラウンドで DB から一括構築し（構築中の検索は呼び出し側で DB の検索に切り替える）、
+  create_document で差分追加する
+- 他のプロセス（インポートスクリプト・別ワーカー）が登録したドキュメントは、取り込み済みの最大IDより後ろの行を
+  SEARCH_INDEX_CATCH_UP_SECONDS ごとに読んで取り込み、content_version を進めてキャッシュを無効にする
+  （ID の採番順とコミット順が前後した行は取りこぼす場合がある。次回の build で取り込まれる）
+"""
+import math
+import os
+import threading
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.document import Document
+from app.models.document_keyword import DocumentKeyword
+from app.models.keyword import Keyword
+from app.routers.keywords import normalize_text
+from app.utils.cache import content_version, keyword_version
+from app.utils.keyword_trie import keyword_trie
+
+load_dotenv()
+
+# 他のプロセスが登録したドキュメントを取り込む間隔（秒）と、1回のクエリで読む件数
+SEARCH_INDEX_CATCH_UP_SECONDS = float(os.getenv("SEARCH_INDEX_CATCH_UP_SECONDS", 30))
+_CATCH_UP_CHUNK_SIZE = 1000
+
+# フィールド番号と BM25 での重み（タイトル > キーワード > 本文）
+FIELD_TITLE = 0
+FIELD_KEYWORDS = 1
+FIELD_CONTENT = 2
+FIELD_BOOSTS = (3.0, 2.0, 1.0)
+ALL_FIELDS = (FIELD_TITLE, FIELD_KEYWORDS, FIELD_CONTENT)
+# バイグラムの出現位置を持つフィールド（mode=index の部分一致の検証に使う。本文は量が多いため持たない）
+POSITIONAL_FIELDS = (FIELD_TITLE, FIELD_KEYWORDS)
+
+# BM25 のパラメータ
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 出現回数は unsigned short で保持するため上限で丸める
+_MAX_TF = 65535
+
+
+def term_frequencies(normalized: str) -> Counter:
+    """
+    正規化済みテキストのトークンごとの出現回数
+
+    - 文字バイグラム（例: "経費精算" → "経費", "費精", "精算"）
+    - 1文字クエリに対応するため、ユニグラムも含める
+    """
+    counts = Counter(normalized)
+    counts.update(normalized[i:i + 2] for i in range(len(normalized) - 1))
+    return counts
+
+
+def query_terms(normalized: str) -> Set[str]:
+    """クエリのトークン（1文字ならユニグラム、それ以外はバイグラム）"""
+    if len(normalized) == 1:
+        return {normalized}
+    return {normalized[i:i + 2] for i in range(len(normalized) - 1)}
+
+
+class _Posting:
+    """1トークン・1フィールド分のポスティング（ドキュメント番号の昇順）"""
+    __slots__ = ("ordinals", "tfs")
+
+    def __init__(self) -> None:
+        self.ordinals = array("I")  # 内部ドキュメント番号
+        self.tfs = array("H")  # 出現回数
+
+    def as_numpy(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(内部番号, 出現回数) の NumPy 配列（コピー。array の追記を妨げないよう参照は残さない）"""
+        return np.frombuffer(self.ordinals, np.uint32).copy(), np.frombuffer(self.tfs, np.uint16).copy()
+
+
+class _PositionalPosting(_Posting):
+    """出現位置も持つポスティング（タイトル・キーワードのバイグラム用）"""
+    __slots__ = ("positions",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        # 出現位置（ドキュメント番号ごとに出現回数の分だけ昇順に並ぶ。ユニグラムは持たない）
+        self.positions = array("I")
+
+    def starts(self, shift: int) -> np.ndarray:
+        """
+        出現ごとの「内部番号 << 32 | 位置 - shift」（昇順）
+
+        クエリ内で shift 文字目から始まるバイグラムとして、クエリの先頭位置に換算した値。
+        全バイグラムで値が一致すれば、その位置からクエリ全体が連続して現れる
+        """
+        ordinals = np.repeat(np.frombuffer(self.ordinals, np.uint32).astype(np.int64), np.frombuffer(self.tfs, np.uint16))
+        positions = np.frombuffer(self.positions, np.uint32).astype(np.int64) - shift
+        valid = positions >= 0
+        return (ordinals[valid] << 32) | positions[valid]
+
+
+class _Column:
+    """内部ドキュメント番号で引く、末尾に追加できる NumPy 配列（容量は倍々で確保）"""
+    __slots__ = ("_data", "_size")
+
+    def __init__(self, dtype) -> None:
+        self._data = np.zeros(1024, dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, ordinal: int):
+        return self._data[ordinal]
+
+    def __setitem__(self, ordinal: int, value) -> None:
+        self._data[ordinal] = value
+
+    def append(self, value) -> None:
+        if self._size == self._data.size:
+            data = np.zeros(self._data.size * 2, self._data.dtype)
+            data[:self._size] = self._data
+            self._data = data
+        self._data[self._size] = value
+        self._size += 1
+
+    @property
+    def values(self) -> np.ndarray:
+        """登録済みの範囲"""
+        return self._data[:self._size]
+
+
+def _after_mask(keys: Sequence[np.ndarray], after: Sequence[float]) -> np.ndarray:
+    """全キー降順の並びで、after の位置より後ろにある要素"""
+    remaining = np.zeros(keys[0].size, bool)
+    equal = np.ones(keys[0].size, bool)
+    for key, value in zip(keys, after):
+        remaining |= equal & (key < value)
+        equal &= key == value
+    return remaining
+
+
+def _top_positions(keys: Sequence[np.ndarray], limit: int) -> np.ndarray:
+    """
+    全キー降順（先頭のキーが優先）で並べた上位 limit 件の位置
+
+    先頭のキーの limit 番目の値をしきい値に候補を絞ってから並べる（候補全体はソートしない）
+    """
+    primary = keys[0]
+    if primary.size > limit:
+        threshold = np.partition(primary, primary.size - limit)[primary.size - limit]
+        positions = np.flatnonzero(primary >= threshold)
+    else:
+        positions = np.arange(primary.size)
+    order = np.lexsort(tuple(-key[positions] for key in reversed(keys)))[:limit]
+    return positions[order]
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    return value.timestamp() if value is not None else 0.0
+
+
+class DocumentSearchIndex:
+    """タイトル・キーワード・本文に対するバイグラム転置インデックス"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+        # 構築中に追加・更新された内容（構築後の構造に適用し直す）。構築中以外は None
+        self._pending: Optional[List[Tuple[Callable, tuple]]] = None
+        self._build_thread: Optional[threading.Thread] = None
+        # DB から取り込み済みの最大ドキュメントID（catch_up はこれより後ろの行を読む）
+        self._synced_id = 0
+        self._stop = threading.Event()
+        self._catch_up_thread: Optional[threading.Thread] = None
+        self.ready = False
+
+    def _reset(self) -> None:
+        """空のインデックス構造を用意"""
+        # フィールドごとの token -> ポスティング
+        self._postings: List[Dict[str, _Posting]] = [
+            defaultdict(_PositionalPosting if f in POSITIONAL_FIELDS else _Posting) for f in range(len(FIELD_BOOSTS))
+        ]
+        # 内部ドキュメント番号 -> ドキュメントID（0 は削除済み）
+        self._doc_ids = _Column(np.int64)
+        self._ordinals: Dict[int, int] = {}
+        # フィールドごとの長さ（文字数）と、その合計（平均長の計算用）
+        self._lengths = [_Column(np.uint32) for _ in FIELD_BOOSTS]
+        self._length_sums = [0 for _ in FIELD_BOOSTS]
+        self._helpfulness = _Column(np.float64)
+        # mode=index の並び替え用の更新日時（UNIX 時刻）と、ファセット用のジャンルID
+        self._updated_at = _Column(np.float64)
+        self._genre_ids = _Column(np.int64)
+
+    def build(self, db: Session) -> None:
+        """DB の全ドキュメントからインデックスを再構築"""
+        with self._lock:
+            self._pending = []
+        try:
+            keywords_by_doc: Dict[int, List[str]] = defaultdict(list)
+            keyword_rows = (
+                db.query(DocumentKeyword.document_id, Keyword.name)
+                .join(Keyword, Keyword.id == DocumentKeyword.keyword_id)
+                .yield_per(1000)
+            )
+            for document_id, name in keyword_rows:
+                keywords_by_doc[document_id].append(name)
+
+            index = DocumentSearchIndex()
+            last_id = 0
+            document_rows = db.query(
+                Document.id, Document.title, Document.content, Document.helpfulness_score,
+                Document.genre_id, Document.updated_at,
+            ).order_by(Document.id).yield_per(1000)
+            for document_id, title, content, helpfulness_score, genre_id, updated_at in document_rows:
+                index._add(
+                    document_id, title, keywords_by_doc.pop(document_id, []), content,
+                    float(helpfulness_score or 0), genre_id, _timestamp(updated_at),
+                )
+                last_id = document_id
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        # 構築中の検索を止めないよう、完成した構造を差し替える
+        with self._lock:
+            # 読み込み後に作成・更新された分を適用し直す（同じIDは置き換えになるため重複しない）
+            for apply, args in self._pending:
+                apply(index, *args)
+            self._pending = None
+            self._postings = index._postings
+            self._doc_ids = index._doc_ids
+            self._ordinals = index._ordinals
+            self._lengths = index._lengths
+            self._length_sums = index._length_sums
+            self._helpfulness = index._helpfulness
+            self._updated_at = index._updated_at
+            self._genre_ids = index._genre_ids
+            self._synced_id = max(self._synced_id, last_id)
+            self.ready = True
+
+    def start_build(self, session_factory: Callable[[], Session]) -> None:
+        """バックグラウンドのスレッドで構築を開始（構築済み・構築中なら何もしない）"""
+        with self._lock:
+            if self.ready or (self._build_thread is not None and self._build_thread.is_alive()):
+                return
+            self._build_thread = threading.Thread(
+                target=self._build_in_background, args=(session_factory,), name="search-index-builder", daemon=True
+            )
+            self._build_thread.start()
+
+    def _build_in_background(self, session_factory: Callable[[], Session]) -> None:
+        db = session_factory()
+        try:
+            self.build(db)
+        except SQLAlchemyError as e:
+            # 次に検索されたときに再度構築を試みる
+            print(f"検索インデックスの構築に失敗しました: {str(e)}")
+        finally:
+            db.close()
+
+    def catch_up(self, db: Session) -> List[int]:
+        """
+        取り込み済みの最大IDより後ろのドキュメントを DB から読んで追加（構築前・構築中は何もしない）
+
+        Returns:
+            追加したドキュメントID（このプロセスで add_document 済みのものは含まない）
+        """
+        with self._lock:
+            if not self.ready:
+                return []
+            synced_id = self._synced_id
+
+        added: List[int] = []
+        while True:
+            rows = (
+                db.query(
+                    Document.id, Document.title, Document.content, Document.helpfulness_score,
+                    Document.genre_id, Document.updated_at,
+                )
+                .filter(Document.id > synced_id)
+                .order_by(Document.id)
+                .limit(_CATCH_UP_CHUNK_SIZE)
+                .all()
+            )
+            if not rows:
+                return added
+            # ドキュメントと紐付けは同じトランザクションでコミットされるため、読めたドキュメントの紐付けは揃っている
+            keywords_by_doc: Dict[int, List[str]] = defaultdict(list)
+            keyword_rows = (
+                db.query(DocumentKeyword.document_id, Keyword.name)
+                .join(Keyword, Keyword.id == DocumentKeyword.keyword_id)
+                .filter(DocumentKeyword.document_id.between(rows[0].id, rows[-1].id))
+            )
+            for document_id, name in keyword_rows:
+                keywords_by_doc[document_id].append(name)
+
+            with self._lock:
+                for document_id, title, content, helpfulness_score, genre_id, updated_at in rows:
+                    if document_id in self._ordinals:
+                        continue
+                    args = (
+                        document_id, title, keywords_by_doc.get(document_id, []), content,
+                        float(helpfulness_score or 0), genre_id, _timestamp(updated_at),
+                    )
+                    self._add(*args)
+                    if self._pending is not None:
+                        self._pending.append((DocumentSearchIndex._add, args))
+                    added.append(document_id)
+                synced_id = rows[-1].id
+                self._synced_id = max(self._synced_id, synced_id)
+
+    def start_catch_up(self, session_factory: Callable[[], Session], interval_seconds: float) -> None:
+        """他のプロセスが登録したドキュメントの定期的な取り込みを開始"""
+        if self._catch_up_thread is not None and self._catch_up_thread.is_alive():
+            return
+        self._stop.clear()
+        self._catch_up_thread = threading.Thread(
+            target=self._run_catch_up, args=(session_factory, interval_seconds),
+            name="search-index-catch-up", daemon=True,
+        )
+        self._catch_up_thread.start()
+
+    def stop_catch_up(self) -> None:
+        """定期的な取り込みを止める"""
+        self._stop.set()
+        if self._catch_up_thread is not None:
+            self._catch_up_thread.join()
+            self._catch_up_thread = None
+
+    def clear(self) -> None:
+        """全ドキュメントを削除し、構築前の状態に戻す"""
+        with self._lock:
+            self._reset()
+            self._pending = None
+            self._synced_id = 0
+            self.ready = False
+
+    def _run_catch_up(self, session_factory: Callable[[], Session], interval_seconds: float) -> None:
+        while not self._stop.wait(interval_seconds):
+            db = session_factory()
+            try:
+                added = self.catch_up(db)
+                if added:
+                    # 取り込んだドキュメントのキーワードを入力補完に反映し、キャッシュを無効にする
+                    keyword_rows = (
+                        db.query(Keyword.id, Keyword.name, Keyword.normalized_name, Keyword.usage_count)
+                        .join(DocumentKeyword, DocumentKeyword.keyword_id == Keyword.id)
+                        .filter(DocumentKeyword.document_id.between(added[0], added[-1]))
+                        .distinct()
+                    )
+                    for keyword_id, name, normalized_name, usage_count in keyword_rows:
+                        keyword_trie.upsert(keyword_id, name, normalized_name, usage_count)
+                    content_version.bump()
+                    keyword_version.bump()
+            except Exception as e:
+                # 次の周期で再試行する（スレッドは止めない）
+                print(f"検索インデックスへの取り込みに失敗しました: {str(e)}")
+            finally:
+                db.close()
+
+    def add_document(
+        self,
+        document_id: int,
+        title: str,
+        keywords: Iterable[str],
+        content: str = "",
+        helpfulness_score: float = 0.0,
+        genre_id: int = 0,
+        updated_at: Optional[datetime] = None,
+    ) -> None:
+        """ドキュメントを1件追加（既存IDの場合は置き換え）"""
+        args = (document_id, title, list(keywords), content, helpfulness_score, genre_id, _timestamp(updated_at))
+        with self._lock:
+            self._add(*args)
+            if self._pending is not None:
+                self._pending.append((DocumentSearchIndex._add, args))
+
+    def update_helpfulness(self, document_id: int, helpfulness_score: float, updated_at: datetime) -> None:
+        """有益度スコアと更新日時を更新（閲覧・評価のたびに呼ばれる）"""
+        args = (document_id, helpfulness_score, _timestamp(updated_at))
+        with self._lock:
+            self._set_helpfulness(*args)
+            if self._pending is not None:
+                self._pending.append((DocumentSearchIndex._set_helpfulness, args))
+
+    def search(self, q: str, fields: Iterable[int] = (FIELD_TITLE, FIELD_KEYWORDS)) -> Set[int]:
+        """
+        クエリに一致するドキュメントIDを返す
+
+        - バイグラムのポスティングを積集合で絞り込み
+        - タイトル・キーワードのみの場合（既定）は、バイグラムの出現位置が連続するもの（部分一致）に限る
+          （本文を含める場合は rank と同じく全トークンを含むドキュメント）
+        """
+        with self._lock:
+            ordinals = self._search_ordinals(q, tuple(fields))
+            return set(self._doc_ids.values[ordinals].tolist())
+
+    def page(
+        self,
+        q: str,
+        limit: int,
+        after: Optional[Tuple[float, float, int]] = None,
+    ) -> Tuple[int, List[Tuple[float, float, int]]]:
+        """
+        search と同じ条件（タイトル・キーワードの部分一致）のドキュメントを mode=index の順に limit 件返す
+
+        Args:
+            after: この (有益度スコア, 更新日時, ドキュメントID) より後ろから返す（カーソル）
+
+        Returns:
+            (ヒット件数, [(有益度スコア, 更新日時（UNIX 時刻）, ドキュメントID), ...])
+            有益度スコア → 更新日時 → ID の降順
+        """
+        with self._lock:
+            ordinals = self._search_ordinals(q, (FIELD_TITLE, FIELD_KEYWORDS))
+            keys = (
+                self._helpfulness.values[ordinals],
+                self._updated_at.values[ordinals],
+                self._doc_ids.values[ordinals],
+            )
+        total = int(ordinals.size)
+        if after is not None:
+            remaining = _after_mask(keys, after)
+            keys = tuple(key[remaining] for key in keys)
+        top = _top_positions(keys, limit)
+        helpfulness, updated_at, document_ids = (key[top] for key in keys)
+        return total, list(zip(helpfulness.tolist(), updated_at.tolist(), document_ids.tolist()))
+
+    def genre_counts(self, q: str, fields: Iterable[int] = (FIELD_TITLE, FIELD_KEYWORDS)) -> Dict[int, int]:
+        """search と同じ条件でヒットしたドキュメントのジャンルIDごとの件数"""
+        with self._lock:
+            genre_ids = self._genre_ids.values[self._search_ordinals(q, tuple(fields))]
+        values, counts = np.unique(genre_ids, return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+
+    def _search_ordinals(self, q: str, fields: Tuple[int, ...]) -> np.ndarray:
+        """search の条件に一致する内部ドキュメント番号（ロック取得済みで呼ぶ）"""
+        nq = normalize_text(q).strip()
+        if not nq:
+            return np.empty(0, np.int64)
+        if len(nq) > 2 and FIELD_CONTENT not in fields:
+            # バイグラムをすべて含むだけでなく、クエリ全体が連続して現れるものに絞る
+            return self._phrase_match(nq, fields)
+        candidates, _ = self._match(query_terms(nq), fields)
+        return candidates
+
+    def _phrase_match(self, nq: str, fields: Tuple[int, ...]) -> np.ndarray:
+        """
+        nq をいずれかのフィールドの値に連続して含む内部ドキュメント番号（削除済みを除く、昇順）
+
+        クエリのバイグラムごとの出現位置を先頭位置に換算し、全バイグラムで共通する (内部番号, 位置) を求める
+        （文字列の照合はせず、ポスティングの長さに比例する NumPy の処理だけで済む）
+        """
+        matched = np.empty(0, np.int64)
+        for f in fields:
+            starts: Optional[np.ndarray] = None
+            for i in range(len(nq) - 1):
+                posting = self._postings[f].get(nq[i:i + 2])
+                if posting is None:
+                    starts = None
+                    break
+                shifted = posting.starts(i)
+                starts = shifted if starts is None else np.intersect1d(starts, shifted, assume_unique=True)
+                if not starts.size:
+                    break
+            if starts is not None and starts.size:
+                matched = np.union1d(matched, starts >> 32)
+        return matched[self._doc_ids.values[matched] != 0]
+
+    def rank(
+        self,
+        q: str,
+        limit: int,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> Tuple[int, List[Tuple[float, int]]]:
+        """
+        クエリの全トークンを含むドキュメントを関連度順に limit 件返す（タイトル・キーワード・本文）
+
+        - 候補のスコアはポスティングごとにベクトル演算で加算し、Python のループは回さない
+        - 上位 limit 件はスコアのしきい値（limit 番目の値）で絞り込んでから並べる（候補全体はソートしない）
+
+        Args:
+            after: この (スコア, ドキュメントID) より後ろから返す（カーソル）
+
+        Returns:
+            (ヒット件数, [(スコア, ドキュメントID), ...]) スコアの降順（同点はIDの降順）
+            スコア = BM25（フィールド重み付き） × (1 + 有益度スコア)
+        """
+        nq = normalize_text(q).strip()
+        if not nq:
+            return 0, []
+
+        with self._lock:
+            terms = query_terms(nq)
+            candidates, doc_frequencies = self._match(terms, ALL_FIELDS)
+            total = int(candidates.size)
+            if not total:
+                return 0, []
+
+            live_count = len(self._ordinals)
+            avg_lengths = [length_sum / live_count or 1.0 for length_sum in self._length_sums]
+            bm25 = np.zeros(len(self._doc_ids), np.float64)
+
+            for term in terms:
+                df = doc_frequencies[term]
+                idf = math.log(1 + (live_count - df + 0.5) / (df + 0.5))
+
+                for f in ALL_FIELDS:
+                    posting = self._postings[f].get(term)
+                    if posting is None:
+                        continue
+                    ordinals, tfs = posting.as_numpy()
+                    tfs = tfs.astype(np.float64)
+                    lengths = self._lengths[f].values[ordinals]
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg_lengths[f])
+                    # 1つのポスティング内で内部番号は重複しない
+                    bm25[ordinals] += idf * FIELD_BOOSTS[f] * (BM25_K1 + 1) * tfs / (tfs + norm)
+
+            scores = bm25[candidates] * (1 + self._helpfulness.values[candidates])
+            document_ids = self._doc_ids.values[candidates]
+
+        if after is not None:
+            remaining = _after_mask((scores, document_ids), after)
+            scores, document_ids = scores[remaining], document_ids[remaining]
+        top = _top_positions((scores, document_ids), limit)
+        return total, list(zip(scores[top].tolist(), document_ids[top].tolist()))
+
+    def _match(self, terms: Set[str], fields: Iterable[int]) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        全トークンをいずれかのフィールドに含む内部ドキュメント番号（削除済みを除く、昇順）
+
+        Returns:
+            (候補の内部番号, トークンごとの出現ドキュメント数)
+        """
+        fields = tuple(fields)
+        size = len(self._doc_ids)
+        doc_frequencies: Dict[str, int] = {}
+        matched = self._doc_ids.values != 0
+        for term in terms:
+            has_term = np.zeros(size, bool)
+            for f in fields:
+                posting = self._postings[f].get(term)
+                if posting is not None:
+                    has_term[np.frombuffer(posting.ordinals, np.uint32).copy()] = True
+            df = int(np.count_nonzero(has_term))
+            if not df:
+                return np.empty(0, np.int64), doc_frequencies
+            doc_frequencies[term] = df
+            matched &= has_term
+        return np.flatnonzero(matched), doc_frequencies
+
+    def _set_helpfulness(self, document_id: int, helpfulness_score: float, updated_at: float) -> None:
+        ordinal = self._ordinals.get(document_id)
+        if ordinal is not None:
+            self._helpfulness[ordinal] = helpfulness_score
+            self._updated_at[ordinal] = updated_at
+
+    def _add(
+        self,
+        document_id: int,
+        title: str,
+        keywords: Iterable[str],
+        content: Optional[str],
+        helpfulness_score: float,
+        genre_id: int,
+        updated_at: float,
+    ) -> None:
+        """1ドキュメント分のトークンをポスティングの末尾に登録"""
+        self._remove(document_id)
+        ordinal = len(self._doc_ids)
+        self._doc_ids.append(document_id)
+        self._ordinals[document_id] = ordinal
+        self._helpfulness.append(helpfulness_score)
+        self._updated_at.append(updated_at)
+        self._genre_ids.append(genre_id)
+
+        field_texts = (
+            [normalize_text(title or "")],
+            [normalize_text(k) for k in keywords if k],
+            [normalize_text(content or "")],
+        )
+        for f, texts in enumerate(field_texts):
+            counts: Counter = Counter()
+            positions: Dict[str, List[int]] = defaultdict(list)
+            offset = 0
+            for text in texts:
+                # 値をまたいだバイグラムが生まれないよう、値ごとに分割する
+                counts.update(term_frequencies(text))
+                if f in POSITIONAL_FIELDS:
+                    for i in range(len(text) - 1):
+                        positions[text[i:i + 2]].append(offset + i)
+                    # 値をまたいで連続とみなさないよう、値の間を1文字分空ける
+                    offset += len(text) + 1
+            for term, tf in counts.items():
+                posting = self._postings[f][term]
+                posting.ordinals.append(ordinal)
+                posting.tfs.append(min(tf, _MAX_TF))
+                if term in positions:
+                    posting.positions.extend(positions[term][:_MAX_TF])
+            length = sum(len(text) for text in texts)
+            self._lengths[f].append(length)
+            self._length_sums[f] += length
+
+    def _remove(self, document_id: int) -> None:
+        """
+        ドキュメントを削除済みにする
+
+        ポスティングは追記専用のため、内部番号を無効化するだけにとどめる
+        （次回の build で詰め直される）
+        """
+        ordinal = self._ordinals.pop(document_id, None)
+        if ordinal is None:
+            return
+        self._doc_ids[ordinal] = 0
+        for f, lengths in enumerate(self._lengths):
+            self._length_sums[f] -= int(lengths[ordinal])
+
+
+# プロセス内で共有するインデックス
+search_index = DocumentSearchIndex()
+
+
+def ensure_search_index() -> bool:
+    """
+    インデックスが構築済みか（未構築ならバックグラウンドで構築を開始する。起動時に構築できなかった場合の保険）
+
+    False の間、呼び出し側は DB の検索（fulltext / like）を使う
+    """
+    if not search_index.ready:
+        search_index.start_build(SessionLocal)
+    return search_index.ready
@@ -0,0 +1,125 @@
+"""
+検索結果の抜粋（スニペット）生成
+
+- 本文中で最初にクエリと一致した位置の前後を切り出す
+- 照合は normalize_text 後の文字列で行い、ハイライト位置は元の本文（抜粋）上の位置で返す
+- 一覧用のプレビュー（本文の先頭）は DB 側で切り出し、本文全体を転送しない
+"""
+import unicodedata
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.document import Document
+from app.routers.keywords import normalize_text
+
+ELLIPSIS = "…"
+
+# view=summary で返す本文プレビューの最大文字数（省略記号を除く）
+CONTENT_PREVIEW_LENGTH = 200
+
+
+def _extends_cluster(ch: str) -> bool:
+    """
+    直前の文字と合わせて正規化すべき文字か
+
+    結合文字（濁点 U+3099、アクセント記号など）と、NFKC で結合文字になる半角の濁点・半濁点（ﾞ ﾟ）、
+    ハングルの母音・終声字母
+    """
+    if "\u1160" <= ch <= "\u11ff":
+        return True
+    decomposed = unicodedata.normalize("NFKD", ch)
+    return bool(decomposed) and unicodedata.combining(decomposed[0]) != 0
+
+
+def _normalize_with_offsets(text: str) -> Tuple[str, List[int], List[int]]:
+    """
+    正規化後の各文字が元の文字列のどの範囲に由来するかを記録しながら正規化
+
+    基底文字と後続の結合文字（例: ｶﾞ → ガ）はまとめて1単位として正規化する
+    （1文字ずつ正規化すると合成されず、文字列全体の normalize_text と結果が変わるため）
+
+    Returns:
+        (正規化後の文字列, 各文字の由来の開始位置, 終了位置（その位置を含まない）)
+    """
+    chars: List[str] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    i = 0
+    while i < len(text):
+        j = i + 1
+        while j < len(text) and _extends_cluster(text[j]):
+            j += 1
+        normalized = normalize_text(text[i:j])
+        chars.append(normalized)
+        starts.extend([i] * len(normalized))
+        ends.extend([j] * len(normalized))
+        i = j
+    return "".join(chars), starts, ends
+
+
+def build_snippet(text: str, q: str, width: int = 120) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    本文からクエリ周辺の抜粋を作成
+
+    Args:
+        text: 本文
+        q: 検索クエリ
+        width: 抜粋の最大文字数（省略記号を除く）
+
+    Returns:
+        (抜粋, 抜粋内のハイライト範囲 [(start, end), ...])
+        一致しない場合は本文の先頭を返し、ハイライトは空
+    """
+    nq = normalize_text(q).strip()
+    normalized, starts, ends = _normalize_with_offsets(text)
+    first = normalized.find(nq) if nq else -1
+
+    if first < 0:
+        snippet = text[:width]
+        return (snippet + ELLIPSIS if len(text) > width else snippet), []
+
+    # 一致箇所が抜粋の中央付近に来るように切り出し範囲を決める
+    match_start = starts[first]
+    match_end = ends[first + len(nq) - 1]
+    start = max(0, min(match_start - (width - (match_end - match_start)) // 2, len(text) - width))
+    end = min(len(text), start + width)
+
+    prefix = ELLIPSIS if start > 0 else ""
+    suffix = ELLIPSIS if end < len(text) else ""
+
+    # 抜粋範囲内の一致箇所をすべてハイライト
+    highlights: List[Tuple[int, int]] = []
+    pos = first
+    while pos >= 0:
+        hit_start = starts[pos]
+        hit_end = ends[pos + len(nq) - 1]
+        if hit_start >= end:
+            break
+        if hit_start >= start and hit_end <= end:
+            highlights.append((hit_start - start + len(prefix), hit_end - start + len(prefix)))
+        pos = normalized.find(nq, pos + len(nq))
+
+    return prefix + text[start:end] + suffix, highlights
+
+
+def load_content_previews(db: Session, document_ids: Iterable[int], length: int = CONTENT_PREVIEW_LENGTH) -> Dict[int, str]:
+    """
+    ドキュメントごとの本文プレビュー（先頭 length 文字）を1クエリで取得
+
+    - SUBSTR で切り出してから転送するため、長い本文でも転送量は length 文字分に収まる
+    - 切り詰めたかどうかを判定するため、1文字多く取得する
+    """
+    document_ids = list(document_ids)
+    if not document_ids:
+        return {}
+    rows = (
+        db.query(Document.id, func.substr(Document.content, 1, length + 1))
+        .filter(Document.id.in_(document_ids))
+        .all()
+    )
+    return {
+        document_id: head[:length] + ELLIPSIS if len(head or "") > length else head or ""
+        for document_id, head in rows
+    }
@@ -0,0 +1,182 @@
+"""
+トレンドドキュメント（時間減衰スコア）の集計
+
+- スコア = Σ 重み × 2^(-(現在 - 発生時刻) / 半減期)（閲覧 = 1、役立った評価 = TRENDING_HELPFUL_WEIGHT）
+- 基準時刻（landmark）からの増幅係数を掛けて加算することで、イベントごとに O(1) で更新する
+  （全ドキュメントのスコアを毎回減衰させる必要がない。係数が大きくなりすぎたら基準時刻を進める）
+- 上位 TRENDING_TOP_N 件はバックグラウンドで定期的に再計算し、表示用の情報とあわせて保持する
+  （公開中のドキュメントのみ。リクエスト時は保持しているリストを返すだけ）
+- 起動時は日次集計（document_daily_stats）の直近分からスコアを復元する
+"""
+import heapq
+import math
+import os
+import threading
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.document import Document, DocumentStatus
+from app.models.document_daily_stat import DocumentDailyStat
+from app.models.genre import Genre
+
+load_dotenv()
+
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 24))
+TRENDING_HELPFUL_WEIGHT = float(os.getenv("TRENDING_HELPFUL_WEIGHT", 5))
+TRENDING_TOP_N = int(os.getenv("TRENDING_TOP_N", 100))
+TRENDING_REFRESH_SECONDS = float(os.getenv("TRENDING_REFRESH_SECONDS", 30))
+# 起動時に日次集計から復元する日数
+TRENDING_SEED_DAYS = 14
+
+# 減衰率（1秒あたり、自然対数）
+_DECAY_RATE = math.log(2) / (TRENDING_HALF_LIFE_HOURS * 3600)
+# 増幅係数の指数がこれを超えたら基準時刻を進める（float のオーバーフロー防止）
+_MAX_EXPONENT = 50.0
+# 減衰後のスコアがこれ未満のドキュメントは再計算時に捨てる（メモリを抑える）
+_PRUNE_BELOW = 1e-3
+
+
+class TrendingDocuments:
+    """ドキュメントごとの時間減衰スコアと、その上位リスト"""
+
+    def __init__(self, session_factory: Callable[[], Session], refresh_seconds: float) -> None:
+        self._session_factory = session_factory
+        self._refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        # ドキュメントID -> 基準時刻換算のスコア
+        self._scores: Dict[int, float] = {}
+        self._landmark = time.time()
+        # 表示用の上位リスト（スコアの降順）
+        self._top: List[dict] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, document_id: int, weight: float = 1.0, at: Optional[float] = None) -> None:
+        """イベントを加算（at は UNIX 時刻、省略時は現在）"""
+        at = time.time() if at is None else at
+        with self._lock:
+            exponent = _DECAY_RATE * (at - self._landmark)
+            if exponent > _MAX_EXPONENT:
+                self._rebase(at)
+                exponent = 0.0
+            self._scores[document_id] = self._scores.get(document_id, 0.0) + weight * math.exp(exponent)
+
+    def record_view(self, document_id: int) -> None:
+        self.record(document_id, 1.0)
+
+    def record_helpful(self, document_id: int) -> None:
+        self.record(document_id, TRENDING_HELPFUL_WEIGHT)
+
+    def top(self, limit: int) -> List[dict]:
+        """上位 limit 件（直近の再計算時点）"""
+        return self._top[:limit]
+
+    def clear(self) -> None:
+        """スコアと上位リストを破棄"""
+        with self._lock:
+            self._scores = {}
+            self._landmark = time.time()
+            self._top = []
+
+    def seed(self, db: Session) -> None:
+        """日次集計の直近分からスコアを復元（各日の正午に発生したものとして扱う）"""
+        since = date.today() - timedelta(days=TRENDING_SEED_DAYS - 1)
+        rows = (
+            db.query(DocumentDailyStat.document_id, DocumentDailyStat.stat_date, DocumentDailyStat.view_count, DocumentDailyStat.helpful_count)
+            .filter(DocumentDailyStat.stat_date >= since)
+            .yield_per(1000)
+        )
+        now = time.time()
+        for document_id, stat_date, views, helpful in rows:
+            at = min(datetime.combine(stat_date, dt_time(12)).timestamp(), now)
+            weight = views + helpful * TRENDING_HELPFUL_WEIGHT
+            if weight:
+                self.record(document_id, weight, at)
+
+    def refresh(self, db: Session) -> None:
+        """上位 TRENDING_TOP_N 件を選び直し、表示用の情報をDBから1クエリで取得"""
+        now = time.time()
+        with self._lock:
+            self._rebase(now)
+            # 十分に減衰したドキュメントは捨てる
+            self._scores = {doc_id: score for doc_id, score in self._scores.items() if score >= _PRUNE_BELOW}
+            ranked = heapq.nlargest(TRENDING_TOP_N, self._scores.items(), key=lambda item: item[1])
+
+        if not ranked:
+            self._top = []
+            return
+        rows = (
+            db.query(
+                Document.id, Document.title, Document.genre_id, Genre.name,
+                Document.view_count, Document.helpful_count, Document.helpfulness_score,
+            )
+            .join(Genre, Genre.id == Document.genre_id)
+            .filter(
+                Document.id.in_([doc_id for doc_id, _ in ranked]),
+                Document.status == DocumentStatus.PUBLISHED,
+            )
+            .all()
+        )
+        documents = {row[0]: row for row in rows}
+        # 参照の差し替えのみのため、読み込み側はロック不要
+        self._top = [
+            {
+                "id": doc_id,
+                "title": documents[doc_id][1],
+                "genre_id": documents[doc_id][2],
+                "genre_name": documents[doc_id][3],
+                "view_count": documents[doc_id][4],
+                "helpful_count": documents[doc_id][5],
+                "helpfulness_score": documents[doc_id][6],
+                "trending_score": round(score, 4),
+            }
+            for doc_id, score in ranked
+            if doc_id in documents
+        ]
+
+    def build(self, db: Session) -> None:
+        """起動時の復元と初回の上位リスト作成"""
+        self.seed(db)
+        self.refresh(db)
+
+    def start(self) -> None:
+        """上位リストの定期再計算を開始"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="trending-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """定期再計算を止める"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _rebase(self, now: float) -> None:
+        """基準時刻を now に進め、全スコアを now 時点の値に換算（ロック取得済みで呼ぶ）"""
+        factor = math.exp(-_DECAY_RATE * (now - self._landmark))
+        if factor != 1.0:
+            self._scores = {doc_id: score * factor for doc_id, score in self._scores.items()}
+        self._landmark = now
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._refresh_seconds):
+            db = self._session_factory()
+            try:
+                self.refresh(db)
+            except Exception as e:
+                # 次の周期で再試行する（スレッドは止めない）
+                print(f"トレンドの再計算に失敗しました: {str(e)}")
+            finally:
+                db.close()
+
+
+# プロセス内で共有するトレンド集計
+trending_documents = TrendingDocuments(SessionLocal, TRENDING_REFRESH_SECONDS)
@@ -0,0 +1,106 @@
+"""
+ユニーク閲覧者数（HyperLogLog）の保存
+
+- 閲覧者ごとの行は持たず、ドキュメント×日ごと（document_daily_stats）と
+  ドキュメントごとの累計（document_viewer_sketches）に HyperLogLog スケッチを保存する
+- 閲覧数バッファが集めた差分のスケッチを、保存済みのスケッチにマージして書き戻す
+  （マージはレジスタごとの最大値なので、複数ワーカーが同じ行に書いても結果は変わらない。
+  読み込みから書き戻しまでは SELECT ... FOR UPDATE で行をロックする）
+- 推定値（unique_viewer_count）も同時に保存し、読み込み側はスケッチを展開せずに参照できる
+"""
+from datetime import date
+from typing import Dict, Tuple
+
+from fastapi import Request
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.document_daily_stat import DocumentDailyStat
+from app.models.document_viewer_sketch import DocumentViewerSketch
+from app.utils.hyperloglog import HyperLogLog
+
+# 閲覧者を識別するヘッダー（認証導入までは、フロントエンドがブラウザごとに発行したIDを送る）
+VIEWER_ID_HEADER = "X-Viewer-Id"
+
+_daily_stats = DocumentDailyStat.__table__
+_viewer_sketches = DocumentViewerSketch.__table__
+
+_UPDATE_DAILY_STATEMENT = (
+    update(_daily_stats)
+    .where(_daily_stats.c.id == bindparam("row_id"))
+    .values(unique_viewer_count=bindparam("estimate"), viewer_sketch=bindparam("sketch"))
+)
+_UPDATE_LIFETIME_STATEMENT = (
+    update(_viewer_sketches)
+    .where(_viewer_sketches.c.document_id == bindparam("row_id"))
+    .values(unique_viewer_count=bindparam("estimate"), viewer_sketch=bindparam("sketch"))
+)
+
+
+def viewer_key(request: Request) -> str:
+    """閲覧者の識別子（X-Viewer-Id ヘッダー、なければ接続元IPアドレス）"""
+    viewer_id = request.headers.get(VIEWER_ID_HEADER)
+    if viewer_id:
+        return f"id:{viewer_id}"
+    return f"ip:{request.client.host if request.client else ''}"
+
+
+def merge_viewer_sketches(db: Session, sketches: Dict[Tuple[int, date], HyperLogLog]) -> None:
+    """
+    (ドキュメントID, 閲覧日) ごとの差分スケッチを日次・累計の両方にマージ（コミットは呼び出し側で行う）
+
+    日次の行は、同じトランザクションで閲覧数の UPSERT により作成済みであること
+    """
+    if not sketches:
+        return
+
+    document_ids = {document_id for document_id, _ in sketches}
+    stat_dates = {stat_date for _, stat_date in sketches}
+
+    # 日次: 行はすでにあるため、読み込んでマージした結果で更新する
+    daily_rows = (
+        db.query(DocumentDailyStat.id, DocumentDailyStat.document_id, DocumentDailyStat.stat_date, DocumentDailyStat.viewer_sketch)
+        .filter(DocumentDailyStat.document_id.in_(document_ids), DocumentDailyStat.stat_date.in_(stat_dates))
+        .with_for_update()
+        .all()
+    )
+    daily_updates = []
+    for row_id, document_id, stat_date, stored in daily_rows:
+        delta = sketches.get((document_id, stat_date))
+        if delta is None:
+            continue
+        merged = HyperLogLog.from_bytes(stored)
+        merged.merge(delta)
+        daily_updates.append({"row_id": row_id, "estimate": merged.estimate(), "sketch": merged.to_bytes()})
+    if daily_updates:
+        db.execute(_UPDATE_DAILY_STATEMENT, daily_updates)
+
+    # 累計: 日をまたいだ差分をドキュメントごとにまとめてからマージする
+    lifetime_deltas: Dict[int, HyperLogLog] = {}
+    for (document_id, _), delta in sketches.items():
+        lifetime_deltas.setdefault(document_id, HyperLogLog()).merge(delta)
+
+    stored_rows = dict(
+        db.query(DocumentViewerSketch.document_id, DocumentViewerSketch.viewer_sketch)
+        .filter(DocumentViewerSketch.document_id.in_(document_ids))
+        .with_for_update()
+        .all()
+    )
+    lifetime_updates = []
+    lifetime_inserts = []
+    for document_id, delta in lifetime_deltas.items():
+        merged = HyperLogLog.from_bytes(stored_rows.get(document_id))
+        merged.merge(delta)
+        if document_id in stored_rows:
+            lifetime_updates.append({"row_id": document_id, "estimate": merged.estimate(), "sketch": merged.to_bytes()})
+        else:
+            # 他のワーカーが同時に作成した場合は一意制約違反になり、呼び出し側で再試行される
+            lifetime_inserts.append({
+                "document_id": document_id,
+                "unique_viewer_count": merged.estimate(),
+                "viewer_sketch": merged.to_bytes(),
+            })
+    if lifetime_updates:
+        db.execute(_UPDATE_LIFETIME_STATEMENT, lifetime_updates)
+    if lifetime_inserts:
+        db.execute(insert(_viewer_sketches), lifetime_inserts)
@@ -0,0 +1,49 @@
+"""
+加算型 UPSERT（INSERT ... ON DUPLICATE KEY UPDATE）のユーティリティ
+
+- 集計テーブルの増分を「行がなければ作成、あれば加算」で1文にまとめる
+- 複数行は executemany で送るため、件数に関わらず1往復で済む
+- MySQL は ON DUPLICATE KEY UPDATE、SQLite / PostgreSQL は ON CONFLICT DO UPDATE を使う
+"""
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def upsert_increments(
+    db: Session,
+    table: Table,
+    conflict_columns: Sequence[str],
+    increment_columns: Sequence[str],
+    rows: List[Dict[str, Any]],
+) -> None:
+    """
+    行ごとに増分を加算する（コミットは呼び出し側で行う）
+
+    Args:
+        table: 対象テーブル（Model.__table__）
+        conflict_columns: 一意制約の列（例: document_id, stat_date）
+        increment_columns: 既存行に加算する列
+        rows: 挿入する値（increment_columns の値が増分になる）
+    """
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(table)
+        stmt = stmt.on_duplicate_key_update({
+            column: table.c[column] + stmt.inserted[column] for column in increment_columns
+        })
+    elif dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: table.c[column] + stmt.excluded[column] for column in increment_columns},
+        )
+    else:
+        raise NotImplementedError(f"UPSERT に未対応のデータベースです: {dialect}")
+
+    db.execute(stmt, rows)
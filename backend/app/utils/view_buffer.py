@@ -0,0 +1,214 @@
+"""
+閲覧数の書き込みバッファ（write-behind）
+
+- 閲覧のたびに UPDATE せず、プロセス内でドキュメントごとの増分を集計する
+- バックグラウンドスレッドが一定間隔で「view_count = view_count + n」をまとめて実行する
+- helpfulness_score も同じ UPDATE 内で SQL により再計算する（行ロックは1回だけ）
+- 同じトランザクションで日次集計（document_daily_stats）にも UPSERT で加算する
+- 閲覧者ごとの HyperLogLog スケッチも集め、同じトランザクションで保存済みのスケッチにマージする
+- 書き込みに失敗した場合（DB 以外の例外を含む）は増分を戻して次回に再試行し、スレッドは止めない
+- シャットダウン時に未反映の増分をすべて書き込む
+"""
+import os
+import threading
+from collections import Counter
+from datetime import date
+from typing import Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.document import Document
+from app.models.document_daily_stat import DocumentDailyStat
+from app.utils.cache import content_version
+from app.utils.hyperloglog import HyperLogLog
+from app.utils.search_index import search_index
+from app.utils.unique_viewers import merge_viewer_sketches
+from app.utils.upsert import upsert_increments
+
+load_dotenv()
+
+# 閲覧数をDBへ書き込む間隔（秒）
+VIEW_COUNT_FLUSH_INTERVAL_SECONDS = float(os.getenv("VIEW_COUNT_FLUSH_INTERVAL_SECONDS", 2))
+
+_documents = Document.__table__
+
+# 1ドキュメント分の増分を反映する UPDATE（executemany で全件まとめて実行）
+# MySQL は SET を左から順に評価し、先に更新した列の新しい値を参照するため、
+# helpfulness_score を先に、加算前の view_count + n で計算する
+_FLUSH_STATEMENT = (
+    update(_documents)
+    .where(_documents.c.id == bindparam("document_id"))
+    .ordered_values(
+        (
+            _documents.c.helpfulness_score,
+            func.round(_documents.c.helpful_count * 1.0 / (_documents.c.view_count + bindparam("n")), 2),
+        ),
+        (_documents.c.view_count, _documents.c.view_count + bindparam("n")),
+    )
+)
+
+
+class ViewCountBuffer:
+    """ドキュメントごとの閲覧数の増分を保持し、定期的にまとめてDBへ反映する"""
+
+    def __init__(self, session_factory: Callable[[], Session], interval_seconds: float) -> None:
+        self._session_factory = session_factory
+        self._interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        # (ドキュメントID, 閲覧日) -> 未反映の閲覧数
+        self._pending: Counter = Counter()
+        # (ドキュメントID, 閲覧日) -> 未反映の閲覧者のスケッチ
+        self._viewers: Dict[Tuple[int, date], HyperLogLog] = {}
+        # 存在を確認済みのドキュメントID -> ジャンルID（2回目以降の閲覧ではDBを参照しない）
+        self._genre_ids: Dict[int, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def exists(self, db: Session, document_id: int) -> bool:
+        """ドキュメントが存在するか（初回のみ主キーで確認）"""
+        if document_id in self._genre_ids:
+            return True
+        genre_id = db.query(Document.genre_id).filter(Document.id == document_id).scalar()
+        if genre_id is None:
+            return False
+        self._genre_ids[document_id] = genre_id
+        return True
+
+    def record(self, document_id: int, count: int = 1, viewer: Optional[str] = None) -> None:
+        """閲覧を記録（DBへの反映は次回の flush、exists で確認済みのIDのみ。viewer はユニーク閲覧者の集計用）"""
+        key = (document_id, date.today())
+        with self._lock:
+            self._pending[key] += count
+            if viewer is not None:
+                sketch = self._viewers.get(key)
+                if sketch is None:
+                    sketch = self._viewers[key] = HyperLogLog()
+                sketch.add(viewer)
+
+    def pending(self) -> Dict[int, int]:
+        """ドキュメントごとの未反映の増分（確認用）"""
+        with self._lock:
+            totals: Counter = Counter()
+            for (document_id, _), n in self._pending.items():
+                totals[document_id] += n
+            return dict(totals)
+
+    def clear(self) -> None:
+        """未反映の増分と、存在を確認済みのドキュメントIDを破棄"""
+        with self._lock:
+            self._pending.clear()
+            self._viewers.clear()
+            self._genre_ids.clear()
+
+    def flush(self) -> int:
+        """
+        未反映の増分をまとめてDBへ書き込む
+
+        Returns:
+            更新したドキュメント数（失敗した場合は増分を戻して0）
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, Counter()
+            viewers, self._viewers = self._viewers, {}
+
+        totals: Counter = Counter()
+        for (document_id, _), n in pending.items():
+            totals[document_id] += n
+
+        db = self._session_factory()
+        try:
+            try:
+                self._write(db, pending, viewers, totals)
+            except Exception as e:
+                # 次回の flush で再試行する（スケッチの復元エラーなど DB 以外の失敗でも増分を失わない）
+                self._requeue(pending, viewers)
+                db.rollback()
+                print(f"閲覧数の書き込みに失敗しました: {str(e)}")
+                return 0
+            # 以降で失敗しても増分は戻さない（コミット済みのため、戻すと二重に加算される）
+            content_version.bump()
+            scores = (
+                db.query(Document.id, Document.helpfulness_score, Document.updated_at)
+                .filter(Document.id.in_(list(totals)))
+                .all()
+            )
+        finally:
+            db.close()
+
+        for document_id, helpfulness_score, updated_at in scores:
+            search_index.update_helpfulness(document_id, float(helpfulness_score), updated_at)
+        return len(totals)
+
+    def _write(
+        self,
+        db: Session,
+        pending: Counter,
+        viewers: Dict[Tuple[int, date], HyperLogLog],
+        totals: Counter,
+    ) -> None:
+        """増分・日次集計・閲覧者のスケッチを1トランザクションで書き込んでコミット"""
+        db.execute(
+            _FLUSH_STATEMENT,
+            [{"document_id": document_id, "n": n} for document_id, n in totals.items()],
+        )
+        upsert_increments(
+            db,
+            DocumentDailyStat.__table__,
+            ["document_id", "stat_date"],
+            ["view_count"],
+            [
+                {
+                    "document_id": document_id,
+                    "genre_id": self._genre_ids[document_id],
+                    "stat_date": stat_date,
+                    "view_count": n,
+                    "helpful_count": 0,
+                    "not_helpful_count": 0,
+                }
+                for (document_id, stat_date), n in pending.items()
+            ],
+        )
+        merge_viewer_sketches(db, viewers)
+        db.commit()
+
+    def _requeue(self, pending: Counter, viewers: Dict[Tuple[int, date], HyperLogLog]) -> None:
+        """書き込めなかった増分とスケッチを、その後に記録された分と合わせて戻す"""
+        with self._lock:
+            self._pending.update(pending)
+            for key, sketch in viewers.items():
+                if key in self._viewers:
+                    sketch.merge(self._viewers[key])
+                self._viewers[key] = sketch
+
+    def start(self) -> None:
+        """定期書き込みのバックグラウンドスレッドを開始"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="view-count-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """バックグラウンドスレッドを止め、残りの増分を書き込む"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                # コミット後の失敗（増分は書き込み済み）。スレッドを止めずに次の周期へ進む
+                print(f"閲覧数の書き込み後の処理に失敗しました: {str(e)}")
+
+
+# プロセス内で共有するバッファ
+view_buffer = ViewCountBuffer(SessionLocal, VIEW_COUNT_FLUSH_INTERVAL_SECONDS)
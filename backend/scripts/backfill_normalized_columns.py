@@ -0,0 +1,100 @@
+"""documents の正規化済み検索カラム（normalized_title / normalized_content）のバックフィルスクリプト"""
+import sys
+import os
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import bindparam, update
+from app.db import SessionLocal
+from app.models import Document
+from app.routers.keywords import normalize_text, normalize_title
+
+# 1回のUPDATEで処理する件数（環境変数で変更可能）
+BATCH_SIZE = int(os.getenv("BACKFILL_BATCH_SIZE", 1000))
+# true の場合は未設定（NULL）の行だけでなく全行を再計算する
+FORCE_ALL = os.getenv("FORCE_ALL", "false").lower() == "true"
+
+_documents = Document.__table__
+
+# 主キー指定の一括UPDATE（executemany）
+# updated_at は自身を代入する（SET updated_at = updated_at）。値を指定しないと、モデルの onupdate（func.now()）と
+# MySQL の ON UPDATE CURRENT_TIMESTAMP の両方で全行の更新日時が実行時刻に書き換わってしまう
+_UPDATE_STATEMENT = (
+    update(_documents)
+    .where(_documents.c.id == bindparam("document_id"))
+    .values(
+        normalized_title=bindparam("normalized_title"),
+        normalized_content=bindparam("normalized_content"),
+        updated_at=_documents.c.updated_at,
+    )
+)
+
+
+def _check_updated_at_unchanged(db, rows):
+    """
+    UPDATE 後の更新日時が読み込み時の値と同じか確認する（コミット前に呼ぶ）
+
+    Raises:
+        RuntimeError: 更新日時が変わった行がある場合（呼び出し側でロールバックする）
+    """
+    before = {row.id: row.updated_at for row in rows}
+    changed = [
+        document_id
+        for document_id, updated_at in db.query(Document.id, Document.updated_at).filter(Document.id.in_(before))
+        if updated_at != before[document_id]
+    ]
+    if changed:
+        raise RuntimeError(f"updated_at が変更されたドキュメントがあります（ID: {changed[:10]}）")
+
+
+def backfill_normalized_columns():
+    """ID順にバッチで読み込み、正規化した値をまとめてUPDATEする"""
+    db = SessionLocal()
+
+    try:
+        last_id = 0
+        total = 0
+        while True:
+            query = db.query(Document.id, Document.title, Document.content, Document.updated_at).filter(Document.id > last_id)
+            if not FORCE_ALL:
+                query = query.filter(
+                    (Document.normalized_title == None) | (Document.normalized_content == None)
+                )
+            rows = query.order_by(Document.id).limit(BATCH_SIZE).all()
+            if not rows:
+                break
+
+            db.execute(
+                _UPDATE_STATEMENT,
+                [
+                    {
+                        "document_id": row.id,
+                        "normalized_title": normalize_title(row.title),
+                        "normalized_content": normalize_text(row.content),
+                    }
+                    for row in rows
+                ],
+            )
+            _check_updated_at_unchanged(db, rows)
+            db.commit()
+
+            last_id = rows[-1].id
+            total += len(rows)
+            print(f"  ... {total} 件処理しました（ID {last_id} まで）")
+
+        print(f"✅ {total} 件のドキュメントの正規化カラムを更新しました。")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ エラーが発生しました: {e}")
+        raise
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("documents の正規化カラムをバックフィルします...")
+    backfill_normalized_columns()
+    print("完了しました。")
@@ -0,0 +1,156 @@
+"""
+検索・一覧・ネットワークAPIのレイテンシ計測スクリプト
+
+アプリをプロセス内で起動し（TestClient）、各エンドポイントを繰り返し呼び出して
+p50 / p95 / p99 を出力する。事前に generate_corpus.py でデータを投入しておくこと。
+
+使い方:
+    python scripts/benchmark_search.py --iterations 200
+    python scripts/benchmark_search.py --database-url sqlite:///./bench.db --with-cache
+
+- 既定ではクエリキャッシュを無効にして、DB・インデックスへの問い合わせ自体を計測する
+- 乱数シードを固定しているため、同じコーパスなら同じリクエスト列になる
+- 検索用の転置インデックスの構築（起動時にバックグラウンドで行う）が終わってから計測を始める
+  （構築中の bm25 / index は DB の検索で代替されるため、そのまま計測すると別の方式を計測してしまう）
+- fulltext は MySQL でのみ計測する（既定の --modes にも MySQL 以外では含めない）
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from scripts.generate_corpus import OBJECTS, PLACES, TOPICS
+
+
+def _search_params(rng: random.Random, mode: str) -> Dict[str, object]:
+    # 短いクエリ（2文字）から複合語まで混ぜる
+    q = rng.choice([rng.choice(TOPICS), rng.choice(OBJECTS), rng.choice(PLACES), rng.choice(TOPICS)[:2]])
+    return {"q": q, "mode": mode, "limit": 20}
+
+
+def _list_params(rng: random.Random, genre_ids: List[int]) -> Dict[str, object]:
+    params: Dict[str, object] = {"skip": rng.choice([0, 0, 0, 20, 100]), "limit": 20}
+    if genre_ids and rng.random() < 0.5:
+        params["genre_id"] = rng.choice(genre_ids)
+    return params
+
+
+def _percentile(sorted_ms: List[float], p: float) -> float:
+    """最近傍法によるパーセンタイル"""
+    index = max(0, min(len(sorted_ms) - 1, round(p / 100 * len(sorted_ms)) - 1))
+    return sorted_ms[index]
+
+
+def _measure(client, path: str, make_params: Callable[[], Dict[str, object]], iterations: int, warmup: int) -> Dict[str, float]:
+    """指定回数リクエストして、レイテンシ（ミリ秒）の統計を返す"""
+    for _ in range(warmup):
+        client.get(path, params=make_params())
+
+    latencies: List[float] = []
+    errors = 0
+    for _ in range(iterations):
+        params = make_params()
+        started = time.perf_counter()
+        response = client.get(path, params=params)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            errors += 1
+
+    latencies.sort()
+    return {
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "p99": _percentile(latencies, 99),
+        "mean": statistics.fmean(latencies),
+        "errors": errors,
+    }
+
+
+def _wait_for_search_index(timeout_seconds: float) -> None:
+    """転置インデックスの構築完了を待つ（タイムアウトした場合は終了する）"""
+    from app.utils.search_index import search_index
+
+    started = time.perf_counter()
+    while not search_index.ready:
+        elapsed = time.perf_counter() - started
+        if elapsed > timeout_seconds:
+            sys.exit(f"検索インデックスの構築が {timeout_seconds:.0f} 秒以内に終わりませんでした（--index-timeout で延長できます）")
+        time.sleep(0.5)
+    print(f"検索インデックスの構築を待ちました（{time.perf_counter() - started:.1f}秒）")
+
+
+def run_benchmark(iterations: int, warmup: int, seed: int, modes: List[str], index_timeout: float) -> None:
+    """各エンドポイントを計測して結果を表形式で出力"""
+    from fastapi.testclient import TestClient
+
+    from app.db import SessionLocal, engine
+    from app.main import app
+    from app.models.genre import Genre
+    from app.models.document import Document
+
+    if "fulltext" in modes and engine.dialect.name != "mysql":
+        # MySQL 以外では LIKE で代替されるため、fulltext としては計測しない
+        print(f"{engine.dialect.name} では fulltext を計測できないため除外します")
+        modes = [mode for mode in modes if mode != "fulltext"]
+
+    db = SessionLocal()
+    try:
+        genre_ids = [genre_id for (genre_id,) in db.query(Genre.id).all()]
+        document_count = db.query(Document).count()
+    finally:
+        db.close()
+    print(f"ドキュメント数: {document_count} / ジャンル数: {len(genre_ids)}")
+
+    rng = random.Random(seed)
+    targets = [
+        (f"search ({mode})", "/api/documents/search", lambda mode=mode: _search_params(rng, mode))
+        for mode in modes
+    ]
+    targets += [
+        ("documents_list", "/api/documents_list", lambda: _list_params(rng, genre_ids)),
+        ("network graph", "/api/network/graph", lambda: {}),
+    ]
+
+    # with ブロックで起動イベント（インメモリインデックスの構築）を実行する
+    with TestClient(app) as client:
+        _wait_for_search_index(index_timeout)
+        print(f"{'endpoint':<24}{'p50':>10}{'p95':>10}{'p99':>10}{'mean':>10}{'errors':>8}")
+        for label, path, make_params in targets:
+            # ネットワークグラフは重いため回数を抑える
+            n = iterations if path != "/api/network/graph" else max(1, iterations // 10)
+            result = _measure(client, path, make_params, n, warmup)
+            print(
+                f"{label:<24}{result['p50']:>9.1f}ms{result['p95']:>8.1f}ms{result['p99']:>8.1f}ms"
+                f"{result['mean']:>8.1f}ms{result['errors']:>8}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="検索・一覧・ネットワークAPIのレイテンシを計測")
+    parser.add_argument("--iterations", type=int, default=200, help="エンドポイントごとの計測回数")
+    parser.add_argument("--warmup", type=int, default=10, help="計測前のウォームアップ回数")
+    parser.add_argument("--seed", type=int, default=42, help="リクエスト生成の乱数シード")
+    parser.add_argument("--modes", help="計測する検索モード（カンマ区切り、省略時は bm25,index,like と MySQL では fulltext）")
+    parser.add_argument("--index-timeout", type=float, default=1800, help="検索インデックスの構築を待つ上限（秒）")
+    parser.add_argument("--with-cache", action="store_true", help="クエリキャッシュを有効にしたまま計測する")
+    parser.add_argument("--database-url", help="計測対象DB（省略時は環境変数 DATABASE_URL）")
+    args = parser.parse_args()
+
+    # app の読み込み前に設定する必要がある
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    if not args.with_cache:
+        os.environ["QUERY_CACHE_MAX_ENTRIES"] = "0"
+
+    modes = [mode.strip() for mode in (args.modes or "bm25,index,like,fulltext").split(",") if mode.strip()]
+    run_benchmark(args.iterations, args.warmup, args.seed, modes, args.index_timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+ベンチマーク用の合成コーパス投入スクリプト
+
+日本語のタイトル・本文を持つドキュメントを N 件（最大100万件）生成し、
+ジャンル・ユーザー・キーワード・評価とあわせて一括投入する。
+
+使い方:
+    python scripts/generate_corpus.py --documents 100000
+    python scripts/generate_corpus.py --documents 10000 --database-url sqlite:///./bench.db
+
+- 1行ずつ INSERT せず、チャンク単位の executemany + コミットで投入する
+- ドキュメント・紐付け・評価はチャンクごとに生成して投入するため、件数に関わらずメモリ使用量は一定
+  （保持するのはチャンク分の行と、キーワードごとの使用回数だけ）
+- 主キーは既存の最大値の続きから明示的に採番する（SQLiteでもそのまま投入できる）
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+# 語彙（ベンチマークの検索クエリにも使う）
+TOPICS = [
+    "経費精算", "交通費", "出張申請", "有給休暇", "勤怠管理", "入社手続き", "退職手続き", "年末調整",
+    "社会保険", "健康診断", "VPN接続", "パスワード変更", "PC貸与", "メール設定", "Slack運用", "会議室予約",
+    "稟議", "契約書", "請求書", "見積書", "発注", "検収", "予算管理", "採用面接",
+    "研修", "評価制度", "AWS", "Docker", "GitHub", "Python", "API設計", "障害対応",
+]
+OBJECTS = ["申請方法", "手順", "ルール", "注意点", "よくある質問", "テンプレート", "締め切り", "承認フロー", "トラブル対応", "まとめ"]
+VERBS = ["確認します", "提出します", "申請します", "登録します", "更新します", "共有します", "承認します", "保管します"]
+PLACES = ["社内ポータル", "経費精算システム", "人事システム", "共有フォルダ", "Box", "SharePoint", "Slackの専用チャンネル", "総務部"]
+TIMINGS = ["月末までに", "翌月5日までに", "事前に", "速やかに", "毎週金曜日に", "四半期ごとに", "入社初日に", "年に一度"]
+NOTES = [
+    "不明点は総務部に問い合わせてください。",
+    "領収書の原本は30日間保管してください。",
+    "上長の承認が必要です。",
+    "金額が5万円を超える場合は事前申請が必要です。",
+    "テンプレートは最新版を使用してください。",
+    "期限を過ぎると翌月の処理になります。",
+]
+DEPARTMENTS = ["総務部", "人事部", "経理部", "情報システム部", "営業部", "開発部"]
+
+# ジャンル階層（L1 → L2 → L3）
+GENRE_TREE = {
+    "申請系": {"経費": ["交通費", "出張費", "交際費"], "休暇": ["有給休暇", "特別休暇"], "稟議": ["購買", "契約"]},
+    "人事・労務": {"入退社": ["入社", "退職"], "勤怠": ["残業", "テレワーク"], "評価": ["目標設定", "面談"]},
+    "IT・システム": {"アカウント": ["パスワード", "権限"], "ネットワーク": ["VPN", "Wi-Fi"], "開発": ["AWS", "GitHub"]},
+    "総務": {"設備": ["会議室", "備品"], "文書": ["契約書", "押印"]},
+    "営業": {"顧客対応": ["見積", "請求"], "提案": ["資料", "事例"]},
+}
+
+
+def _title(rng: random.Random) -> str:
+    return f"{rng.choice(TOPICS)}の{rng.choice(OBJECTS)}"
+
+
+def _content(rng: random.Random, topic_title: str) -> str:
+    """Markdown形式の本文（数百〜千文字程度）"""
+    lines = [f"# {topic_title}", ""]
+    for section in range(rng.randint(2, 5)):
+        lines.append(f"## {section + 1}. {rng.choice(OBJECTS)}")
+        for _ in range(rng.randint(2, 6)):
+            lines.append(
+                f"{rng.choice(TOPICS)}は{rng.choice(PLACES)}から{rng.choice(TIMINGS)}{rng.choice(VERBS)}。"
+                f"{rng.choice(NOTES)}"
+            )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _next_id(db, model) -> int:
+    from sqlalchemy import func
+    return (db.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def _insert_chunks(db, model, rows, chunk_size: int, label: str) -> None:
+    """チャンクごとに executemany で投入してコミット"""
+    from sqlalchemy import insert
+    started = time.perf_counter()
+    for i in range(0, len(rows), chunk_size):
+        db.execute(insert(model), rows[i:i + chunk_size])
+        db.commit()
+    print(f"  {label}: {len(rows)} 件（{time.perf_counter() - started:.1f}秒）")
+
+
+def _add_usage_counts(db, model, usage_counts, chunk_size: int) -> None:
+    """キーワードの usage_count に使用回数を加算（executemany の UPDATE）"""
+    from sqlalchemy import bindparam, update
+    table = model.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("keyword_id"))
+        .values(usage_count=table.c.usage_count + bindparam("count"))
+    )
+    rows = [{"keyword_id": keyword_id, "count": count} for keyword_id, count in usage_counts.items()]
+    for i in range(0, len(rows), chunk_size):
+        db.execute(statement, rows[i:i + chunk_size])
+        db.commit()
+
+
+def generate_corpus(documents: int, chunk_size: int, seed: int) -> None:
+    """合成コーパスを投入"""
+    from sqlalchemy import insert
+    from app.db import SessionLocal, engine, Base
+    from app.models import User, Genre, Keyword, Document, DocumentKeyword, DocumentEvaluation
+    from app.models.document import DocumentStatus
+    from app.routers.keywords import normalize_text, normalize_title
+
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    try:
+        # 1. ユーザー
+        user_start = _next_id(db, User)
+        user_rows = [
+            {
+                "id": user_start + i,
+                "name": f"ベンチ{user_start + i}",
+                "email": f"bench{user_start + i}@example.com",
+                "department": rng.choice(DEPARTMENTS),
+            }
+            for i in range(50)
+        ]
+        _insert_chunks(db, User, user_rows, chunk_size, "users")
+        user_ids = [row["id"] for row in user_rows]
+
+        # 2. ジャンル（既存があればそれを使う）
+        genre_ids = [genre_id for (genre_id,) in db.query(Genre.id).all()]
+        if not genre_ids:
+            genre_rows = []
+            next_genre_id = 1
+            for order1, (name1, children1) in enumerate(GENRE_TREE.items()):
+                id1 = next_genre_id
+                next_genre_id += 1
+                genre_rows.append({"id": id1, "name": name1, "parent_id": None, "level": 1, "path": f"{id1}", "display_order": order1, "is_active": True})
+                for order2, (name2, children2) in enumerate(children1.items()):
+                    id2 = next_genre_id
+                    next_genre_id += 1
+                    genre_rows.append({"id": id2, "name": name2, "parent_id": id1, "level": 2, "path": f"{id1}/{id2}", "display_order": order2, "is_active": True})
+                    for order3, name3 in enumerate(children2):
+                        id3 = next_genre_id
+                        next_genre_id += 1
+                        genre_rows.append({"id": id3, "name": name3, "parent_id": id2, "level": 3, "path": f"{id1}/{id2}/{id3}", "display_order": order3, "is_active": True})
+            _insert_chunks(db, Genre, genre_rows, chunk_size, "genres")
+            genre_ids = [row["id"] for row in genre_rows]
+
+        # 3. キーワード（語彙 + 連番で、コーパス規模に応じた数を用意）
+        existing = {name for (name,) in db.query(Keyword.normalized_name).all()}
+        keyword_start = _next_id(db, Keyword)
+        keyword_names = [name for name in TOPICS + PLACES if normalize_text(name) not in existing]
+        keyword_names += [f"{rng.choice(TOPICS)}{i}" for i in range(max(0, min(documents // 20, 20000) - len(keyword_names)))]
+        keyword_rows = []
+        for name in keyword_names:
+            normalized = normalize_text(name)
+            if normalized in existing:
+                continue
+            existing.add(normalized)
+            keyword_rows.append({"id": keyword_start + len(keyword_rows), "name": name, "normalized_name": normalized, "usage_count": 0})
+        keyword_ids = [row["id"] for row in keyword_rows] or [k for (k,) in db.query(Keyword.id).all()]
+
+        _insert_chunks(db, Keyword, keyword_rows, chunk_size, "keywords")
+
+        # 4. ドキュメント・キーワード紐付け・評価（チャンクごとに生成して投入・コミット）
+        document_start = _next_id(db, Document)
+        next_evaluation_id = _next_id(db, DocumentEvaluation)
+        next_document_keyword_id = _next_id(db, DocumentKeyword)
+        now = datetime.now()
+        usage_counts = {}
+        status_choices = [DocumentStatus.PUBLISHED] * 8 + [DocumentStatus.DRAFT, DocumentStatus.ARCHIVED]
+        totals = {"documents": 0, "document_keywords": 0, "document_evaluations": 0}
+        started = time.perf_counter()
+
+        for chunk_start in range(0, documents, chunk_size):
+            document_rows, document_keyword_rows, evaluation_rows = [], [], []
+            for i in range(chunk_start, min(documents, chunk_start + chunk_size)):
+                document_id = document_start + i
+                title = _title(rng)
+                content = _content(rng, title)
+                created_at = now - timedelta(days=rng.randint(0, 730), seconds=rng.randint(0, 86400))
+                view_count = int(rng.paretovariate(1.2) * 5)
+                helpful_count = rng.randint(0, min(view_count, 20))
+                document_rows.append({
+                    "id": document_id,
+                    "title": title,
+                    "content": content,
+                    "normalized_title": normalize_title(title),
+                    "normalized_content": normalize_text(content),
+                    "genre_id": rng.choice(genre_ids),
+                    "external_link": None,
+                    "status": rng.choice(status_choices),
+                    "created_by": rng.choice(user_ids),
+                    "created_at": created_at,
+                    "updated_at": created_at + timedelta(days=rng.randint(0, 30)),
+                    "helpful_count": helpful_count,
+                    "view_count": view_count,
+                    "helpfulness_score": round(helpful_count / max(view_count, 1), 2),
+                })
+
+                for keyword_id in rng.sample(keyword_ids, rng.randint(0, min(3, len(keyword_ids)))):
+                    document_keyword_rows.append({"id": next_document_keyword_id, "document_id": document_id, "keyword_id": keyword_id})
+                    next_document_keyword_id += 1
+                    usage_counts[keyword_id] = usage_counts.get(keyword_id, 0) + 1
+
+                for user_id in rng.sample(user_ids, min(helpful_count, len(user_ids))):
+                    evaluation_rows.append({
+                        "id": next_evaluation_id,
+                        "document_id": document_id,
+                        "user_id": user_id,
+                        "is_helpful": rng.random() < 0.8,
+                        "created_at": created_at + timedelta(hours=rng.randint(1, 24 * 30)),
+                    })
+                    next_evaluation_id += 1
+
+            db.execute(insert(Document), document_rows)
+            if document_keyword_rows:
+                db.execute(insert(DocumentKeyword), document_keyword_rows)
+            if evaluation_rows:
+                db.execute(insert(DocumentEvaluation), evaluation_rows)
+            db.commit()
+            totals["documents"] += len(document_rows)
+            totals["document_keywords"] += len(document_keyword_rows)
+            totals["document_evaluations"] += len(evaluation_rows)
+            print(f"  ... {totals['documents']} / {documents} 件（{time.perf_counter() - started:.1f}秒）")
+
+        for label, count in totals.items():
+            print(f"  {label}: {count} 件")
+
+        # 5. キーワードの使用回数（紐付けた分を加算）
+        _add_usage_counts(db, Keyword, usage_counts, chunk_size)
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ エラーが発生しました: {e}")
+        raise
+
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ベンチマーク用の合成コーパスを投入")
+    parser.add_argument("--documents", type=int, default=10000, help="生成するドキュメント数（最大1,000,000）")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="1回の executemany で投入する行数")
+    parser.add_argument("--seed", type=int, default=42, help="乱数シード（同じ値なら同じコーパスになる）")
+    parser.add_argument("--database-url", help="投入先DB（省略時は環境変数 DATABASE_URL）")
+    args = parser.parse_args()
+
+    if not 1 <= args.documents <= 1_000_000:
+        parser.error("--documents は 1〜1,000,000 の範囲で指定してください")
+    if args.database_url:
+        # app.db の読み込み前に設定する必要がある
+        os.environ["DATABASE_URL"] = args.database_url
+
+    print(f"{args.documents} 件の合成コーパスを投入します...")
+    started = time.perf_counter()
+    generate_corpus(args.documents, args.chunk_size, args.seed)
+    print(f"完了しました（{time.perf_counter() - started:.1f}秒）。")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+ドキュメントの一括インポートスクリプト（既存Wikiからの移行用）
+
+JSON配列、または NDJSON（1行1ドキュメント、GET /api/documents/export の出力もそのまま使える）を読み込み、
+POST /api/documents/bulk と同じ処理（app/utils/document_import.py）で登録する。
+
+使い方:
+    python scripts/import_documents.py documents.ndjson
+    python scripts/import_documents.py legacy_wiki.json --chunk-size 2000 --created-by 3
+
+- 各要素は {"title", "content", "genre_id", "external_link", "keywords"} 形式
+  （keywords は文字列の配列、またはエクスポート形式の {"id", "name"} の配列）
+- 不正な要素はスキップし、最後に要素の位置（0始まり）と理由を表示する
+- 起動中の API は、登録されたドキュメントを SEARCH_INDEX_CATCH_UP_SECONDS（既定30秒）以内に
+  検索インデックス・入力補完へ取り込み、検索結果のキャッシュを無効にする（再起動は不要）。
+  関連キーワード（共起行列）への反映は、API の定期的な作り直し（KEYWORD_COOCCURRENCE_REBUILD_SECONDS）を待つ
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Iterator, List
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+def _read_items(path: str) -> Iterator[Any]:
+    """JSON配列または NDJSON を1要素ずつ返す"""
+    with open(path, encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        if head == "[":
+            yield from json.load(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _to_request_item(item: Any) -> Any:
+    """エクスポート形式のキーワード（{"id", "name"}）を名前に変換"""
+    if isinstance(item, dict) and isinstance(item.get("keywords"), list):
+        item = {
+            **item,
+            "keywords": [kw.get("name") if isinstance(kw, dict) else kw for kw in item["keywords"]],
+        }
+    return item
+
+
+def import_file(path: str, chunk_size: int, batch_size: int, created_by: int) -> None:
+    """ファイルを batch_size 件ずつ読み込んで登録"""
+    from app.db import SessionLocal
+    from app.utils.document_import import import_documents
+
+    db = SessionLocal()
+    created = 0
+    errors: List[dict] = []
+    offset = 0
+    started = time.perf_counter()
+
+    def flush(batch: List[Any]) -> None:
+        nonlocal created, offset
+        result = import_documents(db, batch, created_by, chunk_size)
+        created += len(result["created"])
+        errors.extend({"index": offset + error["index"], "messages": error["messages"]} for error in result["errors"])
+        offset += len(batch)
+        elapsed = time.perf_counter() - started
+        print(f"  ... {offset} 件処理しました（登録 {created} 件、{elapsed:.1f}秒）")
+
+    try:
+        batch: List[Any] = []
+        for item in _read_items(path):
+            batch.append(_to_request_item(item))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    rate = created / elapsed * 60 if elapsed else 0
+    print(f"✅ {created} 件のドキュメントを登録しました（{elapsed:.1f}秒、{rate:.0f} 件/分）。")
+    if errors:
+        print(f"❌ {len(errors)} 件は登録できませんでした:")
+        for error in errors:
+            print(f"  [{error['index']}] {' / '.join(error['messages'])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="ドキュメントを一括インポート",
+        epilog="起動中の API には SEARCH_INDEX_CATCH_UP_SECONDS（既定30秒）以内に検索・入力補完へ反映されます。",
+    )
+    parser.add_argument("path", help="JSON配列または NDJSON のファイル")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="1トランザクションで登録する件数")
+    parser.add_argument("--batch-size", type=int, default=10000, help="一度に読み込んで検証する件数")
+    parser.add_argument("--created-by", type=int, default=1, help="作成者のユーザーID")
+    parser.add_argument("--database-url", help="登録先DB（省略時は環境変数 DATABASE_URL）")
+    args = parser.parse_args()
+
+    if args.chunk_size < 1 or args.batch_size < 1:
+        parser.error("--chunk-size と --batch-size は1以上を指定してください")
+    if args.database_url:
+        # app.db の読み込み前に設定する必要がある
+        os.environ["DATABASE_URL"] = args.database_url
+
+    print(f"{args.path} からドキュメントをインポートします...")
+    import_file(args.path, args.chunk_size, args.batch_size, args.created_by)
+    print("完了しました。")
+
+
+if __name__ == "__main__":
+    main()
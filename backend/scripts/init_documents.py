@@ -7,6 +7,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.db import SessionLocal, engine, Base
 from app.models import Document
+from app.models.document import DocumentStatus
+from app.routers.keywords import normalize_text, normalize_title
 from datetime import datetime
 from datetime import datetime, timedelta
 
@@ -156,9 +158,13 @@ def init_documents():
             },
         ]
 
-        # データ投入
+        # データ投入（検索用の正規化済みカラムも create_document と同じく設定する）
         for doc_data in documents_data:
-            doc = Document(**doc_data)
+            doc = Document(
+                **{**doc_data, "status": DocumentStatus(doc_data["status"])},
+                normalized_title=normalize_title(doc_data["title"]),
+                normalized_content=normalize_text(doc_data["content"]),
+            )
             db.add(doc)
 
         db.commit()
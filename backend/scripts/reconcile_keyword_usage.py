@@ -0,0 +1,45 @@
+"""
+キーワードの使用回数（usage_count）の再集計スクリプト
+
+document_keywords の実際の紐付け数で keywords.usage_count を置き換える（cron などで定期実行する想定）。
+POST /api/keywords/reconcile と同じ処理（app/utils/keyword_usage.py）を行う。
+
+使い方:
+    python scripts/reconcile_keyword_usage.py
+    python scripts/reconcile_keyword_usage.py --prune-orphans
+
+--prune-orphans で削除したキーワードは、起動中の API のキーワード入力補完（インメモリのトライ木）に
+API の再起動まで残る（選択されても名前で作り直されるため、紐付けは壊れない）。
+すぐに反映したい場合は API を再起動する（POST /api/keywords/reconcile は受けたワーカーの補完だけを作り直す）。
+"""
+import argparse
+import os
+import sys
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="キーワードの使用回数を再集計")
+    parser.add_argument("--prune-orphans", action="store_true", help="ドキュメントに1件も紐付いていないキーワードを削除する")
+    args = parser.parse_args()
+
+    from app.db import SessionLocal
+    from app.utils.keyword_usage import reconcile_usage_counts
+
+    print("キーワードの使用回数を再集計します...")
+    db = SessionLocal()
+    try:
+        result = reconcile_usage_counts(db, args.prune_orphans)
+        print(f"✅ {result['keywords']} 件中 {result['updated']} 件の使用回数を修正し、{result['pruned']} 件の孤立キーワードを削除しました。")
+    except Exception as e:
+        print(f"❌ エラーが発生しました: {e}")
+        raise
+    finally:
+        db.close()
+    print("完了しました。")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+テスト共通の設定
+
+- DB は一時ディレクトリの SQLite を使う（app.db の読み込み前に DATABASE_URL を設定する）
+- SQLite では BIGINT の主キーが自動採番（ROWID）にならないため、INTEGER として作成する
+- テストごとに全テーブルを作り直し、プロセス内で共有するインデックス・キャッシュ類も空に戻す
+  （検索インデックス・トライ木・共起行列は構築前の状態になるため、使うテストで build する）
+"""
+import os
+import sys
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="kunyomi-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.compiler import compiles
+
+from app.db import Base, SessionLocal, engine
+from app.models import Document, DocumentKeyword, Genre, Keyword, User
+from app.models.document import DocumentStatus
+from app.routers.keywords import normalize_text
+from app.utils.cache import content_version, keyword_version, query_cache
+from app.utils.genre_tree import genre_tree
+from app.utils.keyword_cooccurrence import keyword_cooccurrence
+from app.utils.keyword_trie import keyword_trie
+from app.utils.search_index import search_index
+from app.utils.trending import trending_documents
+from app.utils.view_buffer import view_buffer
+
+
+@compiles(BigInteger, "sqlite")
+def _compile_big_integer_sqlite(type_, compiler, **kw):
+    return "INTEGER"
+
+
+def _clear_in_memory_state():
+    """前のテストで作成したインデックス・キャッシュ・未反映の集計を破棄"""
+    search_index.clear()
+    keyword_trie.clear()
+    keyword_cooccurrence.clear()
+    view_buffer.clear()
+    trending_documents.clear()
+    query_cache.clear()
+    genre_tree.invalidate()
+    # バージョンに紐付くキャッシュ（人気キーワードなど）も無効にする
+    content_version.bump()
+    keyword_version.bump()
+
+
+@pytest.fixture
+def db():
+    """空のテーブルを作り直したセッション"""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    _clear_in_memory_state()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def seed(db):
+    """ユーザー1件とジャンル（親 1 → 子 2）を登録"""
+    db.add(User(id=1, name="テストユーザー", email="test@example.com"))
+    db.add(Genre(id=1, name="開発", parent_id=None, level=1, path="1", display_order=1))
+    db.add(Genre(id=2, name="バックエンド", parent_id=1, level=2, path="1/2", display_order=1))
+    db.commit()
+    return db
+
+
+def add_document(db, title, content, genre_id=2, keywords=(), helpfulness_score=0.0, status=DocumentStatus.PUBLISHED):
+    """ドキュメントを1件登録してIDを返す（キーワードは名前で指定）"""
+    document = Document(
+        title=title,
+        content=content,
+        normalized_title=normalize_text(title),
+        normalized_content=normalize_text(content),
+        genre_id=genre_id,
+        status=status,
+        created_by=1,
+        helpfulness_score=helpfulness_score,
+    )
+    db.add(document)
+    db.flush()
+    for name in keywords:
+        keyword = db.query(Keyword).filter(Keyword.normalized_name == normalize_text(name)).one_or_none()
+        if keyword is None:
+            keyword = Keyword(name=name, normalized_name=normalize_text(name), usage_count=0)
+            db.add(keyword)
+            db.flush()
+        keyword.usage_count += 1
+        db.add(DocumentKeyword(document_id=document.id, keyword_id=keyword.id))
+    db.commit()
+    return document.id
@@ -0,0 +1,48 @@
+"""正規化カラムのバックフィル（scripts/backfill_normalized_columns.py）のテスト"""
+import importlib.util
+import os
+from datetime import datetime
+
+from app.models import Document
+from tests.conftest import add_document
+
+_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "backfill_normalized_columns.py")
+
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location("backfill_normalized_columns", _SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_backfill_sets_normalized_columns_and_keeps_updated_at(seed):
+    db = seed
+    updated_at = datetime(2023, 4, 1, 9, 30, 0)
+    ids = [add_document(db, f"ＡＰＩ設計 {i}", "Ｐｙｔｈｏｎ の手順") for i in range(5)]
+    db.query(Document).update(
+        {Document.normalized_title: None, Document.normalized_content: None, Document.updated_at: updated_at},
+        synchronize_session=False,
+    )
+    db.commit()
+
+    script = _load_script()
+    script.BATCH_SIZE = 2
+    script.backfill_normalized_columns()
+
+    db.expire_all()
+    rows = db.query(Document.id, Document.normalized_title, Document.normalized_content, Document.updated_at).order_by(Document.id).all()
+    assert [row.id for row in rows] == ids
+    for i, row in enumerate(rows):
+        assert row.normalized_title == f"api設計 {i}"
+        assert row.normalized_content == "python の手順"
+        assert row.updated_at == updated_at
+
+
+def test_normalized_title_is_truncated_to_column_length():
+    from app.models.document import NORMALIZED_TITLE_LENGTH
+    from app.routers.keywords import normalize_title
+
+    assert normalize_title("㍿ＡＢＣ") == "株式会社abc"
+    # 255文字のタイトルでも NFKC 後の長さはカラム長を超えない
+    assert len(normalize_title("ﷺ" * 255)) == NORMALIZED_TITLE_LENGTH
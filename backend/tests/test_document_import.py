@@ -0,0 +1,49 @@
+"""ドキュメントの一括登録（app/utils/document_import.py）のテスト"""
+from app.models import Document, DocumentKeyword, Keyword
+from app.utils.document_import import import_documents
+from tests.conftest import add_document
+
+
+def _item(title, genre_id=2, keywords=()):
+    return {"title": title, "content": f"{title}の本文", "genre_id": genre_id, "keywords": list(keywords)}
+
+
+def test_import_assigns_auto_increment_ids_in_item_order(seed):
+    db = seed
+    existing_id = add_document(db, "既存", "本文")
+    items = [
+        _item("手順A", keywords=["経費", "出張"]),
+        {"title": "", "content": "本文", "genre_id": 2},
+        _item("手順B", genre_id=999),
+        _item("手順C", keywords=["経費"]),
+        _item("手順D"),
+    ]
+
+    result = import_documents(db, items, created_by=1, chunk_size=2)
+
+    assert result["total"] == 5
+    assert [error["index"] for error in result["errors"]] == [1, 2]
+    created = result["created"]
+    assert [entry["index"] for entry in created] == [0, 3, 4]
+    ids = [entry["id"] for entry in created]
+    assert all(document_id > existing_id for document_id in ids)
+    assert len(set(ids)) == 3
+
+    titles = dict(db.query(Document.id, Document.title).filter(Document.id.in_(ids)))
+    assert [titles[document_id] for document_id in ids] == ["手順A", "手順C", "手順D"]
+
+    links = {
+        (document_id, name)
+        for document_id, name in db.query(DocumentKeyword.document_id, Keyword.name)
+        .join(Keyword, Keyword.id == DocumentKeyword.keyword_id)
+        .filter(DocumentKeyword.document_id.in_(ids))
+    }
+    assert links == {(ids[0], "経費"), (ids[0], "出張"), (ids[1], "経費")}
+    assert dict(db.query(Keyword.name, Keyword.usage_count)) == {"経費": 2, "出張": 1}
+
+
+def test_ids_after_import_do_not_collide_with_regular_creates(seed):
+    db = seed
+    result = import_documents(db, [_item("手順A"), _item("手順B")], created_by=1)
+    imported_ids = {entry["id"] for entry in result["created"]}
+    assert add_document(db, "通常の作成", "本文") not in imported_ids
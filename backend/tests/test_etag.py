@@ -0,0 +1,42 @@
+"""一覧・グラフの ETag（app/utils/etag.py の documents_fingerprint）のテスト"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import Document
+from app.utils.cache import query_cache
+from tests.conftest import add_document
+
+
+@pytest.fixture
+def client(seed):
+    add_document(seed, "経費精算の手順", "本文")
+    query_cache.clear()
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/api/documents_list", "/api/network/graph"])
+def test_etag_changes_on_writes_from_other_processes(client, seed, path):
+    etag = client.get(path).headers["ETag"]
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    # スクリプトなど別のプロセスによる書き込み（このプロセスの content_version は進まない）
+    new_id = add_document(seed, "交通費の精算", "本文")
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    if path == "/api/documents_list":
+        # キャッシュ済みの古い一覧を返さない
+        assert new_id in [doc["id"] for doc in response.json()]
+
+
+def test_list_etag_changes_on_update(client, seed):
+    etag = client.get("/api/documents_list").headers["ETag"]
+    # 他のプロセスによる評価（updated_at は秒単位のため、後の時刻を明示する）
+    document = seed.get(Document, 1)
+    document.helpful_count = 1
+    document.updated_at = datetime(2099, 1, 1)
+    seed.commit()
+    assert client.get("/api/documents_list", headers={"If-None-Match": etag}).status_code == 200
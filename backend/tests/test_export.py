@@ -0,0 +1,53 @@
+"""ドキュメントのエクスポート（/api/documents/export）のテスト"""
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.document import DocumentStatus
+from app.routers import documents
+from tests.conftest import add_document
+
+
+@pytest.fixture
+def client(seed, monkeypatch):
+    # バッチの境界をまたぐように、バッチサイズを件数より小さくする
+    monkeypatch.setattr(documents, "EXPORT_BATCH_SIZE", 2)
+    add_document(seed, "経費精算の手順", "申請書を提出します。", keywords=["経費", "申請"], helpfulness_score=0.5)
+    add_document(seed, "交通費の精算", "交通費を申請します。", genre_id=1)
+    add_document(seed, "出張申請", "出張の前に申請してください。", keywords=["出張"])
+    add_document(seed, "下書き", "本文", status=DocumentStatus.DRAFT)
+    add_document(seed, "社内ガイドライン", "本文", keywords=["経費"])
+    return TestClient(app)
+
+
+def _lines(response):
+    assert response.status_code == 200, response.text
+    return [orjson.loads(line) for line in response.text.splitlines()]
+
+
+def test_export_streams_every_document_as_ndjson(client):
+    response = client.get("/api/documents/export")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "documents.ndjson" in response.headers["content-disposition"]
+
+    lines = _lines(response)
+    # バッチをまたいでも重複・欠落なく ID 順に1行ずつ出力される（下書きも含む）
+    assert [line["id"] for line in lines] == [1, 2, 3, 4, 5]
+    assert lines[3]["status"] == "draft"
+    assert lines[0]["helpfulness_score"] == 0.5
+    assert "normalized_title" not in lines[0]
+
+
+def test_export_includes_keywords_of_each_batch(client):
+    keywords = {line["id"]: [keyword["name"] for keyword in line["keywords"]] for line in _lines(client.get("/api/documents/export"))}
+    assert sorted(keywords[1]) == ["申請", "経費"]
+    assert keywords[2] == []
+    assert keywords[3] == ["出張"]
+    assert keywords[5] == ["経費"]
+
+
+def test_export_of_empty_table_is_empty(seed):
+    response = TestClient(app).get("/api/documents/export")
+    assert response.status_code == 200
+    assert response.text == ""
@@ -0,0 +1,52 @@
+"""ジャンル一覧の ETag（app/utils/genre_tree.py の genres_fingerprint）のテスト"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import Genre
+from app.utils.genre_tree import genres_fingerprint
+
+
+@pytest.fixture
+def genres(seed):
+    seed.add(Genre(id=3, name="フロントエンド", parent_id=1, level=2, path="1/3", display_order=2))
+    seed.commit()
+    return seed
+
+
+def _swap_display_order(db):
+    first, second = db.get(Genre, 2), db.get(Genre, 3)
+    first.display_order, second.display_order = second.display_order, first.display_order
+
+
+def _move_to_root(db):
+    genre = db.get(Genre, 3)
+    genre.parent_id, genre.level, genre.path = None, 1, "3"
+
+
+@pytest.mark.parametrize("change", [
+    lambda db: setattr(db.get(Genre, 2), "name", "サーバーサイド"),
+    _swap_display_order,
+    _move_to_root,
+    lambda db: setattr(db.get(Genre, 3), "is_active", False),
+])
+def test_fingerprint_detects_changes(genres, change):
+    db = genres
+    before = genres_fingerprint(db)
+    change(db)
+    db.commit()
+    assert genres_fingerprint(db) != before
+
+
+def test_genres_etag_revalidation(genres):
+    db = genres
+    client = TestClient(app)
+    response = client.get("/api/genres/")
+    etag = response.headers["ETag"]
+    assert client.get("/api/genres/", headers={"If-None-Match": etag}).status_code == 304
+
+    db.get(Genre, 2).name = "サーバーサイド"
+    db.commit()
+    response = client.get("/api/genres/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,58 @@
+"""HyperLogLog（app/utils/hyperloglog.py）のテスト"""
+import zlib
+
+import pytest
+
+from app.utils.hyperloglog import HLL_PRECISION, HyperLogLog
+
+
+def _sketch(values):
+    sketch = HyperLogLog()
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def test_duplicates_are_counted_once():
+    sketch = HyperLogLog()
+    assert sketch.add("user:1") is True
+    assert sketch.add("user:1") is False
+    sketch.add("user:2")
+    assert sketch.estimate() == 2
+    assert HyperLogLog().estimate() == 0
+
+
+@pytest.mark.parametrize("count", [1000, 50000])
+def test_estimate_is_within_the_standard_error(count):
+    estimate = _sketch(f"user:{i}" for i in range(count)).estimate()
+    # 標準誤差 約1.6% に対して余裕を持たせる
+    assert estimate == pytest.approx(count, rel=0.05)
+
+
+def test_merge_is_the_union():
+    a = _sketch(f"user:{i}" for i in range(0, 3000))
+    b = _sketch(f"user:{i}" for i in range(2000, 5000))
+    both = _sketch(f"user:{i}" for i in range(0, 5000))
+
+    a.merge(b)
+    # 重複する 2000..2999 は1回と数える。レジスタは全件を追加した場合と一致する
+    assert a.to_bytes() == both.to_bytes()
+    assert HyperLogLog.union([_sketch(["x"]), _sketch(["x", "y"])]).estimate() == 2
+
+
+def test_bytes_round_trip():
+    sketch = _sketch(f"user:{i}" for i in range(500))
+    data = sketch.to_bytes()
+    restored = HyperLogLog.from_bytes(data)
+
+    assert restored.estimate() == sketch.estimate()
+    assert restored.to_bytes() == data
+    # 復元後も追加・マージできる
+    assert restored.add("user:0") is False
+    assert HyperLogLog.from_bytes(None).estimate() == 0
+
+
+def test_from_bytes_rejects_another_precision():
+    data = zlib.compress(bytes([HLL_PRECISION + 1]) + bytes(1 << HLL_PRECISION))
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(data)
@@ -0,0 +1,15 @@
+"""ドキュメントの初期データ投入（scripts/init_documents.py）のテスト"""
+from app.models import Document
+from app.routers.keywords import normalize_text, normalize_title
+from scripts.init_documents import init_documents
+
+
+def test_seeded_documents_have_normalized_columns(seed):
+    db = seed
+    init_documents()
+
+    documents = db.query(Document).all()
+    assert documents
+    for document in documents:
+        assert document.normalized_title == normalize_title(document.title)
+        assert document.normalized_content == normalize_text(document.content)
@@ -0,0 +1,61 @@
+"""キーワードの共起行列（app/utils/keyword_cooccurrence.py）のテスト"""
+import time
+
+from app.db import SessionLocal
+from app.utils.keyword_cooccurrence import KeywordCooccurrence
+from tests.conftest import add_document
+
+# キーワードIDは登録順に 経費=1, 精算=2, 出張=3, 申請=4
+KEYWORDS = [
+    ["経費", "精算"],
+    ["経費", "精算", "出張"],
+    ["経費", "出張"],
+    ["経費", "精算", "申請"],
+]
+
+
+def _seed_keywords(db):
+    for i, keywords in enumerate(KEYWORDS):
+        add_document(db, f"ドキュメント{i}", "本文", keywords=keywords)
+
+
+def test_related_orders_by_cooccurrence_count_then_id(seed):
+    _seed_keywords(seed)
+    cooccurrence = KeywordCooccurrence(SessionLocal, 600)
+    cooccurrence.build(seed)
+
+    assert cooccurrence.related(1, 10) == [(2, 3), (3, 2), (4, 1)]
+    assert cooccurrence.related(1, 2) == [(2, 3), (3, 2)]
+    assert cooccurrence.related(4, 10) == [(1, 1), (2, 1)]
+    assert cooccurrence.related(99, 10) == []
+
+
+def test_documents_added_after_build_are_counted_until_rebuild(seed):
+    _seed_keywords(seed)
+    cooccurrence = KeywordCooccurrence(SessionLocal, 600)
+    cooccurrence.build(seed)
+
+    # 作成後に差分として加算される（同じドキュメントの2回目は無視）
+    document_id = add_document(seed, "追加", "本文", keywords=["出張", "申請"])
+    cooccurrence.add_document(document_id, [3, 4])
+    cooccurrence.add_document(document_id, [3, 4])
+    assert cooccurrence.related(3, 10) == [(1, 2), (2, 1), (4, 1)]
+
+    # 作り直した後は行列に含まれ、差分から二重に数えない
+    cooccurrence.build(seed)
+    assert cooccurrence.related(3, 10) == [(1, 2), (2, 1), (4, 1)]
+    assert cooccurrence._delta == {}
+
+
+def test_start_builds_in_background(seed):
+    _seed_keywords(seed)
+    cooccurrence = KeywordCooccurrence(SessionLocal, 600)
+    cooccurrence.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not cooccurrence.ready and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cooccurrence.ready
+        assert cooccurrence.related(1, 1) == [(2, 3)]
+    finally:
+        cooccurrence.stop()
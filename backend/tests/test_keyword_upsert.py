@@ -0,0 +1,62 @@
+"""キーワードの UPSERT（app/utils/keyword_upsert.py）のテスト"""
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import DocumentKeyword, Keyword
+from app.utils.keyword_upsert import normalize_keywords, upsert_keyword_usage
+from app.utils.keyword_usage import reconcile_usage_counts
+
+
+def test_normalize_keywords_dedupes_by_normalized_name():
+    assert normalize_keywords([" Python ", "ＰＹＴＨＯＮ", "", "経費"]) == {"python": "Python", "経費": "経費"}
+
+
+def test_upsert_keyword_usage_creates_and_increments(db):
+    first = upsert_keyword_usage(db, {"python": "Python", "経費": "経費"})
+    db.commit()
+    second = upsert_keyword_usage(db, {"python": "PYTHON"}, {"python": 3})
+    db.commit()
+
+    assert second == {"python": first["python"]}
+    counts = dict(db.query(Keyword.normalized_name, Keyword.usage_count))
+    assert counts == {"python": 4, "経費": 1}
+
+
+def _create_document(client, keywords):
+    response = client.post(
+        "/api/documents",
+        json={"title": "経費精算の手順", "content": "本文", "genre_id": 2, "keywords": keywords},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_create_after_prune_links_to_existing_keywords(seed):
+    db = seed
+    client = TestClient(app)
+    created = _create_document(client, ["経費", "出張"])
+    pruned_id = next(keyword["id"] for keyword in created["keywords"] if keyword["name"] == "経費")
+
+    # 別プロセス（scripts/reconcile_keyword_usage.py --prune-orphans）での削除を想定し、API プロセスを通さずに削除
+    db.query(DocumentKeyword).filter(DocumentKeyword.keyword_id == pruned_id).delete()
+    db.query(Keyword).filter(Keyword.id == pruned_id).delete()
+    db.commit()
+
+    created = _create_document(client, ["経費"])
+    db.expire_all()
+    linked_ids = {keyword_id for (keyword_id,) in db.query(DocumentKeyword.keyword_id).filter(DocumentKeyword.document_id == created["id"])}
+    assert len(linked_ids) == 1
+    assert linked_ids == {keyword_id for (keyword_id,) in db.query(Keyword.id).filter(Keyword.normalized_name == "経費")}
+    assert pruned_id not in linked_ids
+
+
+def test_reconcile_prunes_orphans_and_fixes_counts(seed):
+    db = seed
+    client = TestClient(app)
+    _create_document(client, ["経費", "出張"])
+    db.query(Keyword).filter(Keyword.normalized_name == "経費").update({Keyword.usage_count: 10})
+    db.add(Keyword(name="孤立", normalized_name="孤立", usage_count=3))
+    db.commit()
+
+    assert reconcile_usage_counts(db, prune_orphans=True) == {"keywords": 2, "updated": 1, "pruned": 1}
+    assert dict(db.query(Keyword.normalized_name, Keyword.usage_count)) == {"経費": 1, "出張": 1}
@@ -0,0 +1,47 @@
+"""キーワードAPI（/api/keywords）のテスト"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import Keyword
+from app.utils.cache import keyword_version
+from app.utils.popular_keywords import popular_keywords
+
+
+@pytest.fixture
+def client(db):
+    """使用回数の異なるキーワード5件を登録したクライアント"""
+    for i, usage_count in enumerate([5, 4, 4, 2, 1], start=1):
+        db.add(Keyword(id=i, name=f"キーワード{i}", normalized_name=f"キーワード{i}", usage_count=usage_count))
+    db.commit()
+    keyword_version.bump()
+    return TestClient(app)
+
+
+def _pages(client, limit):
+    """カーソルを辿って全ページを取得"""
+    pages, cursor = [], None
+    for _ in range(10):
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/keywords", params=params)
+        assert response.status_code == 200, response.text
+        pages.append([keyword["id"] for keyword in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+    raise AssertionError("カーソルが終わらない")
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4, 5, 6])
+def test_list_keywords_pages_without_trailing_empty_page(client, limit):
+    pages = _pages(client, limit)
+    assert [keyword_id for page in pages for keyword_id in page] == [1, 3, 2, 4, 5]
+    assert all(pages)
+
+
+def test_list_keywords_beyond_popular_cache(client):
+    # 人気キーワードのキャッシュ件数を超える limit はDBから取得する
+    pages = _pages(client, popular_keywords.top_n + 1)
+    assert pages == [[1, 3, 2, 4, 5]]
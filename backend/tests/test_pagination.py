@@ -0,0 +1,40 @@
+"""カーソル（キーセット）ページネーションのユーティリティのテスト"""
+import pytest
+from fastapi import HTTPException
+
+from app.utils.pagination import cursor_value, decode_cursor, encode_cursor, parse_cursor_part
+
+
+def test_cursor_round_trip():
+    payload = {"k": [1.5, "2024-01-02T03:04:05", 42], "u": [10, 7]}
+    cursor = encode_cursor(payload)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == payload
+
+
+def test_cursor_round_trip_non_ascii():
+    payload = {"q": "検索ｶﾞ"}
+    assert decode_cursor(encode_cursor(payload)) == payload
+
+
+@pytest.mark.parametrize("cursor", ["!!!", "bm90IGpzb24", "WzFd"])
+def test_decode_cursor_rejects_malformed(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor)
+    assert e.value.status_code == 400
+
+
+def test_cursor_value_checks_key_type_and_size():
+    position = {"u": [3, 9]}
+    assert cursor_value(position, "u", list, size=2) == [3, 9]
+    for key, expected, size in [("k", list, 2), ("u", list, 3), ("u", dict, 2)]:
+        with pytest.raises(HTTPException) as e:
+            cursor_value(position, key, expected, size=size)
+        assert e.value.status_code == 400
+
+
+def test_parse_cursor_part_rejects_bad_values():
+    assert parse_cursor_part(int, "12") == 12
+    with pytest.raises(HTTPException) as e:
+        parse_cursor_part(int, "abc")
+    assert e.value.status_code == 400
@@ -0,0 +1,88 @@
+"""ドキュメント検索API（/api/documents/search）のテスト"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.cache import query_cache
+from app.utils.search_index import search_index
+from tests.conftest import add_document
+
+
+@pytest.fixture
+def client(seed):
+    """経費・精算関連のドキュメントを登録し、転置インデックスを構築したクライアント"""
+    db = seed
+    add_document(db, "経費精算の手順", "申請書を提出します。", keywords=["経費"], helpfulness_score=0.5)
+    add_document(db, "交通費の精算", "経費精算システムで交通費を申請します。", genre_id=1, helpfulness_score=0.2)
+    add_document(db, "出張申請", "出張の前に申請してください。", keywords=["出張", "経費"], helpfulness_score=0.9)
+    add_document(db, "ｶﾞｲﾄﾞﾗｲﾝ", "社内ガイドライン。")
+    search_index.build(db)
+    query_cache.clear()
+    return TestClient(app)
+
+
+def _ids(response):
+    assert response.status_code == 200, response.text
+    return [doc["id"] for doc in response.json()]
+
+
+@pytest.mark.parametrize("mode", ["like", "index"])
+def test_title_and_keyword_match(client, mode):
+    # タイトルの「経費精算」と、キーワード「経費」の付いたドキュメント（有益度の降順）
+    response = client.get("/api/documents/search", params={"q": "経費", "mode": mode})
+    assert _ids(response) == [3, 1]
+
+
+def test_index_and_like_agree_after_normalization(client):
+    # 半角カナのタイトルも NFKC 後の全角で一致する
+    for mode in ("like", "index"):
+        response = client.get("/api/documents/search", params={"q": "ガイド", "mode": mode})
+        assert _ids(response) == [4]
+
+
+def test_bm25_includes_content_and_ranks_title_first(client):
+    response = client.get("/api/documents/search", params={"q": "経費精算", "mode": "bm25"})
+    ids = _ids(response)
+    assert set(ids) == {1, 2}
+    assert ids[0] == 1
+    assert response.headers["X-Total-Count"] == "2"
+
+
+@pytest.mark.parametrize("mode", ["bm25", "index"])
+def test_cursor_pagination_covers_all_hits_once(client, mode):
+    query = "申請" if mode == "bm25" else "経費"
+    expected = _ids(client.get("/api/documents/search", params={"q": query, "mode": mode, "limit": 100}))
+    assert len(expected) >= 2
+
+    seen, cursor = [], None
+    for _ in range(len(expected) + 1):
+        params = {"q": query, "mode": mode, "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/documents/search", params=params)
+        seen += _ids(response)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_single_character_fulltext_falls_back_to_index(client):
+    response = client.get("/api/documents/search", params={"q": "費", "mode": "fulltext"})
+    assert set(_ids(response)) == {1, 2, 3}
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/api/documents/search", params={"q": "経費", "mode": "index", "cursor": "!!!"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("mode", ["like", "index", "bm25"])
+def test_genre_facets_roll_up_to_parent(client, mode):
+    response = client.get("/api/documents/search/facets", params={"q": "精算", "mode": mode})
+    assert response.status_code == 200
+    body = response.json()
+    counts = {genre["genre_id"]: genre["count"] for genre in body["genres"]}
+    # 交通費の精算（親ジャンル直下）と経費精算の手順（子ジャンル）
+    assert body["total"] == 2
+    assert counts == {1: 2, 2: 1}
@@ -0,0 +1,201 @@
+"""インメモリ転置インデックス（app/utils/search_index.py）のテスト"""
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import documents_search
+from app.utils.cache import query_cache
+from app.utils.search_index import ALL_FIELDS, FIELD_KEYWORDS, FIELD_TITLE, DocumentSearchIndex, search_index
+from tests.conftest import add_document
+
+WORDS = ["経費", "精算", "交通費", "申請", "出張", "手順", "承認", "規程"]
+
+
+@pytest.fixture
+def index():
+    """ランダムな文書 300 件（同点が出るよう語の組み合わせは少なめ）"""
+    rng = random.Random(0)
+    index = DocumentSearchIndex()
+    for document_id in range(1, 301):
+        title = "".join(rng.sample(WORDS, 2))
+        content = "。".join(rng.choice(WORDS) for _ in range(rng.randint(1, 8)))
+        index.add_document(
+            document_id, title, rng.sample(WORDS, rng.randint(0, 2)), content, rng.choice([0.0, 0.5]),
+            rng.randint(1, 3), datetime(2024, 1, 1) + timedelta(days=rng.randint(0, 3)),
+        )
+    return index
+
+
+def test_rank_pages_match_full_ranking(index):
+    total, full = index.rank("経費", 10_000)
+    assert total == len(full) == len(index.search("経費", ALL_FIELDS))
+    assert full == sorted(full, reverse=True)
+
+    for limit in (1, 7, 50):
+        pages, after = [], None
+        while True:
+            page_total, page = index.rank("経費", limit, after)
+            assert page_total == total
+            if not page:
+                break
+            pages += page
+            after = page[-1]
+        assert pages == full
+
+
+def test_search_matches_substring_of_title_or_a_keyword():
+    rng = random.Random(1)
+    index = DocumentSearchIndex()
+    documents = {}
+    for document_id in range(1, 201):
+        title = "".join(rng.choices(WORDS, k=rng.randint(1, 3)))
+        keywords = rng.sample(WORDS, rng.randint(0, 3))
+        index.add_document(document_id, title, keywords, "")
+        documents[document_id] = [title, *keywords]
+    # 値をまたいだ一致（キーワード「経費」「精算」で「経費精算」）はヒットしない
+    for q in ("経費精算", "費精", "交通費", "申請出張", "出張手順承認", "規程規程", "精算交"):
+        expected = {
+            document_id for document_id, values in documents.items()
+            if any(q in value for value in values)
+        }
+        assert index.search(q) == expected, q
+
+
+def test_page_matches_sort_by_helpfulness_updated_at_and_id(index):
+    total, full = index.page("経費", 10_000)
+    assert total == len(full)
+    assert {document_id for _, _, document_id in full} == index.search("経費")
+    assert full == sorted(full, reverse=True)
+
+    for limit in (1, 7, 50):
+        pages, after = [], None
+        while True:
+            page_total, page = index.page("経費", limit, after)
+            assert page_total == total
+            if not page:
+                break
+            pages += page
+            after = page[-1]
+        assert pages == full
+
+
+def test_genre_counts_match_search(index):
+    for fields in ((FIELD_TITLE, FIELD_KEYWORDS), ALL_FIELDS):
+        hits = index.search("精算", fields)
+        expected = Counter(index._genre_ids[index._ordinals[document_id]] for document_id in hits)
+        assert index.genre_counts("精算", fields) == expected
+    assert index.genre_counts("該当なし") == {}
+
+
+def test_update_helpfulness_reorders_page(index):
+    _, full = index.page("経費", 10_000)
+    last_id = full[-1][2]
+    index.update_helpfulness(last_id, 9.0, datetime(2024, 2, 1))
+    _, page = index.page("経費", 1)
+    assert page[0][2] == last_id
+
+
+def test_rank_orders_title_matches_before_content_only_matches():
+    index = DocumentSearchIndex()
+    index.add_document(1, "出張の手順", [], "経費精算は月末まで")
+    index.add_document(2, "経費精算の手順", [], "申請します")
+    total, ranked = index.rank("経費精算", 10)
+    assert total == 2
+    assert [document_id for _, document_id in ranked] == [2, 1]
+
+
+def test_replaced_document_is_not_returned_twice(index):
+    index.add_document(1, "特殊な語彙", [], "")
+    assert index.search("特殊") == {1}
+    index.add_document(1, "別の題名", [], "")
+    assert index.search("特殊") == set()
+    assert 1 not in {document_id for _, document_id in index.rank("特殊", 10)[1]}
+
+
+def test_documents_added_during_build_are_kept(seed, monkeypatch):
+    db = seed
+    add_document(db, "経費精算の手順", "本文")
+    index = DocumentSearchIndex()
+    original_add = DocumentSearchIndex._add
+    created = []
+
+    def add_while_building(self, *args):
+        original_add(self, *args)
+        if self is not index and not created:
+            # 全件の読み込み中に、別のリクエストでドキュメントが作成された想定
+            created.append(999)
+            index.add_document(999, "経費の新しい規程", [], "本文")
+
+    monkeypatch.setattr(DocumentSearchIndex, "_add", add_while_building)
+    index.build(db)
+
+    assert index.ready
+    assert index.search("経費") == {1, 999}
+
+
+def test_background_build(seed):
+    add_document(seed, "経費精算の手順", "本文")
+    index = DocumentSearchIndex()
+    index.start_build(lambda: seed)
+    index._build_thread.join(timeout=10)
+    assert index.ready
+    assert index.search("経費") == {1}
+
+
+def test_search_falls_back_to_database_until_index_is_ready(monkeypatch):
+    monkeypatch.setattr(search_index, "ready", False)
+    monkeypatch.setattr(search_index, "start_build", lambda session_factory: None)
+    assert documents_search._resolve_mode("経費", "bm25", True) == "fulltext"
+    assert documents_search._resolve_mode("経費", "index", True) == "fulltext"
+    assert documents_search._resolve_mode("費", "bm25", True) == "like"
+    # MySQL 以外は FULLTEXT を使えないため LIKE で検索する
+    assert documents_search._resolve_mode("経費", "bm25", False) == "like"
+    assert documents_search._resolve_mode("経費", "fulltext", False) == "like"
+
+    monkeypatch.setattr(search_index, "ready", True)
+    assert documents_search._resolve_mode("経費", "bm25", True) == "bm25"
+    assert documents_search._resolve_mode("費", "fulltext", True) == "index"
+
+
+def test_search_before_index_is_ready_uses_like_on_sqlite(seed, monkeypatch):
+    add_document(seed, "経費精算の手順", "本文", keywords=["経費"])
+    query_cache.clear()
+    monkeypatch.setattr(search_index, "ready", False)
+    monkeypatch.setattr(search_index, "start_build", lambda session_factory: None)
+    client = TestClient(app)
+    for mode in ("bm25", "index"):
+        response = client.get("/api/documents/search", params={"q": "経費", "mode": mode})
+        assert response.status_code == 200, response.text
+        assert [doc["id"] for doc in response.json()] == [1]
+        facets = client.get("/api/documents/search/facets", params={"q": "経費", "mode": mode})
+        assert facets.status_code == 200, facets.text
+        assert facets.json()["total"] == 1
+
+
+def test_catch_up_indexes_documents_written_by_other_processes(seed):
+    db = seed
+    add_document(db, "経費精算の手順", "本文")
+    index = DocumentSearchIndex()
+    index.build(db)
+
+    # このプロセスで作成し、add_document 済みのドキュメント
+    created_id = add_document(db, "経費の申請", "本文")
+    index.add_document(created_id, "経費の申請", [], "本文", genre_id=2)
+    # インポートスクリプトなど、別のプロセスが DB に直接登録した想定
+    imported_id = add_document(db, "経費の新しい規程", "本文", keywords=["規程"])
+    assert index.catch_up(db) == [imported_id]
+    assert index.search("規程") == {imported_id}
+    assert index.genre_counts("経費") == {2: 3}
+    # 取り込み済みの行は再度読まない
+    assert index.catch_up(db) == []
+
+
+def test_catch_up_waits_for_build(seed):
+    add_document(seed, "経費精算の手順", "本文")
+    index = DocumentSearchIndex()
+    assert index.catch_up(seed) == []
+    assert index.search("経費") == set()
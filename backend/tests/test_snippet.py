@@ -0,0 +1,52 @@
+"""検索結果の抜粋（app/utils/snippet.py）のテスト"""
+import pytest
+
+from app.routers.keywords import normalize_text
+from app.utils.snippet import ELLIPSIS, _normalize_with_offsets, build_snippet
+
+
+@pytest.mark.parametrize("text", [
+    "ｶﾞｲﾄﾞﾗｲﾝ",  # 半角カナ + 半角濁点
+    "ガイド",  # 結合文字の濁点
+    "Café ＡＢＣ",  # 結合アクセント + 全角英字
+    "각",  # ハングル字母（初声 + 中声 + 終声）
+    "㍿の規程",  # NFKC で複数文字になる文字
+])
+def test_normalize_with_offsets_matches_whole_string_normalization(text):
+    normalized, starts, ends = _normalize_with_offsets(text)
+    assert normalized == normalize_text(text)
+    assert len(starts) == len(ends) == len(normalized)
+
+
+def _highlighted(snippet, highlights):
+    return [snippet[start:end] for start, end in highlights]
+
+
+def test_highlight_covers_halfwidth_voiced_kana():
+    snippet, highlights = build_snippet("社内ｶﾞｲﾄﾞﾗｲﾝを参照", "ガイド")
+    assert snippet == "社内ｶﾞｲﾄﾞﾗｲﾝを参照"
+    assert _highlighted(snippet, highlights) == ["ｶﾞｲﾄﾞ"]
+
+
+def test_highlight_covers_expanded_character():
+    snippet, highlights = build_snippet("㍿の規程", "株式会社")
+    assert _highlighted(snippet, highlights) == ["㍿"]
+
+
+def test_highlights_every_match_within_snippet():
+    snippet, highlights = build_snippet("経費とＫＥＩＨＩと経費", "経費")
+    assert _highlighted(snippet, highlights) == ["経費", "経費"]
+
+
+def test_no_match_returns_head():
+    text = "あ" * 200
+    snippet, highlights = build_snippet(text, "経費", width=10)
+    assert snippet == "あ" * 10 + ELLIPSIS
+    assert highlights == []
+
+
+def test_long_text_centers_match_and_offsets_include_prefix():
+    text = "前" * 100 + "経費精算" + "後" * 100
+    snippet, highlights = build_snippet(text, "経費精算", width=20)
+    assert snippet.startswith(ELLIPSIS) and snippet.endswith(ELLIPSIS)
+    assert _highlighted(snippet, highlights) == ["経費精算"]
@@ -0,0 +1,89 @@
+"""日次集計（document_daily_stats）の UPSERT と /api/stats の日次推移のテスト"""
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.document_daily_stat import DocumentDailyStat
+from app.utils.upsert import upsert_increments
+from tests.conftest import add_document
+
+TABLE = DocumentDailyStat.__table__
+
+
+def _row(document_id, stat_date, views=0, helpful=0, not_helpful=0, genre_id=2):
+    return {
+        "document_id": document_id,
+        "genre_id": genre_id,
+        "stat_date": stat_date,
+        "view_count": views,
+        "helpful_count": helpful,
+        "not_helpful_count": not_helpful,
+    }
+
+
+def _upsert(db, rows):
+    upsert_increments(db, TABLE, ["document_id", "stat_date"], ["view_count", "helpful_count", "not_helpful_count"], rows)
+    db.commit()
+
+
+def test_upsert_inserts_then_adds_to_the_same_day(seed):
+    add_document(seed, "経費精算の手順", "本文")
+    today = date.today()
+    _upsert(seed, [_row(1, today, views=3), _row(1, today - timedelta(days=1), views=1)])
+    _upsert(seed, [_row(1, today, views=2, helpful=1)])
+
+    rows = {
+        row.stat_date: (row.view_count, row.helpful_count, row.not_helpful_count)
+        for row in seed.query(DocumentDailyStat).all()
+    }
+    # 同じ日の行は1行のまま、増分だけが加算される
+    assert rows == {today: (5, 1, 0), today - timedelta(days=1): (1, 0, 0)}
+
+
+def test_upsert_without_rows_is_a_no_op(seed):
+    _upsert(seed, [])
+    assert seed.query(DocumentDailyStat).count() == 0
+
+
+@pytest.fixture
+def client(seed):
+    add_document(seed, "経費精算の手順", "本文", genre_id=2)
+    add_document(seed, "開発の心得", "本文", genre_id=1)
+    return TestClient(app)
+
+
+def test_evaluation_is_added_to_the_daily_series(seed, client):
+    end = date.today() - timedelta(days=10)
+    _upsert(seed, [_row(1, end - timedelta(days=2), views=4)])
+    response = client.post("/api/documents/1/evaluate", json={"is_helpful": False})
+    assert response.status_code == 200, response.text
+
+    response = client.get(
+        "/api/stats/documents/1/daily", params={"days": 3, "end_date": end.isoformat()}
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    # 評価は今日の行に加算されるため、過去の期間には含まれない。集計がない日は0で埋める
+    assert [point["view_count"] for point in body["series"]] == [4, 0, 0]
+    assert body["total_view_count"] == 4
+    assert body["total_not_helpful_count"] == 0
+
+    body = client.get("/api/stats/documents/1/daily", params={"days": 1}).json()
+    assert body["series"][0]["not_helpful_count"] == 1
+
+
+def test_genre_series_includes_descendant_genres(seed, client):
+    end = date(2026, 10, 17)
+    _upsert(seed, [_row(1, end, views=2, genre_id=2), _row(2, end, views=5, genre_id=1)])
+    params = {"days": 1, "end_date": end.isoformat()}
+
+    assert client.get("/api/stats/genres/1/daily", params=params).json()["total_view_count"] == 7
+    params["include_descendants"] = "false"
+    assert client.get("/api/stats/genres/1/daily", params=params).json()["total_view_count"] == 5
+    assert client.get("/api/stats/genres/2/daily", params=params).json()["total_view_count"] == 2
+
+
+def test_daily_stats_of_unknown_document_is_404(client):
+    assert client.get("/api/stats/documents/99/daily").status_code == 404
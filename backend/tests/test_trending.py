@@ -0,0 +1,77 @@
+"""トレンドドキュメントの時間減衰スコア（app/utils/trending.py）のテスト"""
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from app.db import SessionLocal
+from app.models.document import DocumentStatus
+from app.models.document_daily_stat import DocumentDailyStat
+from app.utils import trending
+from app.utils.trending import TRENDING_HALF_LIFE_HOURS, TRENDING_HELPFUL_WEIGHT, TrendingDocuments
+from tests.conftest import add_document
+
+HALF_LIFE_SECONDS = TRENDING_HALF_LIFE_HOURS * 3600
+
+
+@pytest.fixture
+def trending_documents(seed):
+    for title in ("経費精算の手順", "交通費の精算", "出張申請"):
+        add_document(seed, title, "本文")
+    return TrendingDocuments(SessionLocal, 60)
+
+
+def _scores(items):
+    return {item["id"]: item["trending_score"] for item in items}
+
+
+def test_score_halves_every_half_life(seed, trending_documents):
+    now = time.time()
+    trending_documents.record(1, at=now - HALF_LIFE_SECONDS)
+    trending_documents.record(2, at=now - 2 * HALF_LIFE_SECONDS)
+    trending_documents.record(3, weight=0.6, at=now)
+    trending_documents.refresh(seed)
+
+    top = trending_documents.top(10)
+    # 1半減期前の閲覧1回（0.5）より、直前の 0.6 が上位になる
+    assert [item["id"] for item in top] == [3, 1, 2]
+    assert _scores(top) == pytest.approx({3: 0.6, 1: 0.5, 2: 0.25}, abs=1e-3)
+
+
+def test_helpful_evaluation_is_weighted(seed, trending_documents):
+    for _ in range(int(TRENDING_HELPFUL_WEIGHT) + 1):
+        trending_documents.record_view(1)
+    trending_documents.record_helpful(2)
+    trending_documents.refresh(seed)
+
+    scores = _scores(trending_documents.top(10))
+    assert scores[2] == pytest.approx(TRENDING_HELPFUL_WEIGHT, rel=1e-3)
+    assert scores[1] > scores[2]
+
+
+def test_top_n_is_capped_and_skips_unpublished(seed, trending_documents, monkeypatch):
+    add_document(seed, "下書き", "本文", status=DocumentStatus.DRAFT)
+    monkeypatch.setattr(trending, "TRENDING_TOP_N", 2)
+    for document_id, views in ((1, 1), (2, 2), (3, 3), (4, 10)):
+        for _ in range(views):
+            trending_documents.record_view(document_id)
+    trending_documents.refresh(seed)
+
+    # 上位2件（4, 3）のうち下書きの 4 は表示しない
+    assert [item["id"] for item in trending_documents.top(10)] == [3]
+    assert trending_documents.top(0) == []
+
+
+def test_build_seeds_scores_from_daily_stats(seed, trending_documents):
+    today = date.today()
+    seed.add_all([
+        DocumentDailyStat(document_id=1, genre_id=2, stat_date=today, view_count=2, helpful_count=0, not_helpful_count=0),
+        DocumentDailyStat(document_id=2, genre_id=2, stat_date=today - timedelta(days=3), view_count=2, helpful_count=0, not_helpful_count=0),
+        # 復元期間より前の集計は使わない
+        DocumentDailyStat(document_id=3, genre_id=2, stat_date=today - timedelta(days=60), view_count=100, helpful_count=0, not_helpful_count=0),
+    ])
+    seed.commit()
+    trending_documents.build(seed)
+
+    # 同じ閲覧数なら新しい日のほうが上位（古い日は減衰している）
+    assert [item["id"] for item in trending_documents.top(10)] == [1, 2]
@@ -0,0 +1,86 @@
+"""閲覧数の書き込みバッファ（app/utils/view_buffer.py）のテスト"""
+import threading
+
+import pytest
+
+from app.db import SessionLocal
+from app.models import Document
+from app.models.document_daily_stat import DocumentDailyStat
+from app.models.document_viewer_sketch import DocumentViewerSketch
+from app.utils.view_buffer import ViewCountBuffer
+from tests.conftest import add_document
+
+
+@pytest.fixture
+def buffer(seed):
+    add_document(seed, "経費精算の手順", "本文")
+    add_document(seed, "交通費の精算", "本文")
+    buffer = ViewCountBuffer(SessionLocal, 60)
+    for document_id in (1, 2):
+        assert buffer.exists(seed, document_id)
+    return buffer
+
+
+def _view_counts(db):
+    db.expire_all()
+    return dict(db.query(Document.id, Document.view_count).all())
+
+
+def test_flush_writes_all_pending_views_at_once(seed, buffer):
+    for viewer in ("a", "b", "a"):
+        buffer.record(1, viewer=viewer)
+    buffer.record(2)
+    assert buffer.pending() == {1: 3, 2: 1}
+
+    assert buffer.flush() == 2
+    assert buffer.pending() == {}
+    assert _view_counts(seed) == {1: 3, 2: 1}
+    daily = {row.document_id: row for row in seed.query(DocumentDailyStat).all()}
+    assert daily[1].view_count == 3
+    assert daily[1].unique_viewer_count == 2
+    assert seed.get(DocumentViewerSketch, 1).unique_viewer_count == 2
+    # 書き込み済みの増分は再度書き込まない
+    assert buffer.flush() == 0
+    assert _view_counts(seed) == {1: 3, 2: 1}
+
+
+def test_flush_requeues_views_when_the_write_fails(seed, buffer):
+    # 保存済みのスケッチが壊れている（zlib.error: DB 以外の例外）
+    seed.add(DocumentViewerSketch(document_id=1, unique_viewer_count=1, viewer_sketch=b"broken"))
+    seed.commit()
+    buffer.record(1, viewer="a")
+    buffer.record(2)
+
+    assert buffer.flush() == 0
+    assert buffer.pending() == {1: 1, 2: 1}
+    assert _view_counts(seed) == {1: 0, 2: 0}
+
+    # 失敗中に記録された閲覧とあわせて、次回に1回だけ書き込む
+    buffer.record(1, viewer="b")
+    seed.delete(seed.get(DocumentViewerSketch, 1))
+    seed.commit()
+    assert buffer.flush() == 2
+    assert _view_counts(seed) == {1: 2, 2: 1}
+    assert seed.get(DocumentViewerSketch, 1).unique_viewer_count == 2
+
+
+def test_flusher_thread_survives_unexpected_errors(buffer, monkeypatch):
+    calls = []
+    flushed = threading.Event()
+
+    def flaky_flush():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        flushed.set()
+        return 0
+
+    monkeypatch.setattr(buffer, "flush", flaky_flush)
+    buffer._interval_seconds = 0.01
+    buffer.start()
+    try:
+        assert flushed.wait(timeout=5)
+        assert buffer._thread.is_alive()
+    finally:
+        buffer._stop.set()
+        buffer._thread.join()
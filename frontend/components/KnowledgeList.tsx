@@ -1,8 +1,9 @@
 'use client';
 
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { Loader2, SearchX } from 'lucide-react';
 import { getDocuments, searchDocuments } from '@/lib/api/documents';
+import { Button } from '@/components/ui/button';
 import { KnowledgeCard } from './KnowledgeCard';
 import type { Knowledge } from '@/types/knowledge';
 
@@ -19,48 +20,88 @@ interface KnowledgeListProps {
 /**
  * ナレッジ一覧表示コンポーネント
  * 検索キーワードの有無に応じて、検索APIと通常の一覧APIを使い分けます。
+ * 検索結果はページ単位で取得し、続きがあれば「さらに表示」で次のページを追加します。
  */
 export function KnowledgeList({ selectedGenreId, searchQuery }: KnowledgeListProps) {
   // 表示対象のナレッジリスト
   const [knowledges, setKnowledges] = useState<Knowledge[]>([]);
   // データ取得中の状態管理
   const [loading, setLoading] = useState(true);
+  // 検索結果の続きを取得するためのカーソル（続きがなければ null）
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  // 検索の総ヒット件数（不明な場合は null）
+  const [total, setTotal] = useState<number | null>(null);
+  // 「さらに表示」の取得中
+  const [loadingMore, setLoadingMore] = useState(false);
+  // 検索条件が変わった後に、前の条件のレスポンスを反映しないための世代番号
+  const requestId = useRef(0);
 
   /**
    * APIからデータを取得するメインロジック
    * useCallback を使用し、ジャンル選択や検索ワードの変化をトリガーに再生成します。
    */
   const fetchItems = useCallback(async () => {
+    const currentRequest = ++requestId.current;
     try {
       setLoading(true);
-
-      let data: Knowledge[];
+      setNextCursor(null);
+      setTotal(null);
 
       // 【ロジック分岐】
-      // 1. 検索ワードがある場合: バックエンドの全文検索APIを使用
+      // 1. 検索ワードがある場合: バックエンドの検索APIを使用（1ページ目）
       // 2. 検索ワードがない場合: ジャンル絞り込みを伴う一覧取得APIを使用
       if (searchQuery.trim()) {
-        data = await searchDocuments(searchQuery);
+        const page = await searchDocuments(searchQuery);
+        if (currentRequest !== requestId.current) return;
+        setKnowledges(page.items);
+        setNextCursor(page.nextCursor);
+        setTotal(page.total);
       } else {
-        data = await getDocuments({
+        const data = await getDocuments({
           genre_id: selectedGenreId,
           status: 'published', // 公開済みドキュメントのみ取得
           skip: 0,
           limit: 20
         });
+        if (currentRequest !== requestId.current) return;
+        setKnowledges(data || []);
       }
-      
-      setKnowledges(data || []);
     } catch (error) {
       // API呼び出し失敗時のエラーハンドリング
       console.error("Failed to fetch documents:", error);
-      setKnowledges([]); 
+      if (currentRequest === requestId.current) {
+        setKnowledges([]);
+      }
     } finally {
-      setLoading(false);
+      if (currentRequest === requestId.current) {
+        setLoading(false);
+      }
     }
     // ジャンル変更または検索ワード入力のたびに fetchItems を再定義
   }, [selectedGenreId, searchQuery]);
 
+  /**
+   * 検索結果の次のページを取得し、一覧の末尾に追加
+   */
+  const loadMore = useCallback(async () => {
+    if (!nextCursor) return;
+    const currentRequest = requestId.current;
+    try {
+      setLoadingMore(true);
+      const page = await searchDocuments(searchQuery, nextCursor);
+      // 取得中に検索条件が変わった場合は反映しない
+      if (currentRequest !== requestId.current) return;
+      setKnowledges(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error("Failed to fetch more documents:", error);
+    } finally {
+      if (currentRequest === requestId.current) {
+        setLoadingMore(false);
+      }
+    }
+  }, [searchQuery, nextCursor]);
+
   /**
    * fetchItems が更新された際（selectedGenreId/searchQuery 変化時）に実行
    */
@@ -87,7 +128,12 @@ export function KnowledgeList({ selectedGenreId, searchQuery }: KnowledgeListPro
           ) : (
             <span>ナレッジ一覧: </span>
           )}
-          <span className="text-slate-900 ml-1">{knowledges.length} 件</span>
+          <span className="text-slate-900 ml-1">
+            {/* 検索時は総ヒット件数のうち表示中の件数を併記 */}
+            {searchQuery && total !== null && total > knowledges.length
+              ? `${total} 件中 ${knowledges.length} 件を表示`
+              : `${knowledges.length} 件`}
+          </span>
         </p>
       </div>
 
@@ -110,6 +156,16 @@ export function KnowledgeList({ selectedGenreId, searchQuery }: KnowledgeListPro
           ))
         )}
       </div>
+
+      {/* 検索結果の続き（X-Next-Cursor がある場合のみ） */}
+      {searchQuery && nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMore} disabled={loadingMore} className="gap-2">
+            {loadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+            さらに表示
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
\ No newline at end of file
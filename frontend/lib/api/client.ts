@@ -19,10 +19,26 @@ export class ApiError extends Error {
   }
 }
 
+/**
+ * レスポンス本体とヘッダー（ページネーション情報の X-Next-Cursor / X-Total-Count など）
+ */
+export interface ApiResponse<T> {
+  data: T;
+  headers: Headers;
+}
+
 /**
  * APIリクエストの共通処理
  */
 async function fetchApi<T>(endpoint: string, options?: RequestInit): Promise<T> {
+  const { data } = await fetchApiWithHeaders<T>(endpoint, options);
+  return data;
+}
+
+/**
+ * APIリクエストの共通処理（レスポンスヘッダーも返す）
+ */
+async function fetchApiWithHeaders<T>(endpoint: string, options?: RequestInit): Promise<ApiResponse<T>> {
   const url = `${API_BASE_URL}${endpoint}`;
 
   const defaultHeaders: HeadersInit = {
@@ -65,18 +81,18 @@ async function fetchApi<T>(endpoint: string, options?: RequestInit): Promise<T>
 
   // 204 No Content（例: /view）は本文が空なのでここで終了
   if (response.status === 204) {
-    return undefined as T;
+    return { data: undefined as T, headers: response.headers };
   }
 
   // まず本文をテキストで取る（空ならundefined）
   const text = await response.text();
   if (!text) {
-    return undefined as T;
+    return { data: undefined as T, headers: response.headers };
   }
 
   // JSON前提。JSONでなければエラーにする
   try {
-    return JSON.parse(text) as T;
+    return { data: JSON.parse(text) as T, headers: response.headers };
   } catch {
     throw new ApiError('Invalid JSON response', response.status, text);
   }
@@ -89,6 +105,13 @@ export async function get<T>(endpoint: string): Promise<T> {
   return fetchApi<T>(endpoint, { method: 'GET' });
 }
 
+/**
+ * GETリクエスト（レスポンスヘッダーも返す）
+ */
+export async function getWithHeaders<T>(endpoint: string): Promise<ApiResponse<T>> {
+  return fetchApiWithHeaders<T>(endpoint, { method: 'GET' });
+}
+
 /**
  * POSTリクエスト
  */
@@ -1,7 +1,7 @@
 /**
  * ドキュメント関連のAPIクライアント関数
  */
-import { get, post, patch, del } from './client';
+import { get, getWithHeaders, post, patch, del } from './client';
 import type {
   Document,
   DocumentListResponse,
@@ -9,8 +9,12 @@ import type {
   CreateDocumentRequest,
   UpdateDocumentRequest,
   SearchDocumentsParams,
+  SearchDocumentsPage,
 } from '@/types/knowledge';
 
+// 検索結果の1ページあたりの件数（バックエンドの上限は100）
+export const SEARCH_PAGE_SIZE = 20;
+
 /**
  * ドキュメント一覧を取得
  * @param params 検索パラメータ
@@ -49,18 +53,33 @@ export async function getDocuments(
 }
 
 /**
- * キーワードによるナレッジ検索
+ * キーワードによるナレッジ検索（1ページ分）
  * @param query 検索クエリ文字列
- * @returns 検索結果のナレッジ一覧
+ * @param cursor 前のページの nextCursor（省略時は1ページ目）
+ * @param limit 1ページの件数
+ * @returns 検索結果のナレッジ一覧と、続きを取得するためのカーソル・総ヒット件数
  */
-export async function searchDocuments(query: string): Promise<Knowledge[]> {
-  if (!query) return [];
-  
-  // encodeURIComponent でスペースや特殊文字を安全に処理
-  const endpoint = `/api/documents/search?q=${encodeURIComponent(query)}`;
-  
-  // 共通クライアントの get を使用することで、ベースURLやエラーハンドリングを統一
-  return get<Knowledge[]>(endpoint);
+export async function searchDocuments(
+  query: string,
+  cursor?: string | null,
+  limit: number = SEARCH_PAGE_SIZE
+): Promise<SearchDocumentsPage> {
+  if (!query) return { items: [], nextCursor: null, total: 0 };
+
+  // URLSearchParams でスペースや特殊文字を安全に処理
+  const queryParams = new URLSearchParams({ q: query, limit: String(limit) });
+  if (cursor) {
+    queryParams.append('cursor', cursor);
+  }
+
+  // 続きの有無は X-Next-Cursor、総ヒット件数は X-Total-Count（1ページ目のみ）で返される
+  const { data, headers } = await getWithHeaders<Knowledge[]>(`/api/documents/search?${queryParams}`);
+  const total = headers.get('X-Total-Count');
+  return {
+    items: data || [],
+    nextCursor: headers.get('X-Next-Cursor'),
+    total: total !== null ? Number(total) : null,
+  };
 }
 
 /**
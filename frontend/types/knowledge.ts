@@ -128,6 +128,16 @@ export interface UpdateDocumentRequest {
   keywords: string[];  // バックエンドはキーワード名の配列を受け取る
 }
 
+/**
+ * 検索APIの1ページ分の結果
+ * nextCursor は続きがある場合のみ（次のページの取得に渡す）
+ */
+export interface SearchDocumentsPage {
+  items: Knowledge[];
+  nextCursor: string | null;
+  total: number | null;
+}
+
 export interface DocumentListResponse {
   documents: Document[];
   total: number;